@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Publica artefactos del dashboard con nombre por hash de contenido.
+
+publish_artifact('dashboard_data.json') escribe dashboard_data.<hash>.json
+con sus copias precomprimidas .gz/.br al lado (para servirlas al estilo
+gzip_static/brotli_static) y lo registra en dashboard_manifest.json, en la
+misma carpeta. Un archivo con hash nunca cambia, asi que se puede servir
+como immutable con un max-age largo; solo hay que revalidar el manifest,
+que es pequeño.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli
+except ImportError:  # optional: without it only the gzip variant is written
+    brotli = None
+
+MANIFEST_NAME = 'dashboard_manifest.json'
+HASH_LENGTH = 12
+KEEP_VERSIONS = 2  # current + previous, for pages still holding the old manifest
+
+
+def _write_if_missing(path, data):
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+
+
+def _load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _prune_versions(out_dir, stem, ext, keep):
+    """Delete older hashed copies of stem*ext (and their .gz/.br), newest first kept."""
+    prefix = stem + '.'
+    versions = [f for f in os.listdir(out_dir)
+                if f.startswith(prefix) and f.endswith(ext) and len(f) == len(stem) + HASH_LENGTH + 1 + len(ext)]
+    versions.sort(key=lambda f: os.path.getmtime(os.path.join(out_dir, f)), reverse=True)
+    for name in versions[keep:]:
+        for suffix in ('', '.gz', '.br'):
+            path = os.path.join(out_dir, name + suffix)
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def publish_artifact(path, keep=KEEP_VERSIONS):
+    """Write the hashed and precompressed copies of `path`; return its manifest entry."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    out_dir = os.path.dirname(os.path.abspath(path))
+    name = os.path.basename(path)
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(data).hexdigest()
+    hashed = '%s.%s%s' % (stem, digest[:HASH_LENGTH], ext)
+    hashed_path = os.path.join(out_dir, hashed)
+
+    _write_if_missing(hashed_path, data)
+    # mtime=0 keeps the .gz byte-identical across runs
+    _write_if_missing(hashed_path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+    entry = {
+        'file': hashed,
+        'sha256': digest,
+        'bytes': len(data),
+        'gzip_bytes': os.path.getsize(hashed_path + '.gz'),
+    }
+    if brotli is not None:
+        _write_if_missing(hashed_path + '.br', brotli.compress(data, quality=11))
+        entry['br_bytes'] = os.path.getsize(hashed_path + '.br')
+    os.utime(hashed_path)  # newest version survives pruning even if it already existed
+
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    manifest = _load_manifest(manifest_path)
+    manifest[name] = entry
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    _prune_versions(out_dir, stem, ext, keep)
+    return entry
+
+
+def describe_artifact(entry):
+    """One-line summary for the build logs."""
+    sizes = 'raw %d KB | gzip %d KB' % (entry['bytes'] / 1024, entry['gzip_bytes'] / 1024)
+    if 'br_bytes' in entry:
+        sizes += ' | brotli %d KB' % (entry['br_bytes'] / 1024)
+    else:
+        sizes += ' | brotli no disponible (pip install brotli)'
+    return '%s (%s)' % (entry['file'], sizes)
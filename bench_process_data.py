@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de process_data.py con exports sinteticos.
+Genera Message Dashboard, Detailed breakdown, Sales record y Creator Statistics
+a la escala pedida, ejecuta process_data.main() contra ellos y mide cada etapa
+(carga, parseo, dedup, cada bloque COMPUTE, volcado JSON) con su memoria pico.
+Cada corrida se agrega a bench_results.jsonl para comparar versiones:
+
+  python bench_process_data.py --days 30 --models 40 --chatters 60 --msgs-per-day 30000
+  python bench_process_data.py --compare
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import process_data
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(BASE_DIR, '.bench')
+RESULTS_PATH = os.path.join(BASE_DIR, 'bench_results.jsonl')
+FIRST_DAY = date(2026, 2, 1)
+
+
+# ================================================================
+# SYNTHETIC EXPORTS
+# ================================================================
+def _pick(rng, values, n, p=None):
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=n, p=p)]
+
+
+def _money(values):
+    return pd.Series(values).map('${:,.2f}'.format).to_numpy(dtype=object)
+
+
+def _day_messages(rng, day, models, chatters, fans, n):
+    hours = rng.integers(0, 24, n)
+    secs = rng.integers(0, 3600, n)
+    clock = pd.Series(hours).map('{:02d}'.format) + pd.Series(secs // 60).map(':{:02d}'.format) \
+        + pd.Series(secs % 60).map(':{:02d}'.format)
+    price = _pick(rng, [0, 0, 0, 0, 0, 5, 10, 15, 25, 49.99, '-'], n)
+    replay_s = rng.exponential(150, n).astype(int)
+    replay = np.where(
+        replay_s >= 3600, pd.Series(replay_s).map(lambda s: '%dh %dm %ds' % (s // 3600, s % 3600 // 60, s % 60)),
+        np.where(replay_s >= 60, pd.Series(replay_s).map(lambda s: '%dm %ds' % (s // 60, s % 60)),
+                 pd.Series(replay_s).map('{}s'.format)))
+    replay = np.where(rng.random(n) < 0.05, '-', replay)
+    return pd.DataFrame({
+        'Sender': _pick(rng, chatters + [None], n),
+        'Creator': _pick(rng, models, n),
+        'Sent time': clock.to_numpy(),
+        'Sent date': day.isoformat(),
+        'Price': price,
+        'Source': _pick(rng, ['Direct', 'Mass message', 'Automated'], n, [0.7, 0.2, 0.1]),
+        'Purchased': _pick(rng, ['Yes', 'No'], n, [0.1, 0.9]),
+        'Replay time': replay,
+        'Sent to': _pick(rng, fans, n),
+    })
+
+
+def _day_breakdown(rng, day, models, chatters):
+    rows = []
+    for chatter in chatters:
+        for model in rng.choice(models, size=min(3, len(models)), replace=False):
+            sales = rng.exponential(150)
+            rows.append({
+                'Date/Time Africa/Monrovia': day.strftime('%Y-%m-%d'),
+                'Employees': chatter,
+                'Creators': model,
+                'Group': _pick(rng, ['Equipo A', 'Equipo B', None], 1)[0],
+                'Sales': '$%s' % format(sales, ',.2f') if sales >= 1 else '-',
+                'Direct PPVs sent': int(rng.integers(0, 60)),
+                'PPVs unlocked': int(rng.integers(0, 15)),
+                'Direct messages sent': int(rng.integers(0, 900)),
+                'Golden ratio': '%.2f%%' % (rng.random() * 12),
+                'Unlock rate': '%.1f%%' % (rng.random() * 60),
+                'Fans chatted': int(rng.integers(0, 150)),
+                'Fans who spent money': int(rng.integers(0, 20)),
+                'Fan CVR': '%.1f%%' % (rng.random() * 15),
+                'Avg response time': '%dm %ds' % (rng.integers(0, 6), rng.integers(0, 60)),
+                'Clocked hours': '%dh %dmin' % (rng.integers(0, 9), rng.integers(0, 60)),
+                'Sales per hour': '$%.2f' % (rng.random() * 60),
+                'Messages sent per hour': round(rng.random() * 120, 1),
+                'Character count': int(rng.integers(0, 40000)),
+                'Avg earnings per fan who spent money': '$%.2f' % (rng.random() * 40),
+            })
+    return pd.DataFrame(rows)
+
+
+def _day_sales(rng, day, models, chatters, fans, n):
+    minutes = rng.integers(0, 24 * 60, n)
+    net = np.round(rng.exponential(20, n) + 3, 2)
+    stamps = pd.Series(minutes).map(lambda m: '%s %02d:%02d:00' % (day.isoformat(), m // 60, m % 60))
+    return pd.DataFrame({
+        'Date/Time Africa/Monrovia': stamps.to_numpy(),
+        'Employee': _pick(rng, chatters + [None], n),
+        'Creator': _pick(rng, models, n),
+        'Fan': _pick(rng, fans, n),
+        'Type': _pick(rng, ['Messages', 'Subscription', 'Tips', 'Tips from chat', 'Post'], n,
+                      [0.6, 0.2, 0.1, 0.05, 0.05]),
+        'Status': _pick(rng, ['Completed', 'Reverse'], n, [0.97, 0.03]),
+        'Earnings': _money(net),
+        'Gross revenue': _money(net * 1.25),
+        'Net revenue': _money(net),
+    })
+
+
+def _creator_stats(rng, models):
+    return pd.DataFrame([{
+        'Creator': model,
+        'Subscription Net': '$%.2f' % (rng.random() * 900),
+        'New subscriptions Net': '$%.2f' % (rng.random() * 300),
+        'Recurring subscriptions Net': '$%.2f' % (rng.random() * 600),
+        'Tips Net': '$%.2f' % (rng.random() * 200),
+        'Total earnings Net': '$%.2f' % (rng.random() * 5000),
+        'Message Net': '$%.2f' % (rng.random() * 3000),
+        'New fans': int(rng.integers(0, 300)),
+        'Change in expired fan count': int(rng.integers(-20, 20)),
+        'Contribution %': '%.2f%%' % (rng.random() * 10),
+        'OF ranking': '%.1f%%' % (rng.random() * 5),
+        'Following': int(rng.integers(0, 500)),
+        'Fans with renew on': int(rng.integers(0, 800)),
+        'Renew on %': '%.1f%%' % (rng.random() * 40),
+        'Active fans': int(rng.integers(0, 5000)),
+        'Creator group': _pick(rng, ['Grupo 1', 'Grupo 2'], 1)[0],
+        'Avg spend per spender Net': '$%.2f' % (rng.random() * 50),
+        'Avg spend per transaction Net': '$%.2f' % (rng.random() * 20),
+        'Avg earnings per fan Net': '$%.2f' % (rng.random() * 5),
+        'Avg subscription length': '%d days' % rng.integers(1, 90),
+    } for model in models])
+
+
+def write_exports(outdir, days, models, chatters, msgs_per_day, files=2, seed=1):
+    """Write `files` export periods covering `days` days, like the real Feb 1-10 + Feb 11-13 pairs.
+    Consecutive periods share their boundary day (same rows in both exports), so the
+    dedup paths do real work. Returns {'msg'|'db'|'sales'|'cs': [paths]}.
+    """
+    model_names = ['Model %03d' % i for i in range(models)]
+    chatter_names = ['Chatter %03d' % i for i in range(chatters)]
+    fans = ['u%07d' % i for i in range(max(msgs_per_day * days // 5, 1))]
+    bounds = np.linspace(0, days, files + 1).astype(int)
+    paths = {'msg': [], 'db': [], 'sales': [], 'cs': []}
+    os.makedirs(outdir, exist_ok=True)
+    for part in range(files):
+        first, last = bounds[part], min(bounds[part + 1] + 1, days)
+        msg, db, sales = [], [], []
+        for offset in range(first, last):
+            day = FIRST_DAY + timedelta(days=int(offset))
+            rng = np.random.default_rng([seed, int(offset)])  # same rows whenever a day is re-exported
+            msg.append(_day_messages(rng, day, model_names, chatter_names, fans, msgs_per_day))
+            db.append(_day_breakdown(rng, day, model_names, chatter_names))
+            sales.append(_day_sales(rng, day, model_names, chatter_names, fans, max(msgs_per_day // 8, 1)))
+        cs = _creator_stats(np.random.default_rng([seed, 10000 + part]), model_names)
+        sheets = {
+            'msg': {'Message Dashboard': pd.concat(msg, ignore_index=True)},
+            'db': {'Detailed breakdown': pd.concat(db, ignore_index=True)},
+            'sales': {'Sales record': pd.concat(sales, ignore_index=True)},
+            'cs': {'Creator Statistics': cs, 'Creator Statistics Detail': cs.head(5)},
+        }
+        for key, frames in sheets.items():
+            path = os.path.join(outdir, '%s_%d.xlsx' % (key, part))
+            with pd.ExcelWriter(path) as writer:
+                for sheet_name, df in frames.items():
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+            paths[key].append(path)
+        print("  Periodo %d/%d escrito (%d dias)" % (part + 1, files, last - first))
+
+    with open(os.path.join(outdir, 'airtable_model_types.json'), 'w', encoding='utf-8') as f:
+        json.dump({m: ['free', 'paid', 'mixta'][i % 3] for i, m in enumerate(model_names)}, f)
+    return paths
+
+
+def ensure_exports(scale, files, seed):
+    """Synthetic exports for `scale`, generated once and reused from .bench/."""
+    name = 'd%(days)d_m%(models)d_c%(chatters)d_n%(msgs_per_day)d' % scale + '_f%d_s%d' % (files, seed)
+    outdir = os.path.join(BENCH_DIR, 'data', name)
+    done_marker = os.path.join(outdir, '.complete')
+    if not os.path.exists(done_marker):
+        print("Generando exports sinteticos en %s..." % outdir)
+        t0 = time.perf_counter()
+        write_exports(outdir, files=files, seed=seed, **scale)
+        open(done_marker, 'w').close()
+        print("  Generados en %.1fs" % (time.perf_counter() - t0))
+    return {
+        key: [os.path.join(outdir, '%s_%d.xlsx' % (key, i)) for i in range(files)]
+        for key in ('msg', 'db', 'sales', 'cs')
+    }, os.path.join(outdir, 'airtable_model_types.json')
+
+
+# ================================================================
+# RUN + MEASURE
+# ================================================================
+def peak_rss_mb():
+    """Peak resident memory of this process and of finished children (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    scale = 1 / 1e6 if sys.platform == 'darwin' else 1 / 1e3  # bytes on macOS, KB elsewhere
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_once(paths, types_path, workdir, cache, workers, stream, trace_memory, quiet=True):
+    process_data.MSG_DASHBOARDS = paths['msg']
+    process_data.DETAILED_BREAKDOWNS = paths['db']
+    process_data.SALES_RECORDS = paths['sales']
+    process_data.CREATOR_STATS_FILES = paths['cs']
+    process_data.AIRTABLE_TYPES_PATH = types_path
+    process_data.OUTPUT_PATH = os.path.join(workdir, 'dashboard_data.json')
+    process_data.CACHE_DIR = os.path.join(workdir, 'excel_cache')
+    process_data.STATE_DIR = os.path.join(workdir, 'pipeline_state')
+    if cache == 'cold' and os.path.isdir(process_data.CACHE_DIR):
+        shutil.rmtree(process_data.CACHE_DIR)
+
+    if trace_memory:
+        tracemalloc.start()
+    stdout = sys.stdout
+    t0 = time.perf_counter()
+    try:
+        if quiet:
+            sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+        process_data.main(use_cache=cache != 'off', workers=workers, stream=stream)
+    finally:
+        if quiet:
+            sys.stdout.close()
+        sys.stdout = stdout
+        total = time.perf_counter() - t0
+        if trace_memory:
+            tracemalloc.stop()
+    return total, list(process_data.STAGE_TIMES)
+
+
+def print_stages(stages, total):
+    print("\n%-32s %10s %12s" % ('Etapa', 'Segundos', 'Pico MB'))
+    print("-" * 56)
+    for name, seconds, peak in stages:
+        print("%-32s %10.3f %12s" % (name, seconds, '%.1f' % peak if peak is not None else '-'))
+    print("-" * 56)
+    print("%-32s %10.3f" % ('TOTAL', total))
+
+
+# ================================================================
+# SAVED RESULTS
+# ================================================================
+def load_results():
+    if not os.path.exists(RESULTS_PATH):
+        return []
+    with open(RESULTS_PATH, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def save_result(record):
+    with open(RESULTS_PATH, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def compare_last_two():
+    """Stage-by-stage comparison of the last two runs with the same scale and options."""
+    results = load_results()
+    if not results:
+        print("No hay resultados guardados en %s" % RESULTS_PATH)
+        return
+    latest = results[-1]
+    same = [r for r in results[:-1] if r['scale'] == latest['scale'] and r['options'] == latest['options']]
+    if not same:
+        print("Solo hay una corrida con escala %s y opciones %s" % (latest['scale'], latest['options']))
+        return
+    prev = same[-1]
+    print("Comparando %s (%s) -> %s (%s)" % (prev['commit'], prev['timestamp'], latest['commit'], latest['timestamp']))
+    prev_stages = {s['stage']: s['seconds'] for s in prev['stages']}
+    print("\n%-32s %10s %10s %9s" % ('Etapa', 'Antes', 'Ahora', 'Cambio'))
+    print("-" * 64)
+    rows = [(s['stage'], prev_stages.get(s['stage']), s['seconds']) for s in latest['stages']]
+    rows.append(('TOTAL', prev['total_seconds'], latest['total_seconds']))
+    for name, before, now in rows:
+        if before:
+            print("%-32s %10.3f %10.3f %+8.1f%%" % (name, before, now, (now - before) / before * 100))
+        else:
+            print("%-32s %10s %10.3f %9s" % (name, '-', now, 'nuevo'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark de process_data.py con exports sinteticos.')
+    parser.add_argument('--days', type=int, default=13, help='dias cubiertos por los exports')
+    parser.add_argument('--models', type=int, default=30, help='numero de modelos')
+    parser.add_argument('--chatters', type=int, default=40, help='numero de chatters')
+    parser.add_argument('--msgs-per-day', type=int, default=20000, help='filas de Message Dashboard por dia')
+    parser.add_argument('--files', type=int, default=2, help='periodos de export por fuente (comparten un dia)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--runs', type=int, default=1, help='corridas a medir (se guardan todas)')
+    parser.add_argument('--cache', choices=['cold', 'warm', 'off'], default='cold',
+                        help='cold: cache vacia en cada corrida; warm: cache llena; off: sin cache')
+    parser.add_argument('--workers', type=int, default=None, help='procesos para leer los Excel')
+    parser.add_argument('--stream', action='store_true', help='usar la lectura por bloques de Message Dashboards')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='medir el pico de memoria de cada etapa con tracemalloc (agrega overhead)')
+    parser.add_argument('--no-save', action='store_true', help='no agregar los resultados a bench_results.jsonl')
+    parser.add_argument('--compare', action='store_true', help='comparar las dos ultimas corridas guardadas y salir')
+    parser.add_argument('--verbose', action='store_true', help='mostrar la salida de process_data')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_last_two()
+        sys.exit(0)
+
+    scale = {'days': args.days, 'models': args.models, 'chatters': args.chatters, 'msgs_per_day': args.msgs_per_day}
+    options = {'files': args.files, 'seed': args.seed, 'cache': args.cache, 'workers': args.workers,
+               'stream': args.stream, 'trace_memory': args.trace_memory}
+    paths, types_path = ensure_exports(scale, args.files, args.seed)
+    workdir = os.path.join(BENCH_DIR, 'work')
+    os.makedirs(workdir, exist_ok=True)
+
+    if args.cache == 'warm':
+        print("Calentando la cache de Excel...")
+        run_once(paths, types_path, workdir, 'warm', args.workers, args.stream, False)
+
+    for run in range(args.runs):
+        print("\nCorrida %d/%d (escala %s)" % (run + 1, args.runs, scale))
+        total, stages = run_once(paths, types_path, workdir, args.cache, args.workers, args.stream,
+                                 args.trace_memory, quiet=not args.verbose)
+        rss, rss_children = peak_rss_mb()
+        print_stages(stages, total)
+        if rss is not None:
+            print("Pico RSS: %.1f MB (procesos hijos: %.1f MB)" % (rss, rss_children))
+        if not args.no_save:
+            save_result({
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'scale': scale,
+                'options': options,
+                'stages': [{'stage': n, 'seconds': round(s, 4), 'peak_mb': p and round(p, 1)} for n, s, p in stages],
+                'total_seconds': round(total, 4),
+                'peak_rss_mb': rss and round(rss, 1),
+                'peak_rss_children_mb': rss_children and round(rss_children, 1),
+            })
+    if not args.no_save:
+        print("\nResultados agregados a %s" % RESULTS_PATH)
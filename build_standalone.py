@@ -2,20 +2,75 @@
 # -*- coding: utf-8 -*-
 """
 Genera un HTML standalone con los datos embebidos para compartir.
+
+Los datos se embeben en bloques <script type="application/json"> separados:
+el resumen se parsea al cargar y las secciones pesadas (daily_hourly,
+daily_model, daily_model_hourly, el cubo de filtros y el detalle de cada
+modelo/chatter) solo cuando se usan.
 """
 
+import argparse
 import json
 import os
 import re
 
+from artifacts import describe_artifact, publish_artifact
+from columnar import decode_dashboard
+
 HTML_PATH = r'c:\Users\carlo\Carlos Ribas Cursor Projects\chatters-dashboard\index.html'
 JSON_PATH = r'c:\Users\carlo\Carlos Ribas Cursor Projects\chatters-dashboard\dashboard_data.json'
 OUTPUT_PATH = r'c:\Users\carlo\Carlos Ribas Cursor Projects\chatters-dashboard\Chatters_Dashboard_Feb1_13_2026.html'
 
+# Sections only needed once a filter, tab or modal asks for them
+LAZY_TABLES = ['daily_hourly', 'daily_model', 'daily_model_hourly', 'cube']
+LAZY_DETAILS = {
+    'models': ['hourly', 'chatters'],   # openModel() / model filter
+    'chatters': ['models', 'hourly'],   # openChatter() / model filter
+}
+
+
+def split_chunks(data):
+    """Split dashboard data into a small summary plus lazily parsed chunks."""
+    summary = {k: v for k, v in data.items() if k not in LAZY_TABLES}
+    chunks = {}
+    for key in LAZY_TABLES:
+        if key in data:
+            chunks[key] = data[key]
+    details = {}
+    for list_key, fields in LAZY_DETAILS.items():
+        rows = data.get(list_key, [])
+        summary[list_key] = [{k: v for k, v in row.items() if k not in fields} for row in rows]
+        chunks[list_key + '_detail'] = [{k: row[k] for k in fields if k in row} for row in rows]
+        details[list_key] = fields
+    summary['lazy_chunks'] = {'tables': [k for k in LAZY_TABLES if k in data], 'details': details}
+    return summary, chunks
+
+
+def json_block(name, obj):
+    """Non-executed JSON block; '</' is escaped so no value can close the tag."""
+    text = json.dumps(obj, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+    return '<script type="application/json" id="chunk-%s">%s</script>\n' % (name, text)
+
+
+parser = argparse.ArgumentParser(description='Genera el HTML standalone con los datos embebidos.')
+parser.add_argument('--publish', action='store_true',
+                    help='escribir tambien la copia con hash de contenido (+ .gz/.br) y actualizar el manifest')
+args = parser.parse_args()
+
 with open(JSON_PATH, 'r', encoding='utf-8') as f:
-    data = json.load(f)
+    data = decode_dashboard(json.load(f))  # accepts rows or --format columnar
+
+# Rollup cube written by process_data.py next to the JSON (optional)
+cube_path = os.path.join(os.path.dirname(JSON_PATH), data.get('cube_file', ''))
+if data.get('cube_file') and os.path.exists(cube_path):
+    with open(cube_path, 'r', encoding='utf-8') as f:
+        data['cube'] = json.load(f)
+else:
+    print("AVISO: sin cubo de filtros (%s), los filtros usaran los agregados del JSON" % cube_path)
 
-json_minified = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+summary, chunks = split_chunks(data)
+named_blocks = [('summary', json_block('summary', summary))] + [(k, json_block(k, v)) for k, v in chunks.items()]
+blocks = ''.join(block for _, block in named_blocks)
 
 with open(HTML_PATH, 'r', encoding='utf-8') as f:
     html = f.read()
@@ -23,20 +78,30 @@ with open(HTML_PATH, 'r', encoding='utf-8') as f:
 # Replace loadData() function regardless of its current content
 # Match: async function loadData() { ... render(); \n}
 pattern = r'async function loadData\(\)\s*\{.*?render\(\);\s*\}'
-replacement = "async function loadData() {\n  D = " + json_minified + ";\n  render();\n}"
+replacement = ("async function loadData() {\n  D = readChunk('summary');\n"
+               "  attachLazyChunks();\n  render();\n}")
 
-new_html, count = re.subn(pattern, replacement, html, count=1, flags=re.DOTALL)
-
-if count == 0:
+match = re.search(pattern, html, flags=re.DOTALL)
+if not match:
     print("ERROR: No se encontro la funcion loadData() en index.html")
     exit(1)
 
+# Data blocks go right before the app <script> so they are in the DOM when it runs
+script_start = html.rfind('<script>', 0, match.start())
+new_html = (html[:script_start] + blocks + html[script_start:match.start()]
+            + replacement + html[match.end():])
+
 with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
     f.write(new_html)
 
 size_kb = os.path.getsize(OUTPUT_PATH) / 1024
 print("Archivo generado: %s" % OUTPUT_PATH)
 print("Tamano: %d KB" % size_kb)
+for name, block in named_blocks:
+    print("  chunk %-16s %6d KB" % (name, len(block.encode('utf-8')) / 1024))
+
+if args.publish:
+    print("Publicado: %s" % describe_artifact(publish_artifact(OUTPUT_PATH)))
 
 # Verify account_type is in the output
 at_count = new_html.count('account_type')
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Formato columnar opcional para dashboard_data.json.
+
+Cada lista de dicts con las mismas claves (daily, daily_model, el hourly de
+cada modelo, ...) pasa a ser un objeto de arrays paralelos, asi los nombres
+de las claves se escriben una vez por tabla en vez de una vez por fila:
+
+    [{"date": "2026-02-01", "messages": 10}, {"date": "2026-02-02", "messages": 7}]
+    -> {"__rows__": 2, "date": ["2026-02-01", "2026-02-02"], "messages": [10, 7]}
+
+El nivel superior lleva una cabecera "format"; al decodificar se recupera el
+formato por filas exacto, con el orden de las claves. index.html tiene el
+decodificador JS equivalente.
+"""
+
+COLUMNAR_FORMAT = 'columnar'
+COLUMNAR_VERSION = 1
+TABLE_KEY = '__rows__'
+
+
+def _is_table(value):
+    if not isinstance(value, list) or not value or not isinstance(value[0], dict):
+        return False
+    keys = list(value[0])
+    # Same keys in the same order on every row, so decoding is lossless
+    return TABLE_KEY not in keys and all(isinstance(r, dict) and list(r) == keys for r in value)
+
+
+def encode_columnar(value):
+    """Recursively turn uniform lists of dicts into column tables."""
+    if _is_table(value):
+        table = {TABLE_KEY: len(value)}
+        for key in value[0]:
+            table[key] = [encode_columnar(row[key]) for row in value]
+        return table
+    if isinstance(value, dict):
+        return {k: encode_columnar(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [encode_columnar(v) for v in value]
+    return value
+
+
+def decode_columnar(value):
+    """Inverse of encode_columnar."""
+    if isinstance(value, dict):
+        if TABLE_KEY in value:
+            n = value[TABLE_KEY]
+            columns = [(k, v) for k, v in value.items() if k != TABLE_KEY]
+            return [{k: decode_columnar(col[i]) for k, col in columns} for i in range(n)]
+        return {k: decode_columnar(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_columnar(v) for v in value]
+    return value
+
+
+def encode_dashboard(dashboard):
+    """Columnar payload with its format/version header first."""
+    payload = {'format': {'name': COLUMNAR_FORMAT, 'version': COLUMNAR_VERSION}}
+    payload.update(encode_columnar(dashboard))
+    return payload
+
+
+def decode_dashboard(payload):
+    """Row-format dashboard from either format (row files pass through)."""
+    header = payload.get('format')
+    if not header:
+        return payload
+    if header.get('name') != COLUMNAR_FORMAT or header.get('version', 0) > COLUMNAR_VERSION:
+        raise ValueError('Formato de datos no soportado: %r' % (header,))
+    return decode_columnar({k: v for k, v in payload.items() if k != 'format'})
@@ -9,8 +9,8 @@ with open(path, 'r', encoding='utf-8') as f:
 pattern = r'async function loadData\(\)\s*\{.*?render\(\);\s*\}'
 replacement = """async function loadData() {
   try {
-    const r = await fetch('dashboard_data.json');
-    D = await r.json();
+    // Fetched, parsed and decoded in the aggregation worker when available
+    D = await loadDashboard();
   } catch(e) {
     D = window.__EMBEDDED_DATA__;
   }
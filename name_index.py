@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Indice de nombres compartido por process_data.py y sync_hubstaff.py.
+
+Resuelve nombres que solo difieren en mayusculas, acentos o espacios
+("Albert  Arape" vs "Albert Arapé", "Sharon " vs "Sharon") con busquedas en
+diccionarios, en vez de recorrer la lista entera de nombres por cada entidad.
+"""
+
+import re
+import unicodedata
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and collapse whitespace."""
+    decomposed = unicodedata.normalize('NFKD', str(name))
+    plain = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _WHITESPACE.sub(' ', plain).strip().casefold()
+
+
+def _substrings(text):
+    n = len(text)
+    return {text[i:j] for i in range(n) for j in range(i + 1, n + 1)}
+
+
+def build_name_index(mapping, substrings=False):
+    """Precompute lookup tables for the keys of `mapping` (name -> value).
+
+    Keys keep their insertion order (`order`) so ambiguous candidates are
+    reported in the same order the source file lists them. With
+    `substrings=True` every substring of every normalized key is indexed too,
+    which lets `resolve_name` answer containment queries without a scan.
+    """
+    index = {'mapping': mapping, 'order': {}, 'normalized': {}, 'substrings': {}}
+    for pos, key in enumerate(mapping):
+        index['order'][key] = pos
+        norm = normalize_name(key)
+        if not norm:
+            continue
+        index['normalized'].setdefault(norm, []).append(key)
+        if substrings:
+            for part in _substrings(norm):
+                index['substrings'].setdefault(part, []).append(key)
+    return index
+
+
+def _pick(index, candidates):
+    """Return (key, candidates). key is None when candidates disagree on the value."""
+    candidates = sorted(set(candidates), key=index['order'].get)
+    if not candidates:
+        return None, []
+    values = {index['mapping'][k] for k in candidates}
+    if len(values) > 1:
+        return None, candidates
+    return candidates[0], candidates
+
+
+def resolve_name(index, name, substring=False):
+    """Resolve `name` against the index.
+
+    Tries, in order: exact key, normalized key and (with `substring=True`)
+    normalized containment in either direction. Returns (key, candidates):
+    `key` is the matched key or None; `candidates` lists every key tied at the
+    deciding stage, so candidates with key None means the name is ambiguous.
+    """
+    if name in index['mapping']:
+        return name, [name]
+    norm = normalize_name(name)
+    if not norm:
+        return None, []
+    if norm in index['normalized']:
+        return _pick(index, index['normalized'][norm])
+    if not substring:
+        return None, []
+    # Keys that contain the name, plus keys contained in the name; the
+    # longest shared text wins ("Clara Ortega x" -> "Clara Ortega", not "Lara")
+    best, candidates = 0, []
+    if norm in index['substrings']:
+        best, candidates = len(norm), list(index['substrings'][norm])
+    for part in _substrings(norm):
+        if part in index['normalized'] and len(part) >= best:
+            if len(part) > best:
+                best, candidates = len(part), []
+            candidates.extend(index['normalized'][part])
+    return _pick(index, candidates)
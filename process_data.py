@@ -9,15 +9,30 @@ Fuentes (en pares: Feb 1-10 + Feb 11-13):
   4. Creator Statistics: stats de cada modelo (subs, new fans, LTV, etc.)
 """
 
+import argparse
+import base64
+import glob
+import hashlib
 import json
 import os
 import re
+import shutil
 import sys
+import time
+import tracemalloc
 from collections import defaultdict
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
 
+import numpy as np
 import pandas as pd
 
+from artifacts import describe_artifact, publish_artifact
+from columnar import encode_dashboard
+from name_index import build_name_index, resolve_name
+from store import (create_indexes, digest_keys, group_frame, ingested_hashes, key_tuples, open_store, read_frame,
+                   record_source, reset_family, sql_value, table_summary, upsert_frame)
+
 # ================================================================
 # FILE PATHS - Multiple files per type (Feb 1-10 + Feb 11-13)
 # ================================================================
@@ -41,6 +56,13 @@ CREATOR_STATS_FILES = [
 OUTPUT_PATH = r'c:\Users\carlo\Carlos Ribas Cursor Projects\chatters-dashboard\dashboard_data.json'
 AIRTABLE_TYPES_PATH = r'c:\Users\carlo\Carlos Ribas Cursor Projects\chatters-dashboard\airtable_model_types.json'
 
+# Parsed copies of the Excel sources (see read_sheet); safe to delete at any time
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.excel_cache')
+# Aggregates of already-ingested files, for --incremental runs
+STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.pipeline_state')
+# Every ingested export, deduplicated, for --store runs (see store.py)
+STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard_store.sqlite')
+
 REPORT_START = 'Feb 1, 2026'
 REPORT_END = 'Feb 13, 2026'
 
@@ -124,22 +146,191 @@ SHIFT_LABELS = {
 }
 
 
+# ================================================================
+# VECTORIZED PARSERS (whole-column versions of the functions above)
+# ================================================================
+def _parse_number_series(s, symbol):
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype('float64')
+    text = s.astype(str)
+    cleaned = text.str.replace(symbol, '', regex=False).str.replace(',', '', regex=False)
+    # '' and '-' mean zero; NaN cells stay NaN (like float('nan') in the scalar version)
+    return cleaned.mask(text.isin(['', '-']), '0').astype('float64')
+
+
+def parse_dollar_series(s):
+    """Column version of parse_dollar()."""
+    return _parse_number_series(s, '$')
+
+
+def parse_pct_series(s):
+    """Column version of parse_pct()."""
+    return _parse_number_series(s, '%')
+
+
+def parse_replay_seconds_series(s):
+    """Column version of parse_replay_seconds(): NaN where the scalar version returns None."""
+    if not (pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s)):
+        return pd.Series(np.nan, index=s.index)
+    h = s.str.extract(r'(\d+)h', expand=False).astype('float64')
+    m = s.str.extract(r'(\d+)m', expand=False).astype('float64')
+    sec = s.str.extract(r'(\d+)s', expand=False).astype('float64')
+    total = h.fillna(0) * 3600 + m.fillna(0) * 60 + sec.fillna(0)
+    return total.where(h.notna() | m.notna() | sec.notna())
+
+
+def parse_hours_minutes_series(s):
+    """Column version of parse_hours_minutes()."""
+    text = s.astype(str)
+    h = text.str.extract(r'(\d+)h', expand=False).astype('float64').fillna(0)
+    m = text.str.extract(r'(\d+)min', expand=False).astype('float64').fillna(0)
+    return (h * 60 + m).astype('int64')
+
+
+def parse_hour_series(s):
+    """Hour from 'HH:MM[:SS]' values (NaN when there is no ':')."""
+    text = s.astype(str)
+    first = text.str.split(':', n=1).str[0].where(text.str.contains(':', regex=False, na=False))
+    return pd.to_numeric(first, errors='coerce').astype('float64')
+
+
+def shift_series(hours):
+    """Column version of get_shift(): shift name per hour, None for missing hours."""
+    shifts = np.select(
+        [(hours >= 0) & (hours < 8), (hours >= 8) & (hours < 16)],
+        ['turno1', 'turno2'],
+        default='turno3',
+    ).astype(object)
+    shifts[hours.isna().to_numpy()] = None
+    return pd.Series(shifts, index=hours.index)
+
+
+# ================================================================
+# STAGE TIMINGS (collected on every run, reported by bench_process_data.py)
+# ================================================================
+STAGE_TIMES = []  # [(stage, seconds, peak MB while tracemalloc is tracing, else None)]
+_stage_start = [time.perf_counter()]
+
+
+def reset_stages():
+    STAGE_TIMES.clear()
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    _stage_start[0] = time.perf_counter()
+
+
+def stage_done(name):
+    """Record the stage that ran since the previous stage_done() / reset_stages()."""
+    elapsed = time.perf_counter() - _stage_start[0]
+    peak = None
+    if tracemalloc.is_tracing():
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.reset_peak()
+    STAGE_TIMES.append((name, elapsed, peak))
+    _stage_start[0] = time.perf_counter()
+
+
+# ================================================================
+# PARSED EXCEL CACHE (columnar copy of each sheet, keyed by file hash)
+# ================================================================
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_cache_index():
+    index_path = os.path.join(CACHE_DIR, 'index.json')
+    if os.path.exists(index_path):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache_index(index):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(os.path.join(CACHE_DIR, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+
+def source_hash(path, index, persist=True):
+    """Content hash of a workbook. Only re-hashed when its mtime or size changes;
+    cached sheets of the previous content are deleted when the hash changes.
+    With persist=False (--no-cache) `index` is only kept in memory.
+    """
+    st = os.stat(path)
+    entry = index.get(path)
+    if entry and entry['mtime'] == st.st_mtime and entry['size'] == st.st_size:
+        return entry['sha256']
+    sha = file_sha256(path)
+    if persist and entry and entry['sha256'] != sha:
+        still_used = any(e['sha256'] == entry['sha256'] for p, e in index.items() if p != path)
+        if not still_used:
+            for old in glob.glob(os.path.join(CACHE_DIR, entry['sha256'][:20] + '_*')):
+                os.remove(old)
+    index[path] = {'mtime': st.st_mtime, 'size': st.st_size, 'sha256': sha}
+    if persist:
+        save_cache_index(index)
+    return sha
+
+
+def read_sheet(path, sheet_name, use_cache=True):
+    """pd.read_excel with an on-disk Parquet copy of the parsed sheet.
+    Sheets Parquet cannot store (mixed-type columns) are cached as pickle instead.
+    """
+    if not use_cache:
+        return pd.read_excel(path, sheet_name=sheet_name)
+
+    sha = source_hash(path, load_cache_index())
+    base = os.path.join(CACHE_DIR, '%s_%s' % (sha[:20], re.sub(r'\W+', '_', sheet_name)))
+    if os.path.exists(base + '.parquet'):
+        df = pd.read_parquet(base + '.parquet')
+        # Parquet returns None for empty text cells; read_excel gives NaN
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+        return df
+    if os.path.exists(base + '.pkl'):
+        return pd.read_pickle(base + '.pkl')
+
+    df = pd.read_excel(path, sheet_name=sheet_name)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        df.to_parquet(base + '.parquet', index=False)
+    except (ImportError, ValueError, TypeError, NotImplementedError):
+        if os.path.exists(base + '.parquet'):
+            os.remove(base + '.parquet')
+        df.to_pickle(base + '.pkl')
+    return df
+
+
+def purge_excel_cache():
+    if os.path.isdir(CACHE_DIR):
+        shutil.rmtree(CACHE_DIR)
+        print("Cache de Excel eliminada: %s" % CACHE_DIR)
+
+
 # ================================================================
 # MULTI-FILE LOADING WITH DEDUPLICATION
 # ================================================================
-def load_and_concat(file_list, sheet_name, label, dedup_cols=None):
-    """Load multiple Excel files, concatenate, and deduplicate."""
+def load_and_concat(file_list, sheet_name, label, dedup_cols=None, use_cache=True, sheets=None):
+    """Load multiple Excel files, concatenate, and deduplicate.
+    `sheets` holds frames already parsed by read_sheets_parallel().
+    """
     frames = []
     for path in file_list:
-        df = pd.read_excel(path, sheet_name=sheet_name)
+        df = sheets[(path, sheet_name)] if sheets is not None else read_sheet(path, sheet_name, use_cache)
         print("   %s: %d filas (%s)" % (label, len(df), path.split('\\')[-1][:40]))
         frames.append(df)
 
     combined = pd.concat(frames, ignore_index=True)
     total_before = len(combined)
+    stage_done('%s concat' % label)
 
     if dedup_cols:
         combined = combined.drop_duplicates(subset=dedup_cols, keep='first')
+        stage_done('%s dedup' % label)
 
     total_after = len(combined)
     dupes = total_before - total_after
@@ -151,99 +342,595 @@ def load_and_concat(file_list, sheet_name, label, dedup_cols=None):
     return combined
 
 
-def load_creator_stats(file_list):
-    """Load Creator Statistics from multiple files and combine.
-    Revenue fields are summed. Snapshot fields use the latest file's values.
-    """
+def read_creator_stats(file_list, use_cache=True, sheets=None):
+    """Load the Creator Statistics summary and detail sheets of each file (in file order)."""
     all_summary = []
     all_detail = []
     for path in file_list:
-        df_summary = pd.read_excel(path, sheet_name='Creator Statistics')
+        if sheets is not None:
+            df_summary = sheets[(path, 'Creator Statistics')]
+        else:
+            df_summary = read_sheet(path, 'Creator Statistics', use_cache)
         print("   CreatorStats summary: %d modelos (%s)" % (len(df_summary), path.split('\\')[-1][:40]))
         all_summary.append(df_summary)
-        try:
-            df_detail = pd.read_excel(path, sheet_name='Creator Statistics Detail')
+        if sheets is not None:
+            df_detail = sheets[(path, 'Creator Statistics Detail')]
+        else:
+            df_detail = read_optional_sheet(path, 'Creator Statistics Detail', use_cache)
+        if df_detail is not None:
             all_detail.append(df_detail)
             print("   CreatorStats detail: %d filas" % len(df_detail))
-        except Exception:
-            pass
-
-    # Combine summary data: sum revenue fields, take latest for snapshot fields
-    cs_data = {}
-    # Process files in order (earliest first, latest last)
-    for df in all_summary:
-        for _, row in df.iterrows():
-            name = row['Creator']
-            if name not in cs_data:
-                cs_data[name] = {
-                    # Revenue fields (will be summed)
-                    'subscription_net': 0, 'new_subs_net': 0, 'recurring_subs_net': 0,
-                    'tips_net': 0, 'total_earnings_net': 0, 'message_net': 0,
-                    # Snapshot fields (will be overwritten by latest)
-                    'contribution_pct': 0, 'of_ranking': 0, 'following': 0,
-                    'fans_renew_on': 0, 'renew_on_pct': 0, 'new_fans': 0,
-                    'active_fans': 0, 'expired_fans_change': 0, 'group': '',
-                    'avg_spend_per_spender': 0, 'avg_spend_per_tx': 0,
-                    'avg_earnings_per_fan': 0, 'avg_sub_length': 'N/A',
-                }
-            cs = cs_data[name]
-            # SUM revenue fields across periods
-            cs['subscription_net'] += parse_dollar(row['Subscription Net'])
-            cs['new_subs_net'] += parse_dollar(row['New subscriptions Net'])
-            cs['recurring_subs_net'] += parse_dollar(row['Recurring subscriptions Net'])
-            cs['tips_net'] += parse_dollar(row['Tips Net'])
-            cs['total_earnings_net'] += parse_dollar(row['Total earnings Net'])
-            cs['message_net'] += parse_dollar(row['Message Net'])
-            # SUM fan movement fields
-            cs['new_fans'] += int(row['New fans']) if pd.notna(row['New fans']) else 0
-            cs['expired_fans_change'] += int(row['Change in expired fan count']) if pd.notna(row['Change in expired fan count']) else 0
-            # LATEST snapshot fields (overwrite each iteration -> last file wins)
-            cs['contribution_pct'] = parse_pct(row['Contribution %']) if pd.notna(row['Contribution %']) else cs['contribution_pct']
-            cs['of_ranking'] = parse_pct(row['OF ranking']) if pd.notna(row['OF ranking']) else cs['of_ranking']
-            cs['following'] = int(row['Following']) if pd.notna(row['Following']) else cs['following']
-            cs['fans_renew_on'] = int(row['Fans with renew on']) if pd.notna(row['Fans with renew on']) else cs['fans_renew_on']
-            cs['renew_on_pct'] = parse_pct(row['Renew on %']) if pd.notna(row['Renew on %']) else cs['renew_on_pct']
-            cs['active_fans'] = int(row['Active fans']) if pd.notna(row['Active fans']) else cs['active_fans']
-            cs['group'] = str(row['Creator group']) if pd.notna(row['Creator group']) else cs['group']
-            cs['avg_spend_per_spender'] = parse_dollar(row['Avg spend per spender Net'])
-            cs['avg_spend_per_tx'] = parse_dollar(row['Avg spend per transaction Net'])
-            cs['avg_earnings_per_fan'] = parse_dollar(row['Avg earnings per fan Net'])
-            cs['avg_sub_length'] = str(row['Avg subscription length']) if pd.notna(row['Avg subscription length']) else cs['avg_sub_length']
-
-    # Round revenue fields
-    for name in cs_data:
-        for k in ['subscription_net', 'new_subs_net', 'recurring_subs_net', 'tips_net', 'total_earnings_net', 'message_net']:
-            cs_data[name][k] = round(cs_data[name][k], 2)
-
-    return cs_data, all_detail
+    return all_summary, all_detail
 
 
 # ================================================================
-# MAIN
+# PARALLEL SHEET LOADING (process pool, one job per workbook sheet)
 # ================================================================
-def main():
-    # Load Airtable model types (free/paid/mixta classification)
-    with open(AIRTABLE_TYPES_PATH, 'r', encoding='utf-8') as f:
-        airtable_types = json.load(f)
-    print("Airtable types loaded: %d modelos" % len(airtable_types))
+def read_optional_sheet(path, sheet_name, use_cache=True):
+    """read_sheet(), or None when the workbook has no such sheet."""
+    try:
+        return read_sheet(path, sheet_name, use_cache)
+    except Exception:
+        return None
 
-    # ================================================================
-    # 1. LOAD MESSAGE DASHBOARDS (Feb 1-10 + Feb 11-13)
-    # ================================================================
-    print("\n1/4 Leyendo Message Dashboards...")
-    df_msg = load_and_concat(
-        MSG_DASHBOARDS, 'Message Dashboard', 'MsgDash',
-        dedup_cols=['Sender', 'Creator', 'Sent time', 'Sent date', 'Price', 'Source']
+
+def _read_sheet_job(job):
+    path, sheet_name, use_cache, optional = job
+    if optional:
+        return read_optional_sheet(path, sheet_name, use_cache)
+    return read_sheet(path, sheet_name, use_cache)
+
+
+def sheet_jobs(msg_files, db_files, sales_files, cs_files):
+    """(path, sheet_name, optional) for every sheet the loaders will read."""
+    return (
+        [(p, 'Message Dashboard', False) for p in msg_files]
+        + [(p, 'Detailed breakdown', False) for p in db_files]
+        + [(p, 'Sales record', False) for p in sales_files]
+        + [(p, 'Creator Statistics', False) for p in cs_files]
+        + [(p, 'Creator Statistics Detail', True) for p in cs_files]
     )
 
+
+def read_sheets_parallel(jobs, use_cache=True, workers=None):
+    """Parse every sheet in `jobs` concurrently in a process pool.
+    Returns {(path, sheet_name): DataFrame}; the loaders consume it in file-list
+    order, so row order (and dedup keep='first') does not depend on which
+    worker finishes first. workers=None uses every CPU; 1 reads in-process.
+    """
+    if use_cache:
+        # Hash the workbooks here so the workers only read the cache index
+        index = load_cache_index()
+        for path in dict.fromkeys(job[0] for job in jobs):
+            source_hash(path, index)
+    args = [(path, sheet_name, use_cache, optional) for path, sheet_name, optional in jobs]
+    workers = min(workers or os.cpu_count() or 1, len(args))
+    print("Leyendo %d hojas Excel con %d proceso(s)..." % (len(args), max(workers, 1)))
+    if workers <= 1:
+        results = [_read_sheet_job(a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_read_sheet_job, args))
+    return {(a[0], a[1]): df for a, df in zip(args, results)}
+
+
+CS_REVENUE_FIELDS = ['subscription_net', 'new_subs_net', 'recurring_subs_net', 'tips_net',
+                     'total_earnings_net', 'message_net']
+
+
+def fold_creator_stats(cs_data, df):
+    """Fold one file's Creator Statistics summary into `cs_data` (files in order,
+    earliest first). Revenue fields are summed. Snapshot fields use the latest file's values.
+    """
+    for _, row in df.iterrows():
+        name = row['Creator']
+        if name not in cs_data:
+            cs_data[name] = {
+                # Revenue fields (will be summed)
+                'subscription_net': 0, 'new_subs_net': 0, 'recurring_subs_net': 0,
+                'tips_net': 0, 'total_earnings_net': 0, 'message_net': 0,
+                # Snapshot fields (will be overwritten by latest)
+                'contribution_pct': 0, 'of_ranking': 0, 'following': 0,
+                'fans_renew_on': 0, 'renew_on_pct': 0, 'new_fans': 0,
+                'active_fans': 0, 'expired_fans_change': 0, 'group': '',
+                'avg_spend_per_spender': 0, 'avg_spend_per_tx': 0,
+                'avg_earnings_per_fan': 0, 'avg_sub_length': 'N/A',
+            }
+        cs = cs_data[name]
+        # SUM revenue fields across periods
+        cs['subscription_net'] += parse_dollar(row['Subscription Net'])
+        cs['new_subs_net'] += parse_dollar(row['New subscriptions Net'])
+        cs['recurring_subs_net'] += parse_dollar(row['Recurring subscriptions Net'])
+        cs['tips_net'] += parse_dollar(row['Tips Net'])
+        cs['total_earnings_net'] += parse_dollar(row['Total earnings Net'])
+        cs['message_net'] += parse_dollar(row['Message Net'])
+        # SUM fan movement fields
+        cs['new_fans'] += int(row['New fans']) if pd.notna(row['New fans']) else 0
+        cs['expired_fans_change'] += int(row['Change in expired fan count']) if pd.notna(row['Change in expired fan count']) else 0
+        # LATEST snapshot fields (overwrite each iteration -> last file wins)
+        cs['contribution_pct'] = parse_pct(row['Contribution %']) if pd.notna(row['Contribution %']) else cs['contribution_pct']
+        cs['of_ranking'] = parse_pct(row['OF ranking']) if pd.notna(row['OF ranking']) else cs['of_ranking']
+        cs['following'] = int(row['Following']) if pd.notna(row['Following']) else cs['following']
+        cs['fans_renew_on'] = int(row['Fans with renew on']) if pd.notna(row['Fans with renew on']) else cs['fans_renew_on']
+        cs['renew_on_pct'] = parse_pct(row['Renew on %']) if pd.notna(row['Renew on %']) else cs['renew_on_pct']
+        cs['active_fans'] = int(row['Active fans']) if pd.notna(row['Active fans']) else cs['active_fans']
+        cs['group'] = str(row['Creator group']) if pd.notna(row['Creator group']) else cs['group']
+        cs['avg_spend_per_spender'] = parse_dollar(row['Avg spend per spender Net'])
+        cs['avg_spend_per_tx'] = parse_dollar(row['Avg spend per transaction Net'])
+        cs['avg_earnings_per_fan'] = parse_dollar(row['Avg earnings per fan Net'])
+        cs['avg_sub_length'] = str(row['Avg subscription length']) if pd.notna(row['Avg subscription length']) else cs['avg_sub_length']
+
+
+def round_creator_stats(cs_data):
+    """Copy of folded Creator Statistics with the summed revenue fields rounded."""
+    return {name: dict(cs, **{k: round(cs[k], 2) for k in CS_REVENUE_FIELDS}) for name, cs in cs_data.items()}
+
+
+# ================================================================
+# MERGEABLE AGGREGATES (what main() computes from, folded file by file)
+# ================================================================
+# main() reads no rows: every figure comes from these aggregates. New rows are
+# folded in without revisiting older ones, so --incremental saves the aggregates
+# instead of the parsed rows:
+#   msg_cells / sales_cells  additive measures per date x model x chatter x hour
+#   db_cells                 Detailed Breakdown sums per model x chatter, with the days
+#                            worked and the position of the first row (rollup order);
+#                            float sums keep their rows (see ordered_sums)
+#   fans / fan_sets          interned fan IDs and the exact fan set of each FAN_SLICES
+#                            slice (unique fans are not additive)
+#   replay                   response time histograms (seconds -> messages), so means,
+#                            medians and buckets stay exact
+#   cs                       Creator Statistics, summed as fold_creator_stats() does
+MSG_CELL_KEYS = ['DateStr', 'Creator', 'Sender', 'Hour']
+SALES_CELL_KEYS = ['Date', 'Creator', 'Employee', 'Hour']
+DB_CELL_KEYS = ['Creators', 'Employees', 'Emp_key']
+MSG_MEASURES = ['messages', 'ppv_sent', 'ppv_unlocked', 'replay_sum', 'replay_count']
+SALES_MEASURES = ['sales_net', 'msg_sales', 'sub_sales', 'tips', 'transactions']
+DB_SUMS = {  # db_cells column -> Detailed Breakdown column summed into it
+    'sales': 'Sales_num', 'messages_sent': 'Msgs_sent', 'ppv_sent': 'PPVs_sent',
+    'ppv_unlocked': 'PPVs_unlocked', 'fans_chatted': 'Fans_chatted', 'fans_spent': 'Fans_spent',
+    'char_count': 'Char_count', 'clocked_min': 'Clocked_min', 'resp_sum': 'Resp_seconds',
+    'sph_sum': 'Sales_per_hour',
+}
+DB_COUNTS = list(DB_SUMS) + ['resp_count', 'rows']
+DB_ROW_SUMS = ['sales', 'resp_sum', 'sph_sum']  # float sums, added row by row in row order
+DELETED_ORDER = 1 << 40  # "(delete)" rows come after the rest (drop_deleted_model_dupes)
+NO_ORDER = np.iinfo(np.int64).max
+# Slices whose unique fans the dashboard shows (chatter x hour shows none)
+FAN_SLICES = [('Hour',), ('DateStr',), ('DateStr', 'Hour'), ('DateStr', 'Creator'), ('Shift',), ('Creator', 'Hour'),
+              ('DateStr', 'Creator', 'Hour')]
+REPLAY_KEYS = ['all', 'Creator', 'Sender']
+
+
+def empty_aggregates():
+    return {
+        'msg_cells': None, 'sales_cells': None, 'db_cells': None, 'db_rows': 0,
+        'fans': {}, 'fan_sets': {keys: {} for keys in FAN_SLICES},
+        'replay': {key: None for key in REPLAY_KEYS}, 'cs': {},
+    }
+
+
+def plain_keys(df):
+    """Category columns as objects: categories of different files do not concat."""
+    for col in df.columns[df.dtypes == 'category']:
+        df[col] = df[col].astype(object)
+    return df
+
+
+def merge_cells(old, new, keys):
+    """Sum two cell tables on `keys` (a missing key is a key too)."""
+    if old is None:
+        return new
+    return pd.concat([old, new], ignore_index=True).groupby(keys, dropna=False, sort=False, as_index=False).sum()
+
+
+def ordered_sums(blocks):
+    """Sums of the value columns of (order, value, ...) row blocks, added one row at
+    a time in row order. Float addition is not associative: this is the sum the
+    row-by-row loops computed, whatever cells and files the rows were folded in.
+    """
+    rows = np.concatenate(list(blocks))
+    rows = rows[np.argsort(rows[:, 0], kind='stable')]
+    return np.cumsum(rows[:, 1:], axis=0)[-1]  # sequential, unlike np.sum (pairwise)
+
+
+def intern_fans(fans, fan_col):
+    """Interned ID per row of the Fan_ID category column (-1 where missing);
+    fans not seen before are added to `fans` ({fan: ID}).
+    """
+    codes = fan_col.cat.codes.to_numpy()
+    categories = fan_col.cat.categories
+    ids = np.full(len(categories), -1, dtype=np.int64)
+    for code in np.unique(codes[codes >= 0]):
+        ids[code] = fans.setdefault(categories[code], len(fans))
+    return np.where(codes >= 0, ids[codes], -1)
+
+
+def fold_messages(agg, df_msg):
+    """Fold parsed, deduplicated Message Dashboard rows into `agg`."""
+    rows = df_msg.assign(ppv_unlocked=df_msg['is_ppv'] & df_msg['is_purchased'])
+    cells = rows.groupby(MSG_CELL_KEYS, dropna=False, observed=True, sort=False).agg(
+        messages=('is_ppv', 'size'),
+        ppv_sent=('is_ppv', 'sum'),
+        ppv_unlocked=('ppv_unlocked', 'sum'),
+        replay_sum=('Replay_seconds', 'sum'),
+        replay_count=('Replay_seconds', 'count'),
+    )
+    agg['msg_cells'] = merge_cells(agg['msg_cells'], plain_keys(cells.reset_index()), MSG_CELL_KEYS)
+
+    timed = df_msg[df_msg['Replay_seconds'].notna()]
+    for key in REPLAY_KEYS:
+        cols = ['Replay_seconds'] if key == 'all' else [key, 'Replay_seconds']
+        hist = timed.groupby(cols, observed=True).size().rename('count').reset_index()
+        agg['replay'][key] = merge_cells(agg['replay'][key], plain_keys(hist), cols)
+
+    fold_fan_sets(agg, df_msg)
+
+
+def fold_fan_sets(agg, df_msg):
+    """Add the fans (Fan_ID) of `df_msg` rows to every FAN_SLICES slice."""
+    ids = intern_fans(agg['fans'], df_msg['Fan_ID'])
+    for keys in FAN_SLICES:
+        pairs = pd.DataFrame({k: df_msg[k] for k in keys})
+        pairs['fan'] = ids
+        pairs = pairs[pairs['fan'] >= 0].drop_duplicates()
+        sets = agg['fan_sets'][keys]
+        for key, group in pairs.groupby(list(keys), observed=True):
+            key = key[0] if len(keys) == 1 else key
+            fans = np.sort(group['fan'].to_numpy().astype(np.int32))
+            sets[key] = np.union1d(sets[key], fans) if key in sets else fans
+
+
+def fold_sales(agg, df_sales):
+    """Fold parsed, deduplicated Sales Record rows into `agg` (reverses are left out)."""
+    valid = df_sales[df_sales['Status'] != 'Reverse']
+    cells = valid.groupby(SALES_CELL_KEYS, dropna=False, observed=True, sort=False).agg(
+        sales_net=('Net', 'sum'),
+        msg_sales=('Net_msg', 'sum'),
+        sub_sales=('Net_sub', 'sum'),
+        tips=('Net_tips', 'sum'),
+        transactions=('Net', 'size'),
+    )
+    agg['sales_cells'] = merge_cells(agg['sales_cells'], plain_keys(cells.reset_index()), SALES_CELL_KEYS)
+
+
+def combine_db_cells(cells):
+    """One db_cells row per DB_CELL_KEYS combination, ordered by first row."""
+    cells = cells.sort_values('first_order', kind='stable').reset_index(drop=True)
+    cell = cells.groupby(DB_CELL_KEYS, dropna=False, sort=False).ngroup()
+    g = cells.groupby(cell, sort=True)
+    out = g[DB_CELL_KEYS].first()
+    out[DB_COUNTS] = g[DB_COUNTS].sum()
+    out['float_rows'] = g['float_rows'].agg(lambda blocks: np.concatenate(list(blocks)))
+    out[DB_ROW_SUMS] = np.array([ordered_sums([rows]) for rows in out['float_rows']]).reshape(-1, len(DB_ROW_SUMS))
+    days = [set() for _ in range(len(out))]
+    for c, d in zip(cell.to_numpy(), cells['days']):
+        days[c] |= d
+    out['days'] = days
+    out['first_order'] = g['first_order'].min()
+    out['first_group'] = g['first_group'].first()
+    by_group = cells.sort_values('group_order', kind='stable').groupby(cell, sort=True)
+    out['group'] = by_group['group'].first()
+    out['group_order'] = by_group['group_order'].min()
+    return out.reset_index(drop=True)
+
+
+def fold_breakdown(agg, df_db):
+    """Fold parsed Detailed Breakdown rows, already through drop_deleted_model_dupes(), into `agg`."""
+    order = agg['db_rows'] + np.arange(len(df_db)) + np.where(is_deleted_model(df_db['Creators']), DELETED_ORDER, 0)
+    cells = plain_keys(pd.DataFrame({k: df_db[k] for k in DB_CELL_KEYS}).reset_index(drop=True))
+    for name, col in DB_SUMS.items():
+        cells[name] = df_db[col].to_numpy()
+    cells['resp_count'] = df_db['Resp_seconds'].notna().to_numpy().astype(np.int64)
+    values = np.nan_to_num(cells[DB_ROW_SUMS].to_numpy(dtype=np.float64))  # NaN adds nothing, like skipna
+    cells['float_rows'] = list(np.column_stack([order, values])[:, None, :])
+    cells['rows'] = 1
+    cells['days'] = [{d} if pd.notna(d) else set() for d in df_db['Day']]
+    cells['first_order'] = order
+    cells['first_group'] = df_db['Group_str'].astype(object).to_numpy()
+    cells['group'] = df_db['Group'].astype(object).to_numpy()
+    cells['group_order'] = np.where(df_db['Group'].notna().to_numpy(), order, NO_ORDER)
+    agg['db_rows'] += len(df_db)
+    if agg['db_cells'] is not None:
+        cells = pd.concat([agg['db_cells'], cells], ignore_index=True)
+    agg['db_cells'] = combine_db_cells(cells)
+
+
+def aggregate_sources(df_msg, df_db, df_sales, cs_summaries):
+    """Aggregates of the frames load_sources() returns."""
+    agg = empty_aggregates()
+    fold_messages(agg, df_msg)
+    fold_breakdown(agg, drop_deleted_model_dupes(df_db))
+    fold_sales(agg, df_sales)
+    for df in cs_summaries:
+        fold_creator_stats(agg['cs'], df)
+    return agg
+
+
+# ================================================================
+# AGGREGATION ENGINE (slices of the aggregate cells)
+# ================================================================
+EMPTY_SLICE = {
+    'messages': 0, 'fans_chatted': 0, 'ppv_sent': 0, 'replay_sum': 0.0, 'replay_count': 0,
+    'sales_net': 0.0, 'msg_sales': 0.0, 'sub_sales': 0.0, 'tips': 0.0, 'transactions': 0,
+}
+
+
+def with_shift(cells, keys):
+    """`cells` plus a Shift column (from Hour) when `keys` group by shift."""
+    if 'Shift' not in keys:
+        return cells
+    return cells.assign(Shift=shift_series(cells['Hour'].astype('float64')).to_numpy())
+
+
+def group_messages(msg_cells, keys):
+    """Message measures for every combination of `keys` at once."""
+    return with_shift(msg_cells, keys).groupby(keys, observed=True)[MSG_MEASURES].sum()
+
+
+def group_sales(sales_cells, keys):
+    """Sales measures (Net split by Type) for every combination of `keys` at once."""
+    return with_shift(sales_cells, keys).groupby(keys, observed=True)[SALES_MEASURES].sum()
+
+
+def build_slices(agg, msg_keys, sales_keys=None):
+    """Group both cell tables once and return {key: measures} for every non-empty slice.
+    Keys are scalars for a single column and tuples for several (same as groupby).
+    Slices present in only one table get zeros for the other table's measures;
+    fans_chatted is only there for the FAN_SLICES.
+    """
+    sales_keys = sales_keys or msg_keys
+    msg_agg = group_messages(agg['msg_cells'], msg_keys)
+    fan_slices = agg['fan_sets'].get(tuple(msg_keys))
+    if fan_slices is not None:
+        msg_agg['fans_chatted'] = [len(fan_slices.get(key, ())) for key in msg_agg.index]
+    sales_agg = group_sales(agg['sales_cells'], sales_keys)
+    sales_agg.index = sales_agg.index.set_names(msg_agg.index.names)
+    combined = pd.concat([msg_agg, sales_agg], axis=1).fillna(0)
+    return combined.to_dict('index')
+
+
+def avg_replay(s):
+    """Mean response time of a slice (same value as Series.mean() on its rows)."""
+    return round(s['replay_sum'] / s['replay_count'], 1) if s['replay_count'] > 0 else 0
+
+
+def split_by_entity(items):
+    """Regroup [((entity, sub_key), row), ...] into {entity: [(sub_key, row), ...]}, keeping order."""
+    out = defaultdict(list)
+    for (entity, sub_key), row in items:
+        out[entity].append((sub_key, row))
+    return out
+
+
+# ================================================================
+# UNIQUE FAN SETS (interned fan IDs, unionable per slice)
+# ================================================================
+# Fans are numbered by rank among all fan IDs (0..fan_count-1, the codes of
+# the Fan_ID category of a full parse).
+# Each slice stores its fans either exactly ('e:' + base64 of varint-encoded
+# sorted ID deltas) or, above FAN_SET_EXACT_MAX fans, as a HyperLogLog sketch
+# ('h:' + base64 of 2**HLL_PRECISION registers). index.html unions the sets of
+# the rows a filter selects to count unique fans across days and models.
+FAN_SET_EXACT_MAX = 4096
+HLL_PRECISION = 12
+
+
+def fan_codes(fans):
+    """Rank of each interned fan (see intern_fans) among all fan IDs."""
+    names = np.array(list(fans), dtype=object)
+    codes = np.empty(len(names), dtype=np.int64)
+    codes[np.argsort(names, kind='stable')] = np.arange(len(names))
+    return codes
+
+
+def fmix32(x):
+    """MurmurHash3 finalizer on uint32 (same mixing as fmix32() in index.html)."""
+    x = x.astype(np.uint32)
+    x ^= x >> np.uint32(16)
+    x *= np.uint32(0x85ebca6b)
+    x ^= x >> np.uint32(13)
+    x *= np.uint32(0xc2b2ae35)
+    x ^= x >> np.uint32(16)
+    return x
+
+
+def hll_registers(ids, p=HLL_PRECISION):
+    h = fmix32(ids)
+    idx = (h >> np.uint32(32 - p)).astype(np.int64)
+    w = (h << np.uint32(p)).astype(np.float64)
+    # rank = leading zeros of the remaining bits + 1 (frexp exponent = bit length)
+    rank = np.where(w > 0, 33 - np.frexp(w)[1], 33 - p).astype(np.uint8)
+    regs = np.zeros(1 << p, dtype=np.uint8)
+    np.maximum.at(regs, idx, rank)
+    return regs
+
+
+def varint_bytes(values):
+    """Unsigned LEB128 encoding of a non-negative int array."""
+    values = values.astype(np.int64)
+    nbytes = 1 + sum((values >= (1 << s)).astype(np.int64) for s in (7, 14, 21, 28))
+    item = np.repeat(np.arange(len(values)), nbytes)
+    pos = np.arange(len(item)) - np.repeat(np.cumsum(nbytes) - nbytes, nbytes)
+    out = (values[item] >> (7 * pos)) & 0x7f
+    out |= (pos < nbytes[item] - 1).astype(np.int64) << 7
+    return out.astype(np.uint8).tobytes()
+
+
+def encode_fan_set(ids):
+    """Sorted unique fan IDs -> exact or HyperLogLog string (see section header)."""
+    if len(ids) > FAN_SET_EXACT_MAX:
+        return 'h:' + base64.b64encode(hll_registers(ids).tobytes()).decode('ascii')
+    deltas = np.diff(ids, prepend=0)
+    return 'e:' + base64.b64encode(varint_bytes(deltas)).decode('ascii')
+
+
+def fan_sets(agg, keys, codes):
+    """{slice key: encoded fan set} for every combination of `keys` (one of FAN_SLICES);
+    `codes` = fan_codes(agg['fans']).
+    """
+    return {key: encode_fan_set(np.sort(codes[ids])) for key, ids in agg['fan_sets'][tuple(keys)].items()}
+
+
+# ================================================================
+# ROLLUP CUBE (date x model x chatter x hour, additive measures)
+# ================================================================
+# Written next to dashboard_data.json as dashboard_cube.json, so the dashboard can slice
+# any date / model / chatter / hour combination. Sparse: one cell per combination with
+# messages or sales. Dictionary-encoded: dims holds each distinct (sorted) value once and
+# cells hold indexes into it; cells are sorted by date. Only additive measures are kept
+# (unique fans are not additive, those keep coming from the fan_set rows). Rows without
+# a parsable hour get hour -1: they count in totals, like in daily, but in no hourly view.
+CUBE_FILENAME = 'dashboard_cube.json'
+CUBE_FORMAT = 'cube'
+CUBE_VERSION = 1
+CUBE_KEYS = ['date', 'model', 'chatter', 'hour']
+CUBE_MEASURE_DIGITS = {  # None = integer count
+    'messages': None, 'ppv_sent': None, 'ppv_unlocked': None, 'replay_sum': 1, 'replay_count': None,
+    'sales_net': 2, 'msg_sales': 2, 'sub_sales': 2, 'tips': 2, 'transactions': None,
+}
+
+
+def _cube_name(s):
+    """Names as plain strings; missing ones (sales without an employee) become ''."""
+    return s.astype(str).where(s.notna(), '')
+
+
+def build_cube(agg, dates):
+    """Sparse, dictionary-encoded cube over the dates in `dates` (see ROLLUP CUBE)."""
+    msg_cells, sales_cells = agg['msg_cells'], agg['sales_cells']
+    msg = pd.DataFrame({
+        'date': msg_cells['DateStr'], 'model': _cube_name(msg_cells['Creator']),
+        'chatter': _cube_name(msg_cells['Sender']), 'hour': msg_cells['Hour'],
+    })
+    msg[MSG_MEASURES] = msg_cells[MSG_MEASURES]
+    sales = pd.DataFrame({
+        'date': sales_cells['Date'], 'model': _cube_name(sales_cells['Creator']),
+        'chatter': _cube_name(sales_cells['Employee']), 'hour': sales_cells['Hour'],
+    })
+    sales[SALES_MEASURES] = sales_cells[SALES_MEASURES]
+    grouped = [df.groupby(CUBE_KEYS, dropna=False).sum() for df in (msg, sales)]
+    cells = pd.concat(grouped, axis=1).fillna(0).reset_index()
+    cells['hour'] = cells['hour'].fillna(-1).astype(int)
+    cells = cells[cells['date'].isin(dates) & cells['hour'].between(-1, 23)]
+    cells = cells.sort_values(CUBE_KEYS, kind='stable')
+
+    dims, columns = {}, {}
+    for key in ('date', 'model', 'chatter'):
+        codes, values = pd.factorize(cells[key], sort=True)
+        dims[key] = [v.isoformat() for v in values] if key == 'date' else list(values)
+        columns[key] = codes.tolist()
+    columns['hour'] = cells['hour'].tolist()
+    for name, digits in CUBE_MEASURE_DIGITS.items():
+        col = cells[name]
+        columns[name] = col.astype(int).tolist() if digits is None else col.round(digits).tolist()
+    return {'format': {'name': CUBE_FORMAT, 'version': CUBE_VERSION}, 'dims': dims, 'cells': columns}
+
+
+# ================================================================
+# COLUMNAR ROLLUPS (per model / per chatter, computed once)
+# ================================================================
+EMPTY_ROLLUP = {
+    'sales': 0.0, 'messages_sent': 0, 'ppv_sent': 0, 'ppv_unlocked': 0, 'fans_chatted': 0,
+    'fans_spent': 0, 'char_count': 0, 'clocked_min': 0, 'resp_sum': 0.0, 'resp_count': 0,
+    'sph_sum': 0.0, 'rows': 0, 'days_worked': 0, 'first_group': '', 'group': None,
+}
+
+
+def rollup_breakdown(db_cells, keys):
+    """Detailed Breakdown metrics per combination of `keys`, in first-appearance order."""
+    g = db_cells.groupby(keys, sort=False)
+    out = g[DB_COUNTS].sum()
+    out[DB_ROW_SUMS] = np.array(list(g['float_rows'].agg(ordered_sums))).reshape(-1, len(DB_ROW_SUMS))
+    out['days_worked'] = g['days'].agg(lambda days: len(set().union(*days)))
+    out['first_group'] = g['first_group'].first()  # group of the first row ('' if empty)
+    by_group = db_cells.sort_values('group_order', kind='stable').groupby(keys, sort=False)
+    out['group'] = by_group['group'].first()  # first non-empty group
+    return out
+
+
+def replay_stats(hist):
+    """Mean, median and buckets of a response time histogram (Replay_seconds, count)."""
+    secs = hist['Replay_seconds'].to_numpy()
+    counts = hist['count'].to_numpy()
+    order = np.argsort(secs, kind='stable')
+    secs, counts = secs[order], counts[order]
+    cum = np.cumsum(counts)
+    n = cum[-1]
+    middle = secs[np.searchsorted(cum, [(n - 1) // 2, n // 2], side='right')]
+    return {
+        'mean': float((secs * counts).sum() / n),
+        'median': float(middle.mean()),
+        'under_2m': int(counts[secs <= 120].sum()),
+        'btwn_2_5m': int(counts[(secs > 120) & (secs <= 300)].sum()),
+        'btwn_5_10m': int(counts[(secs > 300) & (secs <= 600)].sum()),
+        'over_10m': int(counts[secs > 600].sum()),
+    }
+
+
+def rollup_replay(agg, key):
+    """Response time mean/median and buckets per value of `key` (messages without a time are ignored)."""
+    hist = agg['replay'][key]
+    if hist is None:
+        return {}
+    return {name: replay_stats(group) for name, group in hist.groupby(key, sort=False)}
+
+
+# ================================================================
+# PARSING (derived columns per source, row-local)
+# ================================================================
+MSG_DEDUP_COLS = ['Sender', 'Creator', 'Sent time', 'Sent date', 'Price', 'Source']
+DB_DEDUP_COLS = ['Date/Time Africa/Monrovia', 'Employees', 'Creators']
+SALES_DEDUP_COLS = ['DateTime', 'Employee', 'Creator', 'Fan', 'Net revenue', 'Type']
+
+# Columns kept after parsing -> compact dtype (None keeps the parsed dtype).
+# Dedup keys stay so --incremental can match new rows against ingested ones;
+# raw text columns already parsed into numbers are dropped.
+MSG_COLUMNS = {
+    'Sender': 'category', 'Creator': 'category', 'Sent time': None, 'Sent date': 'category',
+    'Price': None, 'Source': 'category', 'Fan_ID': 'category',
+    'is_ppv': None, 'is_purchased': None, 'Hour': 'Int8', 'Shift': 'category',
+    'Replay_seconds': None, 'Date': None, 'DateStr': None,
+}
+DB_COLUMNS = {
+    'Date/Time Africa/Monrovia': None, 'Employees': 'category', 'Creators': 'category',
+    'Group': 'category', 'Group_str': 'category', 'Emp_key': 'category', 'Date': None, 'Day': None,
+    'Sales_num': None, 'Sales_per_hour': None, 'Avg_earn_per_spender': None, 'Resp_seconds': None,
+    'PPVs_sent': 'int32', 'PPVs_unlocked': 'int32', 'Msgs_sent': 'int32', 'Fans_chatted': 'int32',
+    'Fans_spent': 'int32', 'Char_count': 'int32', 'Clocked_min': 'int32',
+    'GR_pct': 'float32', 'UR_pct': 'float32', 'Fan_CVR': 'float32', 'Msgs_per_hour': 'float32',
+}
+SALES_COLUMNS = {
+    'DateTime': None, 'Employee': 'category', 'Creator': 'category', 'Fan': 'category',
+    'Net revenue': None, 'Type': 'category', 'Status': 'category',
+    'Earnings': None, 'Gross': None, 'Net': None, 'Net_msg': None, 'Net_sub': None, 'Net_tips': None,
+    'Hour': 'Int8', 'Shift': 'category', 'Date': None,
+}
+
+
+def frame_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def compact_frame(df, columns, label=None):
+    """Keep only `columns`, converted to their compact dtypes; reports memory if `label`."""
+    before = frame_mb(df) if label else 0
+    df = pd.DataFrame({
+        col: df[col].astype(dtype) if dtype else df[col]
+        for col, dtype in columns.items() if col in df.columns
+    }, index=df.index)
+    if label:
+        print("   -> Memoria %s: %.1f MB -> %.1f MB" % (label, before, frame_mb(df)))
+    return df
+
+
+def prepare_messages(df_msg, label='MsgDash'):
     df_msg['Price_num'] = pd.to_numeric(df_msg['Price'], errors='coerce').fillna(0)
     df_msg['is_ppv'] = df_msg['Price_num'] > 0
     df_msg['is_purchased'] = df_msg['Purchased'].astype(str).str.lower() == 'yes'
-    df_msg['Hour'] = df_msg['Sent time'].apply(
-        lambda x: int(str(x).split(':')[0]) if x and ':' in str(x) else None
-    )
-    df_msg['Shift'] = df_msg['Hour'].apply(lambda h: get_shift(h) if pd.notna(h) else None)
-    df_msg['Replay_seconds'] = df_msg['Replay time'].apply(parse_replay_seconds)
+    df_msg['Hour'] = parse_hour_series(df_msg['Sent time'])
+    df_msg['Shift'] = shift_series(df_msg['Hour'])
+    df_msg['Replay_seconds'] = parse_replay_seconds_series(df_msg['Replay time'])
 
     # Parse date for daily breakdown
     df_msg['Date'] = pd.to_datetime(df_msg['Sent date'], errors='coerce')
@@ -251,25 +938,19 @@ def main():
 
     # Extract fan identifier from 'Sent to' column for unique fan counting
     df_msg['Fan_ID'] = df_msg['Sent to'].astype(str).str.strip()
+    return compact_frame(df_msg, MSG_COLUMNS, label)
 
-    # ================================================================
-    # 2. LOAD DETAILED BREAKDOWNS (Feb 1-10 + Feb 11-13)
-    # ================================================================
-    print("\n2/4 Leyendo Detailed Breakdowns...")
-    df_db = load_and_concat(
-        DETAILED_BREAKDOWNS, 'Detailed breakdown', 'DetailBrkdn',
-        dedup_cols=['Date/Time Africa/Monrovia', 'Employees', 'Creators']
-    )
 
-    df_db['Sales_num'] = df_db['Sales'].apply(parse_dollar)
+def prepare_breakdown(df_db):
+    df_db['Sales_num'] = parse_dollar_series(df_db['Sales'])
     df_db['PPVs_sent'] = pd.to_numeric(df_db['Direct PPVs sent'], errors='coerce').fillna(0).astype(int)
     df_db['PPVs_unlocked'] = pd.to_numeric(df_db['PPVs unlocked'], errors='coerce').fillna(0).astype(int)
     df_db['Msgs_sent'] = pd.to_numeric(df_db['Direct messages sent'], errors='coerce').fillna(0).astype(int)
-    df_db['GR_pct'] = df_db['Golden ratio'].apply(parse_pct)
-    df_db['UR_pct'] = df_db['Unlock rate'].apply(parse_pct)
+    df_db['GR_pct'] = parse_pct_series(df_db['Golden ratio'])
+    df_db['UR_pct'] = parse_pct_series(df_db['Unlock rate'])
     df_db['Fans_chatted'] = pd.to_numeric(df_db['Fans chatted'], errors='coerce').fillna(0).astype(int)
     df_db['Fans_spent'] = pd.to_numeric(df_db['Fans who spent money'], errors='coerce').fillna(0).astype(int)
-    df_db['Fan_CVR'] = df_db['Fan CVR'].apply(parse_pct)
+    df_db['Fan_CVR'] = parse_pct_series(df_db['Fan CVR'])
 
     # Handle column name variations for Response time
     resp_col = None
@@ -278,7 +959,7 @@ def main():
             resp_col = col_name
             break
     df_db['Resp_time_str'] = df_db[resp_col].fillna('') if resp_col else ''
-    df_db['Resp_seconds'] = df_db['Resp_time_str'].apply(parse_replay_seconds)
+    df_db['Resp_seconds'] = parse_replay_seconds_series(df_db['Resp_time_str'])
 
     # Handle Clocked hours column
     clocked_col = None
@@ -286,73 +967,608 @@ def main():
         if 'clocked' in col_name.lower() or 'scheduled' in col_name.lower():
             clocked_col = col_name
             break
-    df_db['Clocked_min'] = df_db[clocked_col].apply(parse_hours_minutes) if clocked_col else 0
+    df_db['Clocked_min'] = parse_hours_minutes_series(df_db[clocked_col]) if clocked_col else 0
 
-    df_db['Sales_per_hour'] = df_db['Sales per hour'].apply(parse_dollar)
+    df_db['Sales_per_hour'] = parse_dollar_series(df_db['Sales per hour'])
     df_db['Msgs_per_hour'] = pd.to_numeric(df_db['Messages sent per hour'], errors='coerce').fillna(0)
     df_db['Char_count'] = pd.to_numeric(df_db['Character count'], errors='coerce').fillna(0).astype(int)
-    df_db['Avg_earn_per_spender'] = df_db['Avg earnings per fan who spent money'].apply(parse_dollar)
+    df_db['Avg_earn_per_spender'] = parse_dollar_series(df_db['Avg earnings per fan who spent money'])
 
     # Parse date
     date_col_db = [c for c in df_db.columns if 'date' in c.lower() and 'time' in c.lower()]
     df_db['Date'] = pd.to_datetime(df_db[date_col_db[0]], errors='coerce') if date_col_db else pd.NaT
+    df_db['Day'] = df_db['Date'].dt.date
+
+    # Grouping keys for the per-model / per-chatter rollups
+    df_db['Group_str'] = df_db['Group'].astype(str).where(df_db['Group'].notna(), '')
+    df_db['Emp_key'] = df_db['Employees'].astype(str).str.strip()
+    return compact_frame(df_db, DB_COLUMNS, 'DetailBrkdn')
 
-    # ---- EXTRA DEDUP: Remove renamed/deleted model duplicates ----
-    # Some models get renamed (e.g. "Sara Blanc(delete)", "Sara(delete)", "sara(delete)")
-    # producing rows with identical metrics but different Creator names.
-    # ONLY apply metric-based dedup to rows with "(delete)" in Creator name, to avoid
-    # removing legitimate entries where different models have the same metrics.
-    dedup_metric_cols = [
-        'Employees', 'Sales_num', 'Msgs_sent', 'PPVs_sent', 'PPVs_unlocked',
-        'Fans_chatted', 'Fans_spent', 'Char_count'
-    ]
-    is_delete = df_db['Creators'].str.contains(r'\(delete\)', case=False, na=False)
+
+DELETE_DEDUP_COLS = [
+    'Employees', 'Sales_num', 'Msgs_sent', 'PPVs_sent', 'PPVs_unlocked',
+    'Fans_chatted', 'Fans_spent', 'Char_count'
+]
+
+
+def is_deleted_model(creators):
+    return creators.str.contains(r'\(delete\)', case=False, na=False).to_numpy()
+
+
+def drop_deleted_model_dupes(df_db, seen=None):
+    """Remove renamed/deleted model duplicates.
+    Some models get renamed (e.g. "Sara Blanc(delete)", "Sara(delete)", "sara(delete)")
+    producing rows with identical metrics but different Creator names.
+    ONLY apply metric-based dedup to rows with "(delete)" in Creator name, to avoid
+    removing legitimate entries where different models have the same metrics.
+    With `seen` (--incremental), "(delete)" rows of earlier runs count too.
+    """
+    is_delete = is_deleted_model(df_db['Creators'])
     df_delete = df_db[is_delete].copy()
     df_normal = df_db[~is_delete].copy()
     del_before = len(df_delete)
-    df_delete = df_delete.drop_duplicates(subset=dedup_metric_cols, keep='first')
+    df_delete = df_delete.drop_duplicates(subset=DELETE_DEDUP_COLS, keep='first')
+    if seen is not None:
+        df_delete = drop_ingested(df_delete, DELETE_DEDUP_COLS, seen, 'deleted')
     del_removed = del_before - len(df_delete)
-    df_db = pd.concat([df_normal, df_delete], ignore_index=True)
     if del_removed > 0:
         print("   -> Duplicados por renombre de modelo (delete) eliminados: %d" % del_removed)
+    return pd.concat([df_normal, df_delete], ignore_index=True)
 
-    # ================================================================
-    # 3. LOAD SALES RECORDS (Feb 1-10 + Feb 11-13)
-    # ================================================================
-    print("\n3/4 Leyendo Sales Records...")
-    df_sales = load_and_concat(
-        SALES_RECORDS, 'Sales record', 'SalesRec',
-        dedup_cols=None  # Each transaction is unique
-    )
 
+def prepare_sales(df_sales):
     # Rename columns
     date_col = [c for c in df_sales.columns if 'date' in c.lower() and 'time' in c.lower()]
     if date_col:
         df_sales.rename(columns={date_col[0]: 'DateTime'}, inplace=True)
 
-    df_sales['Earnings'] = df_sales['Earnings'].apply(parse_dollar) if 'Earnings' in df_sales.columns else 0
-    df_sales['Gross'] = df_sales['Gross revenue'].apply(parse_dollar) if 'Gross revenue' in df_sales.columns else 0
-    df_sales['Net'] = df_sales['Net revenue'].apply(parse_dollar) if 'Net revenue' in df_sales.columns else 0
+    df_sales['Earnings'] = parse_dollar_series(df_sales['Earnings']) if 'Earnings' in df_sales.columns else 0
+    df_sales['Gross'] = parse_dollar_series(df_sales['Gross revenue']) if 'Gross revenue' in df_sales.columns else 0
+    df_sales['Net'] = parse_dollar_series(df_sales['Net revenue']) if 'Net revenue' in df_sales.columns else 0
     df_sales['Hour'] = pd.to_datetime(df_sales['DateTime'], errors='coerce').dt.hour
-    df_sales['Shift'] = df_sales['Hour'].apply(lambda h: get_shift(h) if pd.notna(h) else None)
+    df_sales['Shift'] = shift_series(df_sales['Hour'])
     df_sales['Date'] = pd.to_datetime(df_sales['DateTime'], errors='coerce').dt.date
+    # Net split by sale type, so every slice sums all three in the same grouped pass
+    df_sales['Net_msg'] = df_sales['Net'].where(df_sales['Type'] == 'Messages', 0.0)
+    df_sales['Net_sub'] = df_sales['Net'].where(df_sales['Type'] == 'Subscription', 0.0)
+    df_sales['Net_tips'] = df_sales['Net'].where(df_sales['Type'].astype(str).str.startswith('Tips', na=False), 0.0)
+    return compact_frame(df_sales, SALES_COLUMNS, 'SalesRec')
+
 
-    # Deduplicate sales by all identifying columns
+def dedup_sales(df_sales):
+    """Deduplicate sales by all identifying columns."""
     sales_before = len(df_sales)
-    df_sales = df_sales.drop_duplicates(subset=['DateTime', 'Employee', 'Creator', 'Fan', 'Net revenue', 'Type'], keep='first')
+    df_sales = df_sales.drop_duplicates(subset=SALES_DEDUP_COLS, keep='first')
     sales_dupes = sales_before - len(df_sales)
     if sales_dupes > 0:
         print("   -> Sales duplicados eliminados: %d" % sales_dupes)
     print("   -> Total transacciones: %d" % len(df_sales))
+    return df_sales
 
-    # Filter out reverses for revenue calculations
-    df_sales_valid = df_sales[df_sales['Status'] != 'Reverse'].copy()
 
-    # ================================================================
-    # 4. LOAD CREATOR STATISTICS (Feb 1-10 + Feb 11-13, combined)
-    # ================================================================
+# ================================================================
+# STREAMING MESSAGE DASHBOARD READER (openpyxl read-only, chunked)
+# ================================================================
+MSG_CHUNK_ROWS = 50000
+
+
+def _excel_cell(v):
+    """Cell value as pd.read_excel sees it (empty -> '', whole floats -> int)."""
+    if v is None:
+        return ''
+    if type(v) is float and v.is_integer():
+        return int(v)
+    return v
+
+
+def iter_sheet_chunks(path, sheet_name, chunk_rows=MSG_CHUNK_ROWS):
+    """Yield a sheet as DataFrames of up to `chunk_rows` rows, parsed the way
+    pd.read_excel parses them, without ever holding the whole sheet.
+    """
+    from openpyxl import load_workbook
+    from pandas.io.parsers import TextParser
+
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb[sheet_name]
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        header = [_excel_cell(v) for v in next(rows, ())]
+        while header and header[-1] == '':
+            header.pop()
+        width = len(header)
+
+        def parse(chunk):
+            return TextParser([header] + chunk, header=0, skip_blank_lines=False).read()
+
+        chunk, blanks = [], []
+        for row in rows:
+            values = [_excel_cell(v) for v in row[:width]]
+            values += [''] * (width - len(values))
+            if all(v == '' for v in values):
+                # read_excel keeps blank rows between data rows but drops trailing ones
+                blanks.append(values)
+                continue
+            chunk.extend(blanks)
+            blanks = []
+            chunk.append(values)
+            if len(chunk) >= chunk_rows:
+                yield parse(chunk)
+                chunk = []
+        if chunk:
+            yield parse(chunk)
+    finally:
+        wb.close()
+
+
+def empty_seen():
+    """Keys of the rows kept so far, for drop_seen_rows(): sorted 64-bit digests
+    (store.row_keys) plus the position of each row in the kept frames.
+    """
+    return {'keys': np.empty(0, dtype=np.int64), 'rows': np.empty(0, dtype=np.int64), 'count': 0}
+
+
+def frame_key_tuples(frames, rows, cols):
+    """key_tuples() of the rows at positions `rows` of the concatenated `frames`."""
+    ends = np.cumsum([len(f) for f in frames])
+    which = np.searchsorted(ends, rows, side='right')
+    out = [None] * len(rows)
+    for f in np.unique(which):
+        idx = np.flatnonzero(which == f)
+        local = rows[idx] - (ends[f] - len(frames[f]))
+        for i, key in zip(idx, key_tuples(frames[f].iloc[local], cols)):
+            out[i] = key
+    return out
+
+
+def drop_seen_rows(df, cols, seen, frames):
+    """drop_duplicates(subset=cols, keep='first') across chunks. Repeats inside
+    the chunk are matched on the exact values; a digest already in `seen` (16
+    bytes per kept row) only drops the row if the values of the kept row it
+    points to in `frames` are equal too, so a digest collision keeps both rows.
+    Returns (kept rows, updated seen); the caller appends them to `frames`.
+    """
+    tuples = key_tuples(df, cols)
+    digests = digest_keys(tuples)
+    keep = ~pd.Series(tuples, dtype=object).duplicated().to_numpy()
+    keys = seen['keys']
+    if len(keys):
+        lo = np.searchsorted(keys, digests, side='left')
+        hi = np.searchsorted(keys, digests, side='right')
+        hits = np.flatnonzero(keep & (hi > lo))
+        if len(hits):
+            # Every kept row with the same digest (almost always exactly one)
+            cand = np.concatenate([np.arange(lo[i], hi[i]) for i in hits])
+            owner = np.repeat(hits, hi[hits] - lo[hits])
+            earlier = frame_key_tuples(frames, seen['rows'][cand], cols)
+            for i, key in zip(owner, earlier):
+                if key == tuples[i]:
+                    keep[i] = False
+
+    new_keys = digests[keep]
+    new_rows = seen['count'] + np.arange(len(new_keys), dtype=np.int64)
+    all_keys = np.concatenate([keys, new_keys])
+    order = np.argsort(all_keys, kind='stable')
+    seen = {'keys': all_keys[order], 'rows': np.concatenate([seen['rows'], new_rows])[order],
+            'count': seen['count'] + len(new_keys)}
+    return df[keep].copy(), seen
+
+
+def concat_compact(frames, columns):
+    """pd.concat of compacted frames, merging categories instead of falling back to object."""
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+    data = {}
+    for col in frames[0].columns:
+        if columns.get(col) == 'category':
+            data[col] = pd.Series(pd.api.types.union_categoricals(
+                [f[col] for f in frames], sort_categories=True, ignore_order=True))
+        else:
+            data[col] = pd.concat([f[col] for f in frames], ignore_index=True)
+    return pd.DataFrame(data)
+
+
+def stream_messages(file_list, chunk_rows=MSG_CHUNK_ROWS):
+    """Message Dashboards read chunk by chunk: each chunk is deduplicated on
+    MSG_DEDUP_COLS against the kept rows' keys and parsed right away, so only the compact
+    parsed rows are kept instead of the raw sheets.
+    """
+    seen = empty_seen()
+    frames = []
+    total_before = 0
+    for path in file_list:
+        rows = 0
+        for chunk in iter_sheet_chunks(path, 'Message Dashboard', chunk_rows):
+            rows += len(chunk)
+            chunk, seen = drop_seen_rows(chunk, MSG_DEDUP_COLS, seen, frames)
+            if len(chunk):
+                frames.append(prepare_messages(chunk, label=None))
+        print("   MsgDash: %d filas (%s)" % (rows, path.split('\\')[-1][:40]))
+        total_before += rows
+
+    df_msg = concat_compact(frames, MSG_COLUMNS)
+    dupes = total_before - len(df_msg)
+    if dupes > 0:
+        print("   -> Duplicados eliminados: %d (de %d a %d)" % (dupes, total_before, len(df_msg)))
+    else:
+        print("   -> Total combinado: %d filas (0 duplicados)" % len(df_msg))
+    print("   -> Memoria MsgDash: %.1f MB (lectura por bloques de %d filas)" % (frame_mb(df_msg), chunk_rows))
+    return df_msg
+
+
+def load_messages(file_list, use_cache=True, sheets=None, stream=False):
+    if stream:
+        return stream_messages(file_list)
+    return prepare_messages(load_and_concat(
+        file_list, 'Message Dashboard', 'MsgDash',
+        dedup_cols=MSG_DEDUP_COLS, use_cache=use_cache, sheets=sheets,
+    ))
+
+
+# ================================================================
+# SOURCE LOADING (full rebuild or incremental)
+# ================================================================
+def load_sources(use_cache=True, workers=None, stream=False):
+    """Load and parse every source file.
+    Returns (df_msg, df_db, df_sales, cs_summaries, cs_details); df_db still
+    contains the "(delete)" duplicates (see drop_deleted_model_dupes).
+    With `stream`, Message Dashboards are read chunk by chunk (stream_messages).
+    """
+    sheets = read_sheets_parallel(
+        sheet_jobs([] if stream else MSG_DASHBOARDS, DETAILED_BREAKDOWNS, SALES_RECORDS, CREATOR_STATS_FILES),
+        use_cache, workers,
+    )
+    stage_done('read excel')
+
+    print("\n1/4 Leyendo Message Dashboards...")
+    df_msg = load_messages(MSG_DASHBOARDS, use_cache=use_cache, sheets=sheets, stream=stream)
+    stage_done('MsgDash stream' if stream else 'MsgDash parse')
+
+    print("\n2/4 Leyendo Detailed Breakdowns...")
+    df_db = prepare_breakdown(load_and_concat(
+        DETAILED_BREAKDOWNS, 'Detailed breakdown', 'DetailBrkdn',
+        dedup_cols=DB_DEDUP_COLS, use_cache=use_cache, sheets=sheets,
+    ))
+    stage_done('DetailBrkdn parse')
+
+    print("\n3/4 Leyendo Sales Records...")
+    df_sales = dedup_sales(prepare_sales(load_and_concat(
+        SALES_RECORDS, 'Sales record', 'SalesRec',
+        dedup_cols=None,  # deduplicated after parsing (dedup_sales)
+        use_cache=use_cache, sheets=sheets,
+    )))
+    stage_done('SalesRec parse+dedup')
+
     print("\n4/4 Leyendo Creator Statistics...")
-    cs_data, cs_details = load_creator_stats(CREATOR_STATS_FILES)
+    cs_summaries, cs_details = read_creator_stats(CREATOR_STATS_FILES, use_cache=use_cache, sheets=sheets)
+    stage_done('CreatorStats')
+    return df_msg, df_db, df_sales, cs_summaries, cs_details
+
+
+STATE_VERSION = 5  # state.pkl layout; another version is rebuilt from scratch
+# Ingested keys are kept as 128-bit digests, not values: with n rows per family a
+# new row is wrongly taken for an ingested one with probability < n^2 / 2^129
+# (~1e-21 at a billion rows). 64-bit digests left ~3e-6 at ten million rows.
+STATE_DIGEST_BYTES = 16
+
+
+def drop_ingested(df, cols, seen, family, label=None):
+    """Rows of `df` whose `cols` key no earlier run ingested (keep='first' across runs).
+    seen[family] holds the sorted 128-bit digests of every ingested row's key
+    (16 bytes per row, no values; see STATE_DIGEST_BYTES); new keys are added.
+    Rows of `df` must already be unique on `cols`.
+    """
+    keys = digest_keys(key_tuples(df, cols), STATE_DIGEST_BYTES)
+    known = seen.get(family, np.empty(0, dtype='S%d' % STATE_DIGEST_BYTES))
+    new = np.ones(len(keys), dtype=bool)
+    if len(known):
+        pos = np.minimum(np.searchsorted(known, keys), len(known) - 1)
+        new = known[pos] != keys
+    seen[family] = np.union1d(known, keys[new])
+    if label:
+        print("   -> %s: %d filas nuevas (total %d)" % (label, new.sum(), len(seen[family])))
+    return df[new]
+
+
+def load_sources_incremental(use_cache=True, workers=None, stream=False):
+    """Like aggregate_sources(load_sources()), but only reads files not yet folded
+    into the saved aggregates.
+
+    The state (.pipeline_state/state.pkl) keeps the mergeable aggregates (see
+    MERGEABLE AGGREGATES), the dedup key digests of every ingested row and each
+    file's content hash, no parsed rows: a run costs what its new files cost.
+    Files must be appended to the lists in chronological order: when an ingested
+    file changed, disappeared or moved, the state no longer matches and everything
+    is rebuilt.
+    """
+    sources = {
+        'messages': MSG_DASHBOARDS,
+        'breakdown': DETAILED_BREAKDOWNS,
+        'sales': SALES_RECORDS,
+        'creator_stats': CREATOR_STATS_FILES,
+    }
+    index = load_cache_index() if use_cache else {}
+    hashes = {fam: [source_hash(p, index, use_cache) for p in files] for fam, files in sources.items()}
+
+    state_path = os.path.join(STATE_DIR, 'state.pkl')
+    state = pd.read_pickle(state_path) if os.path.exists(state_path) else None
+    if state is not None and state.get('version') != STATE_VERSION:
+        print("\nEstado incremental de otra version; reconstruyendo todo")
+        state = None
+    if state is not None:
+        for fam in sources:
+            done = state['files'][fam]
+            if hashes[fam][:len(done)] != done:
+                print("\nEstado incremental no coincide con %s; reconstruyendo todo" % fam)
+                state = None
+                break
+    if state is None:
+        state = {
+            'version': STATE_VERSION,
+            'files': {fam: [] for fam in sources},
+            'seen': {},
+            'agg': empty_aggregates(),
+        }
+    agg, seen = state['agg'], state['seen']
+
+    new_files = {fam: sources[fam][len(state['files'][fam]):] for fam in sources}
+    print("\nModo incremental: %d archivos nuevos" % sum(len(v) for v in new_files.values()))
+    sheets = read_sheets_parallel(
+        sheet_jobs([] if stream else new_files['messages'], new_files['breakdown'], new_files['sales'],
+                   new_files['creator_stats']),
+        use_cache, workers,
+    )
+    stage_done('read excel')
+
+    if new_files['messages']:
+        print("\n1/4 Leyendo Message Dashboards nuevos...")
+        df_new = load_messages(new_files['messages'], use_cache=use_cache, sheets=sheets, stream=stream)
+        fold_messages(agg, drop_ingested(df_new, MSG_DEDUP_COLS, seen, 'messages', 'MsgDash'))
+
+    if new_files['breakdown']:
+        print("\n2/4 Leyendo Detailed Breakdowns nuevos...")
+        df_new = prepare_breakdown(load_and_concat(
+            new_files['breakdown'], 'Detailed breakdown', 'DetailBrkdn',
+            dedup_cols=DB_DEDUP_COLS, use_cache=use_cache, sheets=sheets,
+        ))
+        df_new = drop_ingested(df_new, DB_DEDUP_COLS, seen, 'breakdown', 'DetailBrkdn')
+        fold_breakdown(agg, drop_deleted_model_dupes(df_new, seen))
+
+    if new_files['sales']:
+        print("\n3/4 Leyendo Sales Records nuevos...")
+        df_new = dedup_sales(prepare_sales(load_and_concat(
+            new_files['sales'], 'Sales record', 'SalesRec', dedup_cols=None, use_cache=use_cache, sheets=sheets,
+        )))
+        fold_sales(agg, drop_ingested(df_new, SALES_DEDUP_COLS, seen, 'sales', 'SalesRec'))
+
+    if new_files['creator_stats']:
+        print("\n4/4 Leyendo Creator Statistics nuevos...")
+        summaries, _ = read_creator_stats(new_files['creator_stats'], use_cache=use_cache, sheets=sheets)
+        for df in summaries:
+            fold_creator_stats(agg['cs'], df)
+
+    stage_done('incremental parse+fold')
+
+    state['files'] = hashes
+    os.makedirs(STATE_DIR, exist_ok=True)
+    pd.to_pickle(state, state_path)
+    stage_done('incremental save state')
+
+    return agg
+
+
+# ================================================================
+# SQLITE STORE (--store: every ingested export, any date range)
+# ================================================================
+# table -> (dedup key, date column for --desde/--hasta, indexed columns, compact dtypes)
+STORE_TABLES = {
+    'messages': (MSG_DEDUP_COLS, 'DateStr', ['DateStr', 'Creator', 'Sender', 'Fan_ID', MSG_CELL_KEYS], MSG_COLUMNS),
+    'breakdown': (DB_DEDUP_COLS, 'Day', ['Day', 'Creators', 'Employees'], DB_COLUMNS),
+    'sales': (SALES_DEDUP_COLS, 'Date', ['Date', 'Creator', 'Employee', 'Fan', SALES_CELL_KEYS], SALES_COLUMNS),
+}
+# The additive cells as SQL aggregates over the store (fold_messages / fold_sales in pandas)
+MSG_CELL_SQL = {
+    'messages': 'COUNT(*)', 'ppv_sent': 'TOTAL("is_ppv")', 'ppv_unlocked': 'TOTAL("is_ppv" AND "is_purchased")',
+    'replay_sum': 'TOTAL("Replay_seconds")', 'replay_count': 'COUNT("Replay_seconds")',
+}
+SALES_CELL_SQL = {
+    'sales_net': 'TOTAL("Net")', 'msg_sales': 'TOTAL("Net_msg")', 'sub_sales': 'TOTAL("Net_sub")',
+    'tips': 'TOTAL("Net_tips")', 'transactions': 'COUNT(*)',
+}
+SALES_VALID_SQL = '"Status" IS NOT \'Reverse\''
+COUNT_MEASURES = ['messages', 'ppv_sent', 'ppv_unlocked', 'replay_count', 'transactions']
+# Creator Statistics have no date column: raw rows as JSON, one per (file, sheet, row)
+CS_STORE_TABLE = 'creator_stats'
+CS_STORE_KEY = ['file', 'sheet', 'row']
+CS_SHEETS = ['Creator Statistics', 'Creator Statistics Detail']
+
+
+def parse_iso_day(text):
+    """argparse type for --desde/--hasta: validated 'YYYY-MM-DD'."""
+    try:
+        return date.fromisoformat(text).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError('fecha invalida (AAAA-MM-DD): %r' % text)
+
+
+def fmt_report_day(day):
+    """'Feb 1, 2026', the REPORT_START style (strftime has no portable unpadded day)."""
+    return '%s %d, %d' % (day.strftime('%b'), day.day, day.year)
+
+
+def store_creator_stats(conn, position, frames):
+    """Upsert the Creator Statistics sheets of one file ({sheet: DataFrame})."""
+    new = 0
+    for sheet, df in frames.items():
+        docs = pd.DataFrame({
+            'file': position,
+            'sheet': sheet,
+            'row': range(len(df)),
+            'creator': [sql_value(v) for v in df['Creator']] if 'Creator' in df.columns else None,
+            'data': [json.dumps({k: sql_value(v) for k, v in row.items()}, ensure_ascii=False)
+                     for row in df.to_dict('records')],
+        })
+        new += upsert_frame(conn, CS_STORE_TABLE, docs, CS_STORE_KEY, indexes=['creator'])
+    return new
+
+
+def read_creator_stats_store(conn):
+    """(summaries, details) per file in ingest order, as read_creator_stats() returns them."""
+    docs = read_frame(conn, CS_STORE_TABLE)
+    summaries, details = [], []
+    if docs is None:
+        return summaries, details
+    for (_, sheet), rows in docs.groupby(['file', 'sheet'], sort=True):
+        df = pd.DataFrame([json.loads(d) for d in rows.sort_values('row')['data']])
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+        (summaries if sheet == CS_SHEETS[0] else details).append(df)
+    return summaries, details
+
+
+def load_sources_store(use_cache=True, workers=None, stream=False, start=None, end=None):
+    """Like load_sources_incremental(), with the SQLite store as the state.
+
+    Files not yet in the store are parsed and upserted one by one (each file
+    commits with its rows). A family whose ingested files changed, disappeared
+    or moved is dropped and re-ingested. The aggregates are then computed for
+    start..end (ISO days, inclusive; None = open) by aggregate_store(), so the
+    store can hold several reports and each run picks its range.
+    """
+    sources = {
+        'messages': MSG_DASHBOARDS,
+        'breakdown': DETAILED_BREAKDOWNS,
+        'sales': SALES_RECORDS,
+        'creator_stats': CREATOR_STATS_FILES,
+    }
+    tables = {'messages': ['messages'], 'breakdown': ['breakdown'], 'sales': ['sales'],
+              'creator_stats': [CS_STORE_TABLE]}
+    index = load_cache_index() if use_cache else {}
+    conn = open_store(STORE_PATH)
+    new_files = {}
+    for fam, files in sources.items():
+        hashes = [source_hash(p, index, use_cache) for p in files]
+        done = ingested_hashes(conn, fam)
+        if hashes[:len(done)] != done:
+            print("\nAlmacen: los archivos de %s cambiaron; reingestando la familia" % fam)
+            with conn:
+                reset_family(conn, fam, tables[fam])
+            done = []
+        new_files[fam] = [(pos, files[pos], hashes[pos]) for pos in range(len(done), len(files))]
+    print("\nAlmacen SQLite: %s (%d archivos nuevos)" % (STORE_PATH, sum(len(v) for v in new_files.values())))
+
+    paths = {fam: [f[1] for f in v] for fam, v in new_files.items()}
+    sheets = read_sheets_parallel(
+        sheet_jobs([] if stream else paths['messages'], paths['breakdown'], paths['sales'], paths['creator_stats']),
+        use_cache, workers,
+    )
+    stage_done('read excel')
+
+    for fam, files in new_files.items():
+        for pos, path, sha in files:
+            if fam == 'messages':
+                df = load_messages([path], use_cache=use_cache, sheets=sheets, stream=stream)
+            elif fam == 'breakdown':
+                df = prepare_breakdown(load_and_concat(
+                    [path], 'Detailed breakdown', 'DetailBrkdn',
+                    dedup_cols=DB_DEDUP_COLS, use_cache=use_cache, sheets=sheets,
+                ))
+            elif fam == 'sales':
+                df = dedup_sales(prepare_sales(load_and_concat(
+                    [path], 'Sales record', 'SalesRec', dedup_cols=None, use_cache=use_cache, sheets=sheets,
+                )))
+            else:
+                summaries, details = read_creator_stats([path], use_cache=use_cache, sheets=sheets)
+                frames = dict(zip(CS_SHEETS, summaries + details))
+            with conn:
+                if fam == 'creator_stats':
+                    new = store_creator_stats(conn, pos, frames)
+                else:
+                    key_cols, _, indexes, _ = STORE_TABLES[fam]
+                    new = upsert_frame(conn, fam, df, key_cols, indexes)
+                record_source(conn, fam, pos, path, sha)
+            print("   -> Almacen %s: %d filas nuevas" % (fam, new))
+    stage_done('store upsert')
+
+    for table, (_, date_col, _, _) in STORE_TABLES.items():
+        rows, first, last = table_summary(conn, table, date_col)
+        print("   Almacen %-9s %9d filas (%s a %s)" % (table, rows, first or '-', last or '-'))
+    if start or end:
+        print("   Rango pedido: %s a %s" % (start or 'inicio', end or 'fin'))
+        print("   AVISO: Creator Statistics no tienen fecha; se usan todos los archivos ingestados")
+
+    with conn:
+        for table, (_, _, indexes, _) in STORE_TABLES.items():
+            create_indexes(conn, table, indexes)  # stores written before the cell indexes existed
+    agg = aggregate_store(conn, start, end)
+    conn.close()
+    stage_done('store aggregate')
+    return agg
+
+
+def cell_frame(df, keys, measures):
+    """A group_frame() cell table with the dtypes fold_messages() / fold_sales() give."""
+    df['Hour'] = df['Hour'].astype('Int8')
+    return df.astype({m: 'int64' if m in COUNT_MEASURES else 'float64' for m in measures})
+
+
+def aggregate_store(conn, start=None, end=None):
+    """Aggregates of the store rows in start..end, as aggregate_sources() computes
+    them from the frames: the additive message/sales cells, replay histograms and
+    fan pairs are SQL GROUP BY / DISTINCT over the cell indexes; only the breakdown
+    (deleted-model dedup, float row order) and the Creator Statistics are read
+    back into pandas.
+    """
+    agg = empty_aggregates()
+    cells = group_frame(conn, 'messages', MSG_CELL_KEYS, MSG_CELL_SQL, 'DateStr', start, end)
+    if cells is not None:
+        agg['msg_cells'] = cell_frame(cells, MSG_CELL_KEYS, MSG_CELL_SQL)
+        for key in REPLAY_KEYS:
+            cols = ['Replay_seconds'] if key == 'all' else [key, 'Replay_seconds']
+            where = ' AND '.join('"%s" IS NOT NULL' % c for c in cols)
+            hist = group_frame(conn, 'messages', cols, {'count': 'COUNT(*)'}, 'DateStr', start, end, where)
+            agg['replay'][key] = hist.sort_values(cols, ignore_index=True).astype({'count': 'int64'})
+        pairs = group_frame(conn, 'messages', ['DateStr', 'Hour', 'Creator', 'Shift', 'Fan_ID'], None,
+                            'DateStr', start, end, '"Fan_ID" IS NOT NULL', distinct=True)
+        fold_fan_sets(agg, pairs.astype({'Hour': 'Int8', 'Fan_ID': 'category'}))
+    cells = group_frame(conn, 'sales', SALES_CELL_KEYS, SALES_CELL_SQL, 'Date', start, end, SALES_VALID_SQL)
+    if cells is not None:
+        agg['sales_cells'] = cell_frame(cells, SALES_CELL_KEYS, SALES_CELL_SQL)
+    df_db = read_frame(conn, 'breakdown', 'Day', start, end)
+    if df_db is None:
+        df_db = pd.DataFrame(columns=list(DB_COLUMNS))
+    fold_breakdown(agg, drop_deleted_model_dupes(compact_frame(df_db, DB_COLUMNS)))
+    for df in read_creator_stats_store(conn)[0]:
+        fold_creator_stats(agg['cs'], df)
+    return agg
+
+
+# ================================================================
+# MAIN
+# ================================================================
+def main(use_cache=True, incremental=False, workers=None, stream=False, output_format='rows', publish=False,
+         store=False, start=None, end=None):
+    reset_stages()
+    # Load Airtable model types (free/paid/mixta classification)
+    with open(AIRTABLE_TYPES_PATH, 'r', encoding='utf-8') as f:
+        airtable_types = json.load(f)
+    print("Airtable types loaded: %d modelos" % len(airtable_types))
+    airtable_index = build_name_index(airtable_types, substrings=True)
+
+    if store:
+        agg = load_sources_store(use_cache, workers, stream, start, end)
+    elif incremental:
+        agg = load_sources_incremental(use_cache, workers, stream)
+    else:
+        df_msg, df_db, df_sales, cs_summaries, _ = load_sources(use_cache, workers, stream)
+        # Model dedup, reverses left out of revenue, Creator Statistics combined
+        agg = aggregate_sources(df_msg, df_db, df_sales, cs_summaries)
+        del df_msg, df_db, df_sales
+        stage_done('aggregate')
+    msg_cells, sales_cells, db_cells = agg['msg_cells'], agg['sales_cells'], agg['db_cells']
+
+    # Creator Statistics (Feb 1-10 + Feb 11-13, combined)
+    cs_data = round_creator_stats(agg['cs'])
     print("   -> %d modelos combinados" % len(cs_data))
 
     # ================================================================
@@ -360,25 +1576,26 @@ def main():
     # ================================================================
     print("\nCalculando metricas (Feb 1-13, 2026)...")
 
-    total_messages = len(df_msg)
-    total_ppv_sent_msg = int(df_msg['is_ppv'].sum())
-    total_ppv_purchased_msg = int((df_msg['is_ppv'] & df_msg['is_purchased']).sum())
+    total_messages = int(msg_cells['messages'].sum())
+    total_ppv_sent_msg = int(msg_cells['ppv_sent'].sum())
+    total_ppv_purchased_msg = int(msg_cells['ppv_unlocked'].sum())
 
     # Number of unique days in data
-    unique_dates = df_msg['Date'].dt.date.dropna().nunique()
+    all_dates_sorted = sorted(msg_cells['DateStr'].dropna().unique())
+    unique_dates = len(all_dates_sorted)
     print("   Dias en el rango: %d" % unique_dates)
 
     # REAL revenue from sales record
-    total_net_revenue = round(df_sales_valid['Net'].sum(), 2)
-    msg_revenue = round(df_sales_valid[df_sales_valid['Type'] == 'Messages']['Net'].sum(), 2)
-    sub_revenue = round(df_sales_valid[df_sales_valid['Type'] == 'Subscription']['Net'].sum(), 2)
-    tips_revenue = round(df_sales_valid[df_sales_valid['Type'].astype(str).str.startswith('Tips')]['Net'].sum(), 2)
+    total_net_revenue = round(sales_cells['sales_net'].sum(), 2)
+    msg_revenue = round(sales_cells['msg_sales'].sum(), 2)
+    sub_revenue = round(sales_cells['sub_sales'].sum(), 2)
+    tips_revenue = round(sales_cells['tips'].sum(), 2)
 
     # From detailed breakdown (chatter-attributed sales)
-    total_chatter_sales = round(df_db['Sales_num'].sum(), 2)
-    total_ppv_sent_db = int(df_db['PPVs_sent'].sum())
-    total_ppv_unlocked_db = int(df_db['PPVs_unlocked'].sum())
-    total_fans_chatted = int(df_db['Fans_chatted'].sum())
+    total_chatter_sales = round(db_cells['sales'].sum(), 2)
+    total_ppv_sent_db = int(db_cells['ppv_sent'].sum())
+    total_ppv_unlocked_db = int(db_cells['ppv_unlocked'].sum())
+    total_fans_chatted = int(db_cells['fans_chatted'].sum())
 
     # From creator stats
     total_new_fans = sum(cs['new_fans'] for cs in cs_data.values() if cs['new_fans'] > 0)
@@ -387,9 +1604,9 @@ def main():
     total_active_fans = sum(cs['active_fans'] for cs in cs_data.values())
 
     # Response time from message dashboard
-    rt_vals = df_msg['Replay_seconds'].dropna()
-    avg_rt = round(float(rt_vals.mean()), 1) if len(rt_vals) > 0 else 0
-    median_rt = round(float(rt_vals.median()), 1) if len(rt_vals) > 0 else 0
+    rt = replay_stats(agg['replay']['all']) if agg['replay']['all'] is not None and len(agg['replay']['all']) else None
+    avg_rt = round(rt['mean'], 1) if rt else 0
+    median_rt = round(rt['median'], 1) if rt else 0
 
     # Golden/Unlock from detailed breakdown
     overall_gr = round(total_ppv_sent_db / total_messages * 100, 2) if total_messages > 0 else 0
@@ -415,170 +1632,210 @@ def main():
         'avg_replay_formatted': fmt_time(avg_rt),
         'median_replay_seconds': median_rt,
         'median_replay_formatted': fmt_time(median_rt),
-        'total_chatters': df_db['Employees'].nunique(),
-        'total_models': df_db['Creators'].nunique(),
+        'total_chatters': db_cells['Employees'].nunique(),
+        'total_models': db_cells['Creators'].nunique(),
         'days_in_range': unique_dates,
     }
 
+    stage_done('compute general')
+
     # ================================================================
     # COMPUTE: Hourly data (from message dashboard + sales record)
     # ================================================================
+    hourly_slices = build_slices(agg, ['Hour'])
     hourly_data = []
     for hour in range(24):
-        msg_h = df_msg[df_msg['Hour'] == hour]
-        sales_h = df_sales_valid[df_sales_valid['Hour'] == hour]
-
+        s = hourly_slices.get(hour, EMPTY_SLICE)
         hourly_data.append({
             'hour': hour,
             'hour_label': '%02d:00' % hour,
             'shift': get_shift(hour),
-            'messages': len(msg_h),
-            'fans_chatted': int(msg_h['Fan_ID'].nunique()),
-            'ppv_sent': int(msg_h['is_ppv'].sum()),
-            'sales_net': round(float(sales_h['Net'].sum()), 2),
-            'msg_sales_net': round(float(sales_h[sales_h['Type'] == 'Messages']['Net'].sum()), 2),
-            'sub_sales_net': round(float(sales_h[sales_h['Type'] == 'Subscription']['Net'].sum()), 2),
-            'tips_net': round(float(sales_h[sales_h['Type'].astype(str).str.startswith('Tips')]['Net'].sum()), 2),
-            'transactions': len(sales_h),
+            'messages': int(s['messages']),
+            'fans_chatted': int(s['fans_chatted']),
+            'ppv_sent': int(s['ppv_sent']),
+            'sales_net': round(float(s['sales_net']), 2),
+            'msg_sales_net': round(float(s['msg_sales']), 2),
+            'sub_sales_net': round(float(s['sub_sales']), 2),
+            'tips_net': round(float(s['tips']), 2),
+            'transactions': int(s['transactions']),
         })
 
     peak_traffic = max(hourly_data, key=lambda x: x['fans_chatted'])
     peak_sales = max(hourly_data, key=lambda x: x['sales_net'])
 
+    stage_done('compute hourly')
+
     # ================================================================
     # COMPUTE: Daily data
     # ================================================================
     daily_data = []
-    all_dates_sorted = sorted(df_msg['Date'].dt.date.dropna().unique())
-    for date in all_dates_sorted:
-        msg_d = df_msg[df_msg['DateStr'] == date]
-        sales_d = df_sales_valid[df_sales_valid['Date'] == date]
-        rt_d = msg_d['Replay_seconds'].dropna()
-
+    all_dates_set = set(all_dates_sorted)
+    codes = fan_codes(agg['fans'])
+    daily_slices = build_slices(agg, ['DateStr'], ['Date'])
+    daily_fans = fan_sets(agg, ['DateStr'], codes)
+    for day in all_dates_sorted:
+        s = daily_slices.get(day, EMPTY_SLICE)
         daily_data.append({
-            'date': date.isoformat(),
-            'date_label': date.strftime('%b %d'),
-            'messages': len(msg_d),
-            'fans_chatted': int(msg_d['Fan_ID'].nunique()),
-            'sales_net': round(float(sales_d['Net'].sum()), 2),
-            'msg_sales': round(float(sales_d[sales_d['Type'] == 'Messages']['Net'].sum()), 2),
-            'sub_sales': round(float(sales_d[sales_d['Type'] == 'Subscription']['Net'].sum()), 2),
-            'tips': round(float(sales_d[sales_d['Type'].astype(str).str.startswith('Tips')]['Net'].sum()), 2),
-            'transactions': len(sales_d),
-            'ppv_sent': int(msg_d['is_ppv'].sum()),
-            'avg_replay_seconds': round(float(rt_d.mean()), 1) if len(rt_d) > 0 else 0,
+            'date': day.isoformat(),
+            'date_label': day.strftime('%b %d'),
+            'messages': int(s['messages']),
+            'fans_chatted': int(s['fans_chatted']),
+            'sales_net': round(float(s['sales_net']), 2),
+            'msg_sales': round(float(s['msg_sales']), 2),
+            'sub_sales': round(float(s['sub_sales']), 2),
+            'tips': round(float(s['tips']), 2),
+            'transactions': int(s['transactions']),
+            'ppv_sent': int(s['ppv_sent']),
+            'avg_replay_seconds': avg_replay(s),
+            'fan_set': daily_fans.get(day, 'e:'),
         })
 
+    stage_done('compute daily')
+
     # ================================================================
     # COMPUTE: Daily Hourly data (for date filter recalculation)
     # ================================================================
     print("   Generando daily_hourly...")
     daily_hourly = []
-    for date in all_dates_sorted:
-        msg_d = df_msg[df_msg['DateStr'] == date]
-        sales_d = df_sales_valid[df_sales_valid['Date'] == date]
-        for hour in range(24):
-            msg_dh = msg_d[msg_d['Hour'] == hour]
-            sales_dh = sales_d[sales_d['Hour'] == hour]
-            if len(msg_dh) == 0 and len(sales_dh) == 0:
-                continue
-            daily_hourly.append({
-                'date': date.isoformat(),
-                'hour': hour,
-                'messages': len(msg_dh),
-                'fans_chatted': int(msg_dh['Fan_ID'].nunique()),
-                'ppv_sent': int(msg_dh['is_ppv'].sum()),
-                'sales_net': round(float(sales_dh['Net'].sum()), 2),
-                'msg_sales_net': round(float(sales_dh[sales_dh['Type'] == 'Messages']['Net'].sum()), 2),
-                'sub_sales_net': round(float(sales_dh[sales_dh['Type'] == 'Subscription']['Net'].sum()), 2),
-                'tips_net': round(float(sales_dh[sales_dh['Type'].astype(str).str.startswith('Tips')]['Net'].sum()), 2),
-                'transactions': len(sales_dh),
-            })
+    daily_hourly_slices = build_slices(agg, ['DateStr', 'Hour'], ['Date', 'Hour'])
+    daily_hourly_fans = fan_sets(agg, ['DateStr', 'Hour'], codes)
+    for (day, hour), s in sorted(daily_hourly_slices.items()):
+        if day not in all_dates_set or hour not in range(24):
+            continue
+        daily_hourly.append({
+            'date': day.isoformat(),
+            'hour': int(hour),
+            'messages': int(s['messages']),
+            'fans_chatted': int(s['fans_chatted']),
+            'ppv_sent': int(s['ppv_sent']),
+            'sales_net': round(float(s['sales_net']), 2),
+            'msg_sales_net': round(float(s['msg_sales']), 2),
+            'sub_sales_net': round(float(s['sub_sales']), 2),
+            'tips_net': round(float(s['tips']), 2),
+            'transactions': int(s['transactions']),
+            'fan_set': daily_hourly_fans.get((day, hour), 'e:'),
+        })
     print("   daily_hourly: %d entradas" % len(daily_hourly))
+    stage_done('compute daily_hourly')
 
     # ================================================================
     # COMPUTE: Daily Model data (for date + model filter combination)
     # ================================================================
     print("   Generando daily_model...")
     daily_model = []
-    all_creators_list = sorted(set(df_msg['Creator'].dropna().unique()) | set(df_sales_valid['Creator'].dropna().unique()))
-    for date in all_dates_sorted:
-        msg_d = df_msg[df_msg['DateStr'] == date]
-        sales_d = df_sales_valid[df_sales_valid['Date'] == date]
-        for creator in all_creators_list:
-            msg_dc = msg_d[msg_d['Creator'] == creator]
-            sales_dc = sales_d[sales_d['Creator'] == creator]
-            if len(msg_dc) == 0 and len(sales_dc) == 0:
-                continue
-            daily_model.append({
-                'date': date.isoformat(),
-                'model': creator,
-                'messages': len(msg_dc),
-                'fans_chatted': int(msg_dc['Fan_ID'].nunique()),
-                'ppv_sent': int(msg_dc['is_ppv'].sum()),
-                'sales_net': round(float(sales_dc['Net'].sum()), 2),
-                'msg_sales': round(float(sales_dc[sales_dc['Type'] == 'Messages']['Net'].sum()), 2),
-                'sub_sales': round(float(sales_dc[sales_dc['Type'] == 'Subscription']['Net'].sum()), 2),
-                'tips': round(float(sales_dc[sales_dc['Type'].astype(str).str.startswith('Tips')]['Net'].sum()), 2),
-                'transactions': len(sales_dc),
-            })
+    daily_model_slices = build_slices(agg, ['DateStr', 'Creator'], ['Date', 'Creator'])
+    daily_model_fans = fan_sets(agg, ['DateStr', 'Creator'], codes)
+    for (day, creator), s in sorted(daily_model_slices.items()):
+        if day not in all_dates_set:
+            continue
+        daily_model.append({
+            'date': day.isoformat(),
+            'model': creator,
+            'messages': int(s['messages']),
+            'fans_chatted': int(s['fans_chatted']),
+            'ppv_sent': int(s['ppv_sent']),
+            'sales_net': round(float(s['sales_net']), 2),
+            'msg_sales': round(float(s['msg_sales']), 2),
+            'sub_sales': round(float(s['sub_sales']), 2),
+            'tips': round(float(s['tips']), 2),
+            'transactions': int(s['transactions']),
+            'fan_set': daily_model_fans.get((day, creator), 'e:'),
+        })
     print("   daily_model: %d entradas" % len(daily_model))
 
+    # Fans only: the cube has the additive measures per model and hour, but unique
+    # fans of a model filter and a date range must be unioned from these sets
+    daily_model_hourly = []
+    for (day, creator, hour), fan_set in sorted(fan_sets(agg, ['DateStr', 'Creator', 'Hour'], codes).items()):
+        if day not in all_dates_set or hour not in range(24):
+            continue
+        daily_model_hourly.append({
+            'date': day.isoformat(),
+            'model': creator,
+            'hour': int(hour),
+            'fans_chatted': len(agg['fan_sets'][('DateStr', 'Creator', 'Hour')][(day, creator, hour)]),
+            'fan_set': fan_set,
+        })
+    print("   daily_model_hourly: %d entradas" % len(daily_model_hourly))
+    stage_done('compute daily_model')
+
+    # ================================================================
+    # COMPUTE: Rollup cube (any date x model x chatter x hour filter)
+    # ================================================================
+    cube = build_cube(agg, all_dates_set)
+    print("   cube: %d celdas (%d modelos x %d chatters)"
+          % (len(cube['cells']['hour']), len(cube['dims']['model']), len(cube['dims']['chatter'])))
+    stage_done('compute cube')
+
     # ================================================================
     # COMPUTE: Shift data
     # ================================================================
+    shift_slices = build_slices(agg, ['Shift'])
+    # Top models / chatters per shift by sales, grouped once for all shifts
+    shift_sales = with_shift(sales_cells, ['Shift'])
+    shift_model_sales = shift_sales.groupby(['Shift', 'Creator'])['sales_net'].sum()
+    employee = shift_sales['Employee']
+    has_employee = employee.notna() & (employee.astype(str).str.strip() != '')
+    shift_chatter_sales = shift_sales[has_employee].groupby(['Shift', 'Employee'])['sales_net'].sum()
+
     shifts_data = {}
     for shift_key, shift_label in SHIFT_LABELS.items():
-        msg_s = df_msg[df_msg['Shift'] == shift_key]
-        sales_s = df_sales_valid[df_sales_valid['Shift'] == shift_key]
-        rt_s = msg_s['Replay_seconds'].dropna()
-
+        s = shift_slices.get(shift_key, EMPTY_SLICE)
         shift_hours = [h for h in hourly_data if h['shift'] == shift_key]
 
-        # Top models in this shift by sales
-        shift_model_sales = sales_s.groupby('Creator')['Net'].sum().sort_values(ascending=False).head(10)
-        top_models_shift = [{'name': n, 'revenue': round(v, 2)} for n, v in shift_model_sales.items()]
+        top_models_shift = []
+        if shift_key in shift_model_sales.index.get_level_values(0):
+            top = shift_model_sales.loc[shift_key].sort_values(ascending=False).head(10)
+            top_models_shift = [{'name': n, 'revenue': round(v, 2)} for n, v in top.items()]
 
-        # Top chatters in this shift by sales
-        shift_chatter_sales = sales_s[sales_s['Employee'].fillna('').astype(str).str.strip() != ''].groupby('Employee')['Net'].sum().sort_values(ascending=False).head(10)
-        top_chatters_shift = [{'name': n, 'revenue': round(v, 2)} for n, v in shift_chatter_sales.items()]
+        top_chatters_shift = []
+        if shift_key in shift_chatter_sales.index.get_level_values(0):
+            top = shift_chatter_sales.loc[shift_key].sort_values(ascending=False).head(10)
+            top_chatters_shift = [{'name': n, 'revenue': round(v, 2)} for n, v in top.items()]
 
         shifts_data[shift_key] = {
             'label': shift_label,
-            'messages': len(msg_s),
-            'fans_chatted': int(msg_s['Fan_ID'].nunique()),
-            'sales_net': round(float(sales_s['Net'].sum()), 2),
-            'msg_sales': round(float(sales_s[sales_s['Type'] == 'Messages']['Net'].sum()), 2),
-            'sub_sales': round(float(sales_s[sales_s['Type'] == 'Subscription']['Net'].sum()), 2),
-            'tips_sales': round(float(sales_s[sales_s['Type'].astype(str).str.startswith('Tips')]['Net'].sum()), 2),
-            'transactions': len(sales_s),
-            'ppv_sent': int(msg_s['is_ppv'].sum()),
-            'avg_replay_seconds': round(float(rt_s.mean()), 1) if len(rt_s) > 0 else 0,
-            'avg_replay_formatted': fmt_time(rt_s.mean() if len(rt_s) > 0 else None),
+            'messages': int(s['messages']),
+            'fans_chatted': int(s['fans_chatted']),
+            'sales_net': round(float(s['sales_net']), 2),
+            'msg_sales': round(float(s['msg_sales']), 2),
+            'sub_sales': round(float(s['sub_sales']), 2),
+            'tips_sales': round(float(s['tips']), 2),
+            'transactions': int(s['transactions']),
+            'ppv_sent': int(s['ppv_sent']),
+            'avg_replay_seconds': avg_replay(s),
+            'avg_replay_formatted': fmt_time(s['replay_sum'] / s['replay_count'] if s['replay_count'] > 0 else None),
             'hourly': shift_hours,
             'top_models': top_models_shift,
             'top_chatters': top_chatters_shift,
         }
 
+    stage_done('compute shifts')
+
     # ================================================================
     # COMPUTE: Per Model (combining all sources)
     # ================================================================
     models_data = []
-    all_creators = set(df_db['Creators'].unique()) | set(cs_data.keys())
+    all_creators = set(db_cells['Creators'].unique()) | set(cs_data.keys())
+
+    # All per-model rollups, grouped once
+    model_db = rollup_breakdown(db_cells, 'Creators').to_dict('index')
+    model_replay = rollup_replay(agg, 'Creator')
+    model_hourly_slices = split_by_entity(sorted(build_slices(agg, ['Creator', 'Hour']).items()))
+    has_emp = ~db_cells['Emp_key'].isin(['', 'nan']) & db_cells['Emp_key'].notna()
+    model_chatter_db = split_by_entity(rollup_breakdown(db_cells[has_emp], ['Creators', 'Emp_key']).to_dict('index').items())
 
     for creator in sorted(all_creators):
-        db_rows = df_db[df_db['Creators'] == creator]
+        db = model_db.get(creator, EMPTY_ROLLUP)
         cs = cs_data.get(creator, {})
-        msg_rows = df_msg[df_msg['Creator'] == creator]
-        sales_rows = df_sales_valid[df_sales_valid['Creator'] == creator]
 
         # From detailed breakdown (chatter-level) - aggregate across all days
-        db_sales = round(float(db_rows['Sales_num'].sum()), 2)
-        db_ppv_sent = int(db_rows['PPVs_sent'].sum())
-        db_ppv_unlocked = int(db_rows['PPVs_unlocked'].sum())
-        db_msgs_sent = int(db_rows['Msgs_sent'].sum())
-        db_fans_chatted = int(db_rows['Fans_chatted'].sum())
-        db_fans_spent = int(db_rows['Fans_spent'].sum())
+        db_sales = round(float(db['sales']), 2)
+        db_ppv_sent = int(db['ppv_sent'])
+        db_ppv_unlocked = int(db['ppv_unlocked'])
+        db_msgs_sent = int(db['messages_sent'])
+        db_fans_chatted = int(db['fans_chatted'])
+        db_fans_spent = int(db['fans_spent'])
 
         # From creator stats (already summed across periods)
         total_earnings = cs.get('total_earnings_net', db_sales)
@@ -611,18 +1868,12 @@ def main():
                 avg_sub_days = int(days_match.group(1))
 
         # Free vs Paid vs Mixta classification from Airtable
-        account_type = airtable_types.get(creator, 'unknown')
-        if account_type == 'unknown':
-            creator_clean = creator.strip().lower()
-            for at_name, at_type in airtable_types.items():
-                if at_name.strip().lower() == creator_clean:
-                    account_type = at_type
-                    break
-            if account_type == 'unknown':
-                for at_name, at_type in airtable_types.items():
-                    if creator_clean in at_name.strip().lower() or at_name.strip().lower() in creator_clean:
-                        account_type = at_type
-                        break
+        # (exact, then normalized name, then substring either way)
+        at_name, at_candidates = resolve_name(airtable_index, creator, substring=True)
+        account_type = airtable_types[at_name] if at_name is not None else 'unknown'
+        if at_name is None and at_candidates:
+            print("  AVISO: modelo '%s' ambiguo en Airtable: %s"
+                  % (creator, ', '.join('%s (%s)' % (k.strip(), airtable_types[k]) for k in at_candidates)))
 
         # Golden/Unlock from DB
         gr = round(db_ppv_sent / db_msgs_sent * 100, 2) if db_msgs_sent > 0 else 0
@@ -630,83 +1881,56 @@ def main():
         fan_cvr = round(db_fans_spent / db_fans_chatted * 100, 2) if db_fans_chatted > 0 else 0
 
         # Response time from message dashboard
-        rt = msg_rows['Replay_seconds'].dropna()
-        avg_resp = round(float(rt.mean()), 1) if len(rt) > 0 else 0
-        median_resp = round(float(rt.median()), 1) if len(rt) > 0 else 0
+        rt = model_replay.get(creator)
+        avg_resp = round(float(rt['mean']), 1) if rt else 0
+        median_resp = round(float(rt['median']), 1) if rt else 0
 
         # Hourly for this model
         model_hourly = []
-        for hour in range(24):
-            mh = msg_rows[msg_rows['Hour'] == hour]
-            sh = sales_rows[sales_rows['Hour'] == hour]
-            if len(mh) > 0 or len(sh) > 0:
-                model_hourly.append({
-                    'hour': hour,
-                    'hour_label': '%02d:00' % hour,
-                    'messages': len(mh),
-                    'fans_chatted': int(mh['Fan_ID'].nunique()),
-                    'ppv_sent': int(mh['is_ppv'].sum()),
-                    'sales_net': round(float(sh['Net'].sum()), 2),
-                })
+        for hour, s in model_hourly_slices.get(creator, []):
+            if hour not in range(24):
+                continue
+            model_hourly.append({
+                'hour': int(hour),
+                'hour_label': '%02d:00' % hour,
+                'messages': int(s['messages']),
+                'fans_chatted': int(s['fans_chatted']),
+                'ppv_sent': int(s['ppv_sent']),
+                'sales_net': round(float(s['sales_net']), 2),
+            })
 
         # Peak hours for this model (traffic = fans chatted, not messages)
         peak_traffic_h = max(model_hourly, key=lambda x: x['fans_chatted'])['hour_label'] if model_hourly else 'N/A'
         peak_sales_h = max(model_hourly, key=lambda x: x['sales_net'])['hour_label'] if model_hourly and total_earnings > 0 else 'N/A'
 
-        # Chatters working this model - aggregate per chatter across all days
-        chatter_agg = {}
-        for _, r in db_rows.iterrows():
-            emp = str(r['Employees']).strip()
-            if not emp or emp == '' or emp == 'nan':
-                continue
-            if emp not in chatter_agg:
-                chatter_agg[emp] = {
-                    'name': emp,
-                    'group': str(r['Group']) if pd.notna(r['Group']) else '',
-                    'sales': 0, 'messages_sent': 0, 'ppv_sent': 0, 'ppv_unlocked': 0,
-                    'fans_chatted': 0, 'fans_spent': 0, 'char_count': 0, 'clocked_min': 0,
-                    'resp_seconds_list': [], 'days_worked': 0,
-                }
-            ca = chatter_agg[emp]
-            ca['sales'] += float(r['Sales_num'])
-            ca['messages_sent'] += int(r['Msgs_sent'])
-            ca['ppv_sent'] += int(r['PPVs_sent'])
-            ca['ppv_unlocked'] += int(r['PPVs_unlocked'])
-            ca['fans_chatted'] += int(r['Fans_chatted'])
-            ca['fans_spent'] += int(r['Fans_spent'])
-            ca['char_count'] += int(r['Char_count'])
-            ca['clocked_min'] += int(r.get('Clocked_min', 0)) if pd.notna(r.get('Clocked_min', 0)) else 0
-            if pd.notna(r['Resp_seconds']):
-                ca['resp_seconds_list'].append(float(r['Resp_seconds']))
-            ca['days_worked'] += 1
-
+        # Chatters working this model - aggregated per chatter across all days
         model_chatters = []
-        for emp, ca in chatter_agg.items():
-            ms = ca['messages_sent']
-            ps = ca['ppv_sent']
-            fc = ca['fans_chatted']
-            fs = ca['fans_spent']
-            rl = ca['resp_seconds_list']
-            cm = ca['clocked_min']
+        for emp, ca in model_chatter_db.get(creator, []):
+            ms = int(ca['messages_sent'])
+            ps = int(ca['ppv_sent'])
+            fc = int(ca['fans_chatted'])
+            fs = int(ca['fans_spent'])
+            cm = int(ca['clocked_min'])
+            avg_rl = ca['resp_sum'] / ca['resp_count'] if ca['resp_count'] > 0 else None
             model_chatters.append({
-                'name': ca['name'],
-                'group': ca['group'],
+                'name': emp,
+                'group': ca['first_group'],
                 'sales': round(ca['sales'], 2),
                 'messages_sent': ms,
                 'ppv_sent': ps,
-                'ppv_unlocked': ca['ppv_unlocked'],
+                'ppv_unlocked': int(ca['ppv_unlocked']),
                 'golden_ratio': round(ps / ms * 100, 2) if ms > 0 else 0,
                 'unlock_ratio': round(ca['ppv_unlocked'] / ps * 100, 2) if ps > 0 else 0,
                 'fans_chatted': fc,
                 'fans_spent': fs,
                 'fan_cvr': round(fs / fc * 100, 2) if fc > 0 else 0,
-                'response_time': fmt_time(sum(rl) / len(rl)) if rl else 'N/A',
-                'response_seconds': round(sum(rl) / len(rl), 1) if rl else 0,
+                'response_time': fmt_time(avg_rl) if avg_rl is not None else 'N/A',
+                'response_seconds': round(avg_rl, 1) if avg_rl is not None else 0,
                 'clocked_minutes': cm,
                 'sales_per_hour': round(ca['sales'] / (cm / 60), 2) if cm > 0 else 0,
                 'msgs_per_hour': round(ms / (cm / 60), 2) if cm > 0 else 0,
-                'char_count': ca['char_count'],
-                'days_worked': ca['days_worked'],
+                'char_count': int(ca['char_count']),
+                'days_worked': int(ca['rows']),
             })
         model_chatters.sort(key=lambda x: x['sales'], reverse=True)
 
@@ -761,6 +1985,7 @@ def main():
         })
 
     models_data.sort(key=lambda x: x['total_earnings'], reverse=True)
+    stage_done('compute models')
 
     # ================================================================
     # LOAD HUBSTAFF HOURS (replaces unreliable Inflow clocked hours)
@@ -780,24 +2005,27 @@ def main():
     # COMPUTE: Per Chatter (combining all sources, aggregated across days)
     # ================================================================
     chatters_data = []
-    chatter_names = df_db['Employees'].dropna().unique()
+    chatter_names = db_cells['Employees'].dropna().unique()
+
+    # All per-chatter rollups, grouped once
+    chatter_db = rollup_breakdown(db_cells, 'Employees').to_dict('index')
+    chatter_replay = rollup_replay(agg, 'Sender')
+    chatter_model_db = split_by_entity(rollup_breakdown(db_cells, ['Employees', 'Creators']).to_dict('index').items())
+    chatter_hourly_slices = split_by_entity(sorted(build_slices(agg, ['Sender', 'Hour'], ['Employee', 'Hour']).items()))
 
     for emp in sorted(chatter_names, key=str):
         if not emp or str(emp).strip() == '' or str(emp) == 'nan':
             continue
 
-        db_rows = df_db[df_db['Employees'] == emp]
-        msg_rows = df_msg[df_msg['Sender'] == emp]
-        sales_rows = df_sales_valid[df_sales_valid['Employee'] == emp]
-
-        total_sales = round(float(db_rows['Sales_num'].sum()), 2)
-        total_msgs = int(db_rows['Msgs_sent'].sum())
-        ppv_sent = int(db_rows['PPVs_sent'].sum())
-        ppv_unlocked = int(db_rows['PPVs_unlocked'].sum())
-        fans_chatted = int(db_rows['Fans_chatted'].sum())
-        fans_spent = int(db_rows['Fans_spent'].sum())
-        char_count = int(db_rows['Char_count'].sum())
-        days_worked = db_rows['Date'].dt.date.nunique()
+        db = chatter_db[emp]
+        total_sales = round(float(db['sales']), 2)
+        total_msgs = int(db['messages_sent'])
+        ppv_sent = int(db['ppv_sent'])
+        ppv_unlocked = int(db['ppv_unlocked'])
+        fans_chatted = int(db['fans_chatted'])
+        fans_spent = int(db['fans_spent'])
+        char_count = int(db['char_count'])
+        days_worked = int(db['days_worked'])
 
         # Use Hubstaff hours if available, otherwise fall back to Inflow
         emp_str = str(emp)
@@ -805,7 +2033,7 @@ def main():
             clocked_min = round(hubstaff_hours[emp_str])
             hours_source = 'hubstaff'
         else:
-            clocked_min = int(db_rows['Clocked_min'].sum())
+            clocked_min = int(db['clocked_min'])
             hours_source = 'inflow'
 
         gr = round(ppv_sent / total_msgs * 100, 2) if total_msgs > 0 else 0
@@ -815,79 +2043,54 @@ def main():
         msgs_per_hour = round(total_msgs / (clocked_min / 60), 2) if clocked_min > 0 else 0
         avg_earn_per_spender = round(total_sales / fans_spent, 2) if fans_spent > 0 else 0
 
-        # Response time from message dashboard
-        rt = msg_rows['Replay_seconds'].dropna()
-        avg_resp = round(float(rt.mean()), 1) if len(rt) > 0 else 0
-        median_resp = round(float(rt.median()), 1) if len(rt) > 0 else 0
-
-        # Response time buckets
-        under_2m = int((rt <= 120).sum())
-        btwn_2_5 = int(((rt > 120) & (rt <= 300)).sum())
-        btwn_5_10 = int(((rt > 300) & (rt <= 600)).sum())
-        over_10m = int((rt > 600).sum())
-
-        # Group from DB
-        groups_list = db_rows['Group'].dropna().unique()
-        group = str(groups_list[0]) if len(groups_list) > 0 else ''
-
-        # Models this chatter works - aggregate per model across all days
-        model_agg = {}
-        for _, r in db_rows.iterrows():
-            model_name = str(r['Creators'])
-            if model_name not in model_agg:
-                model_agg[model_name] = {
-                    'name': model_name, 'sales': 0, 'messages_sent': 0,
-                    'ppv_sent': 0, 'ppv_unlocked': 0, 'fans_chatted': 0,
-                    'fans_spent': 0, 'resp_list': [], 'sph': 0, 'days': 0,
-                }
-            ma = model_agg[model_name]
-            ma['sales'] += float(r['Sales_num'])
-            ma['messages_sent'] += int(r['Msgs_sent'])
-            ma['ppv_sent'] += int(r['PPVs_sent'])
-            ma['ppv_unlocked'] += int(r['PPVs_unlocked'])
-            ma['fans_chatted'] += int(r['Fans_chatted'])
-            ma['fans_spent'] += int(r['Fans_spent'])
-            if pd.notna(r['Resp_seconds']):
-                ma['resp_list'].append(float(r['Resp_seconds']))
-            ma['sph'] += float(r['Sales_per_hour'])
-            ma['days'] += 1
+        # Response time from message dashboard (with buckets)
+        rt = chatter_replay.get(emp)
+        avg_resp = round(float(rt['mean']), 1) if rt else 0
+        median_resp = round(float(rt['median']), 1) if rt else 0
+        under_2m = int(rt['under_2m']) if rt else 0
+        btwn_2_5 = int(rt['btwn_2_5m']) if rt else 0
+        btwn_5_10 = int(rt['btwn_5_10m']) if rt else 0
+        over_10m = int(rt['over_10m']) if rt else 0
+
+        # Group from DB (first non-empty)
+        group = str(db['group']) if pd.notna(db['group']) else ''
 
+        # Models this chatter works - aggregated per model across all days
         chatter_models = []
-        for mn, ma in model_agg.items():
-            ms = ma['messages_sent']
-            ps = ma['ppv_sent']
-            fc = ma['fans_chatted']
-            fs = ma['fans_spent']
-            rl = ma['resp_list']
+        for mn, ma in chatter_model_db.get(emp, []):
+            ms = int(ma['messages_sent'])
+            ps = int(ma['ppv_sent'])
+            fc = int(ma['fans_chatted'])
+            fs = int(ma['fans_spent'])
+            avg_rl = ma['resp_sum'] / ma['resp_count'] if ma['resp_count'] > 0 else None
             chatter_models.append({
-                'name': mn,
+                'name': str(mn),
                 'sales': round(ma['sales'], 2),
                 'messages_sent': ms,
                 'ppv_sent': ps,
-                'ppv_unlocked': ma['ppv_unlocked'],
+                'ppv_unlocked': int(ma['ppv_unlocked']),
                 'golden_ratio': round(ps / ms * 100, 2) if ms > 0 else 0,
                 'unlock_ratio': round(ma['ppv_unlocked'] / ps * 100, 2) if ps > 0 else 0,
                 'fans_chatted': fc,
                 'fans_spent': fs,
                 'fan_cvr': round(fs / fc * 100, 2) if fc > 0 else 0,
-                'response_time': fmt_time(sum(rl) / len(rl)) if rl else 'N/A',
-                'response_seconds': round(sum(rl) / len(rl), 1) if rl else 0,
-                'sales_per_hour': round(ma['sph'] / ma['days'], 2) if ma['days'] > 0 else 0,
+                'response_time': fmt_time(avg_rl) if avg_rl is not None else 'N/A',
+                'response_seconds': round(avg_rl, 1) if avg_rl is not None else 0,
+                'sales_per_hour': round(ma['sph_sum'] / ma['rows'], 2) if ma['rows'] > 0 else 0,
             })
         chatter_models.sort(key=lambda x: x['sales'], reverse=True)
 
         # Hourly for this chatter
         chatter_hourly = []
-        for hour in range(24):
-            mh = msg_rows[msg_rows['Hour'] == hour]
-            sh = sales_rows[sales_rows['Hour'] == hour]
-            if len(mh) > 0 or len(sh) > 0:
-                chatter_hourly.append({
-                    'hour': hour,
-                    'hour_label': '%02d:00' % hour,
-                    'messages': len(mh),
-                    'sales_net': round(float(sh['Net'].sum()), 2),
-                })
+        for hour, s in chatter_hourly_slices.get(emp, []):
+            if hour not in range(24):
+                continue
+            chatter_hourly.append({
+                'hour': int(hour),
+                'hour_label': '%02d:00' % hour,
+                'messages': int(s['messages']),
+                'sales_net': round(float(s['sales_net']), 2),
+            })
 
         chatters_data.append({
             'name': str(emp),
@@ -925,12 +2128,18 @@ def main():
         })
 
     chatters_data.sort(key=lambda x: x['total_sales'], reverse=True)
+    stage_done('compute chatters')
 
     # ================================================================
     # ASSEMBLE JSON
     # ================================================================
+    report_start, report_end = REPORT_START, REPORT_END
+    if store and all_dates_sorted:
+        # The store can hold several reports: label with the range actually read
+        report_start = fmt_report_day(date.fromisoformat(start) if start else all_dates_sorted[0])
+        report_end = fmt_report_day(date.fromisoformat(end) if end else all_dates_sorted[-1])
     dashboard = {
-        'report_date': '%s - %s' % (REPORT_START, REPORT_END),
+        'report_date': '%s - %s' % (report_start, report_end),
         'generated_at': datetime.now().strftime('%b %d, %Y %H:%M'),
         'general': general,
         'peak_traffic_hour': {
@@ -945,17 +2154,36 @@ def main():
         'daily': daily_data,
         'daily_hourly': daily_hourly,
         'daily_model': daily_model,
+        'daily_model_hourly': daily_model_hourly,
+        'cube_file': CUBE_FILENAME,
+        'fan_sketch': {
+            'fan_count': len(agg['fans']),
+            'exact_max': FAN_SET_EXACT_MAX,
+            'hll_precision': HLL_PRECISION,
+        },
         'shifts': shifts_data,
         'models': models_data,
         'chatters': chatters_data,
     }
 
     with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
-        json.dump(dashboard, f, ensure_ascii=False, indent=2)
+        if output_format == 'columnar':
+            json.dump(encode_dashboard(dashboard), f, ensure_ascii=False, separators=(',', ':'))
+        else:
+            json.dump(dashboard, f, ensure_ascii=False, indent=2)
+    # Always compact: one value per line (indent) would multiply the cube's size
+    cube_path = os.path.join(os.path.dirname(OUTPUT_PATH), CUBE_FILENAME)
+    with open(cube_path, 'w', encoding='utf-8') as f:
+        json.dump(cube, f, ensure_ascii=False, separators=(',', ':'))
+    stage_done('json dump')
 
     print("\n" + "=" * 60)
-    print("JSON generado: %s" % OUTPUT_PATH)
-    print("Periodo: %s a %s (%d dias)" % (REPORT_START, REPORT_END, unique_dates))
+    print("JSON generado: %s (formato %s)" % (OUTPUT_PATH, output_format))
+    print("Cubo: %s (%d KB)" % (cube_path, os.path.getsize(cube_path) / 1024))
+    if publish:
+        print("Publicado: %s" % describe_artifact(publish_artifact(OUTPUT_PATH)))
+        print("Publicado: %s" % describe_artifact(publish_artifact(cube_path)))
+    print("Periodo: %s a %s (%d dias)" % (report_start, report_end, unique_dates))
     print("=" * 60)
     print("Revenue total (Net): $%.2f" % total_net_revenue)
     print("  Messages: $%.2f" % msg_revenue)
@@ -968,4 +2196,37 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Genera dashboard_data.json desde los exports de Excel.')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='leer siempre los Excel, sin usar ni escribir la cache parseada')
+    parser.add_argument('--purge-cache', action='store_true',
+                        help='borrar la cache de Excel parseados antes de procesar')
+    parser.add_argument('--incremental', action='store_true',
+                        help='procesar solo los archivos nuevos y fusionarlos con el estado guardado (las filas '
+                             'ya ingestadas se reconocen por un digest de 128 bits de su clave, sin guardar las '
+                             'filas: la probabilidad de descartar una fila nueva por colision es < 1e-20 con mil '
+                             'millones de filas)')
+    parser.add_argument('--store', action='store_true',
+                        help='guardar las filas parseadas en el almacen SQLite (dashboard_store.sqlite, solo archivos '
+                             'nuevos) y generar el reporte desde ahi')
+    parser.add_argument('--desde', type=parse_iso_day, metavar='AAAA-MM-DD',
+                        help='con --store: primer dia del reporte (por defecto, el primero del almacen)')
+    parser.add_argument('--hasta', type=parse_iso_day, metavar='AAAA-MM-DD',
+                        help='con --store: ultimo dia del reporte (por defecto, el ultimo del almacen)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='procesos para leer los Excel en paralelo (por defecto: todos los nucleos; 1 = secuencial)')
+    parser.add_argument('--stream', action='store_true',
+                        help='leer los Message Dashboards por bloques, con memoria acotada (sin cache)')
+    parser.add_argument('--format', choices=['rows', 'columnar'], default='rows',
+                        help='rows: un objeto por fila (compatible); columnar: arrays paralelos por tabla, mas compacto')
+    parser.add_argument('--publish', action='store_true',
+                        help='escribir tambien dashboard_data.<hash>.json (+ .gz/.br) y actualizar dashboard_manifest.json')
+    args = parser.parse_args()
+    if args.store and args.incremental:
+        parser.error('--store ya es incremental; usar solo una de las dos opciones')
+    if (args.desde or args.hasta) and not args.store:
+        parser.error('--desde/--hasta requieren --store')
+    if args.purge_cache:
+        purge_excel_cache()
+    main(use_cache=not args.no_cache, incremental=args.incremental, workers=args.workers, stream=args.stream,
+         output_format=args.format, publish=args.publish, store=args.store, start=args.desde, end=args.hasta)
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Almacen SQLite local con las filas parseadas de todos los exports.
+
+process_data.py --store guarda cada archivo parseado en una sola base SQLite
+(sqlite3 de la stdlib, nada que instalar ni levantar). Cada fila lleva un
+digest estable de sus columnas de dedup y un digest repetido solo descarta
+la fila si los valores de la clave tambien coinciden: un export solapado no
+guarda una fila dos veces y gana la primera copia, como
+drop_duplicates(keep='first'). Fecha, modelo, chatter, fan y las claves de
+las celdas estan indexados, asi que las sumas de cualquier rango de fechas
+salen de un GROUP BY en SQLite en vez de releer cada Excel, y el almacen
+conserva el historial de todos los reportes ingestados.
+"""
+
+import hashlib
+import math
+import sqlite3
+from datetime import date, datetime, time
+
+import numpy as np
+import pandas as pd
+
+SOURCES_TABLE = '_sources'   # family, position -> sha256 of each ingested file
+COLUMNS_TABLE = '_columns'   # table, column -> kind, to restore dtypes on read
+PROBE_TABLE = '_probe'       # temp: digests of an upsert batch
+STORE_VERSION = 2            # PRAGMA user_version; a store of another version is rebuilt
+
+
+def _q(name):
+    return '"%s"' % str(name).replace('"', '""')
+
+
+def open_store(path):
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    if conn.execute('PRAGMA user_version').fetchone()[0] != STORE_VERSION:
+        # Older layout (row_key UNIQUE): drop everything, the sources are ingested again
+        tables = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' "
+                                             "AND name NOT LIKE 'sqlite_%'")]
+        with conn:
+            for table in tables:
+                conn.execute('DROP TABLE %s' % _q(table))
+        conn.execute('PRAGMA user_version = %d' % STORE_VERSION)
+    conn.execute('CREATE TABLE IF NOT EXISTS %s (family TEXT NOT NULL, position INTEGER NOT NULL, '
+                 'path TEXT, sha256 TEXT NOT NULL, ingested_at TEXT, PRIMARY KEY (family, position))'
+                 % SOURCES_TABLE)
+    conn.execute('CREATE TABLE IF NOT EXISTS %s (tbl TEXT NOT NULL, col TEXT NOT NULL, kind TEXT NOT NULL, '
+                 'PRIMARY KEY (tbl, col))' % COLUMNS_TABLE)
+    return conn
+
+
+def ingested_hashes(conn, family):
+    """Content hashes of the files of `family` already in the store, in ingest order."""
+    rows = conn.execute('SELECT sha256 FROM %s WHERE family = ? ORDER BY position' % SOURCES_TABLE, (family,))
+    return [r[0] for r in rows]
+
+
+def record_source(conn, family, position, path, sha):
+    conn.execute('INSERT OR REPLACE INTO %s VALUES (?, ?, ?, ?, ?)' % SOURCES_TABLE,
+                 (family, position, path, sha, datetime.now().isoformat(timespec='seconds')))
+
+
+def reset_family(conn, family, tables):
+    """Forget every file of `family` and drop its tables (re-ingested from scratch)."""
+    for table in tables:
+        conn.execute('DROP TABLE IF EXISTS %s' % _q(table))
+        conn.execute('DELETE FROM %s WHERE tbl = ?' % COLUMNS_TABLE, (table,))
+    conn.execute('DELETE FROM %s WHERE family = ?' % SOURCES_TABLE, (family,))
+
+
+def sql_value(v):
+    """Plain Python value SQLite can store; missing values -> None, dates -> ISO text."""
+    if v is None or v is pd.NaT or v is pd.NA:
+        return None
+    if isinstance(v, np.generic):
+        v = v.item()
+    if isinstance(v, float) and math.isnan(v):
+        return None
+    if isinstance(v, (bool, int, float, str, bytes)):
+        return v
+    if isinstance(v, datetime):
+        return v.isoformat(sep=' ')
+    if isinstance(v, (date, time)):
+        return v.isoformat()
+    return str(v)
+
+
+def column_kind(s):
+    """'bool', 'datetime' (datetime64), 'date' (datetime.date objects) or 'value'."""
+    if pd.api.types.is_bool_dtype(s):
+        return 'bool'
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return 'datetime'
+    present = s.dropna()
+    if len(present) and isinstance(present.iloc[0], date) and not isinstance(present.iloc[0], datetime):
+        return 'date'
+    return 'value'
+
+
+def column_values(s, kind):
+    if kind == 'bool':
+        return s.astype(int).tolist()
+    if kind == 'datetime':
+        return s.astype(str).astype(object).where(s.notna(), None).tolist()
+    if kind == 'date':
+        return [v.isoformat() if isinstance(v, date) else None for v in s]
+    if s.dtype.kind in 'iuf':  # includes nullable Int8
+        return s.astype(object).where(s.notna(), None).tolist()
+    return [sql_value(v) for v in s.astype(object)]
+
+
+def _key_part(v):
+    # 5 and 5.0 are the same key, as in drop_duplicates
+    return int(v) if isinstance(v, float) and v.is_integer() else v
+
+
+def key_tuples(df, cols):
+    """Per row, the `cols` values as row_keys() hashes them (missing -> None), for exact comparisons."""
+    columns = [[_key_part(v) for v in column_values(df[c], column_kind(df[c]))] for c in cols]
+    return list(zip(*columns))
+
+
+def digest_keys(tuples, size=8):
+    """Signed 64-bit blake2b digest of each key tuple; with size=16, 128-bit
+    digests as an 'S16' bytes array (sorts and compares bytewise).
+    """
+    if size == 16:
+        return np.array([hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).digest() for key in tuples],
+                        dtype='S16')
+    keys = np.empty(len(tuples), dtype=np.int64)
+    for i, key in enumerate(tuples):
+        digest = hashlib.blake2b(repr(key).encode('utf-8'), digest_size=8).digest()
+        keys[i] = int.from_bytes(digest, 'little', signed=True)
+    return keys
+
+
+def row_keys(df, cols):
+    """Signed 64-bit key per row from the `cols` values. Stable across runs
+    (unlike hash(), which is salted per process), so it can be persisted.
+    """
+    return digest_keys(key_tuples(df, cols))
+
+
+def _ensure_table(conn, table, kinds, indexes):
+    # row_key is the digest of the dedup key, not the key: equal digests are confirmed on the values
+    conn.execute('CREATE TABLE IF NOT EXISTS %s (row_key INTEGER NOT NULL)' % _q(table))
+    conn.execute('CREATE INDEX IF NOT EXISTS %s ON %s (row_key)' % (_q('ix_%s_row_key' % table), _q(table)))
+    have = {r[1] for r in conn.execute('PRAGMA table_info(%s)' % _q(table))}
+    for col, kind in kinds.items():
+        if col not in have:  # exports gaining a column keep working
+            conn.execute('ALTER TABLE %s ADD COLUMN %s' % (_q(table), _q(col)))
+        # A column that was all-missing so far ('value') takes the kind of the first real data
+        conn.execute('INSERT INTO %s VALUES (?, ?, ?) ON CONFLICT (tbl, col) DO UPDATE SET kind = excluded.kind '
+                     "WHERE kind = 'value'" % COLUMNS_TABLE, (table, col, kind))
+    create_indexes(conn, table, indexes)
+
+
+def create_indexes(conn, table, indexes):
+    """One index per entry of `indexes`: a column name, or a list of columns for a
+    composite index. Entries naming a column the table lacks are skipped.
+    """
+    have = {r[1] for r in conn.execute('PRAGMA table_info(%s)' % _q(table))}
+    for index in indexes:
+        cols = [index] if isinstance(index, str) else list(index)
+        if all(col in have for col in cols):
+            conn.execute('CREATE INDEX IF NOT EXISTS %s ON %s (%s)'
+                         % (_q('ix_%s_%s' % (table, '_'.join(cols))), _q(table), ', '.join(_q(c) for c in cols)))
+
+
+def stored_keys(conn, table, key_cols, digests):
+    """Key tuples (as key_tuples() builds them) of the stored rows whose row_key is in `digests`."""
+    conn.execute('CREATE TEMP TABLE IF NOT EXISTS %s (k INTEGER PRIMARY KEY)' % PROBE_TABLE)
+    conn.execute('DELETE FROM %s' % PROBE_TABLE)
+    conn.executemany('INSERT OR IGNORE INTO %s VALUES (?)' % PROBE_TABLE, ((k,) for k in digests.tolist()))
+    rows = conn.execute('SELECT %s FROM %s WHERE row_key IN (SELECT k FROM %s)'
+                        % (', '.join(_q(c) for c in key_cols), _q(table), PROBE_TABLE))
+    return {tuple(_key_part(v) for v in row) for row in rows}
+
+
+def upsert_frame(conn, table, df, key_cols, indexes=()):
+    """Insert the rows of `df` whose `key_cols` values are not stored yet (nor earlier
+    in `df`); returns how many were new. A stored row with the same digest only
+    counts as the same row if its key values are equal too.
+    """
+    kinds = {col: column_kind(df[col]) for col in df.columns}
+    _ensure_table(conn, table, kinds, indexes)
+    if not len(df):
+        return 0
+    tuples = key_tuples(df, key_cols)
+    digests = digest_keys(tuples)
+    stored = stored_keys(conn, table, key_cols, digests)
+    seen = set()
+    new = np.zeros(len(df), dtype=bool)
+    for i, key in enumerate(tuples):
+        if key not in stored and key not in seen:
+            seen.add(key)
+            new[i] = True
+    cols = list(df.columns)
+    values = [digests[new].tolist()] + [column_values(df[c][new], kinds[c]) for c in cols]
+    sql = 'INSERT INTO %s (row_key, %s) VALUES (%s)' % (
+        _q(table), ', '.join(_q(c) for c in cols), ', '.join('?' * (len(cols) + 1)))
+    conn.executemany(sql, zip(*values))
+    return int(new.sum())
+
+
+def _range_clause(date_col, start, end):
+    conds, params = [], []
+    if date_col and start:
+        conds.append('%s >= ?' % _q(date_col))
+        params.append(start)
+    if date_col and end:
+        conds.append('%s <= ?' % _q(date_col))
+        params.append(end)
+    return (' WHERE ' + ' AND '.join(conds) if conds else ''), params
+
+
+def _column_kinds(conn, table):
+    return dict(conn.execute('SELECT col, kind FROM %s WHERE tbl = ?' % COLUMNS_TABLE, (table,)))
+
+
+def _restore_dtypes(df, cols, kinds):
+    for col in cols:
+        kind = kinds.get(col, 'value')
+        if kind == 'bool':
+            df[col] = df[col].fillna(0).astype(bool)
+        elif kind == 'datetime':
+            df[col] = pd.to_datetime(df[col], format='ISO8601')
+        elif kind == 'date':
+            df[col] = pd.to_datetime(df[col], format='ISO8601').dt.date
+        elif df[col].dtype == object:
+            # SQLite NULL comes back as None; read_excel gives NaN
+            df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+def read_frame(conn, table, date_col=None, start=None, end=None):
+    """Rows of `table` in insertion order, with dtypes restored; only
+    start <= date_col <= end (ISO dates, None = open) when given. None if the
+    table was never written.
+    """
+    kinds = _column_kinds(conn, table)
+    if not kinds:
+        return None
+    cols = [r[1] for r in conn.execute('PRAGMA table_info(%s)' % _q(table)) if r[1] != 'row_key']
+    where, params = _range_clause(date_col, start, end)
+    df = pd.read_sql_query('SELECT %s FROM %s%s ORDER BY rowid' % (', '.join(_q(c) for c in cols), _q(table), where),
+                           conn, params=params)
+    return _restore_dtypes(df, cols, kinds)
+
+
+def group_frame(conn, table, keys, measures=None, date_col=None, start=None, end=None, where=None, distinct=False):
+    """SELECT keys, measures ... GROUP BY keys, computed by SQLite: one row per
+    combination of `keys` (NULL is a key too) with `measures` ({name: SQL
+    aggregate}), in order of first stored row; key dtypes are restored like
+    read_frame(). With `distinct`, the distinct `keys` rows and no measures.
+    `where` is an extra SQL condition; start/end as in read_frame(). None if the
+    table was never written.
+    """
+    kinds = _column_kinds(conn, table)
+    if not kinds:
+        return None
+    clause, params = _range_clause(date_col, start, end)
+    if where:
+        clause += (' AND ' if clause else ' WHERE ') + where
+    cols = ', '.join(_q(k) for k in keys)
+    if distinct:
+        sql = 'SELECT DISTINCT %s FROM %s%s' % (cols, _q(table), clause)
+    else:
+        aggs = ''.join(', %s AS %s' % (expr, _q(name)) for name, expr in measures.items())
+        sql = 'SELECT %s%s FROM %s%s GROUP BY %s ORDER BY MIN(rowid)' % (cols, aggs, _q(table), clause, cols)
+    return _restore_dtypes(pd.read_sql_query(sql, conn, params=params), keys, kinds)
+
+
+def table_summary(conn, table, date_col):
+    """(rows, first date, last date) of `table`, from the date index."""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone():
+        return 0, None, None
+    return conn.execute('SELECT COUNT(*), MIN(%s), MAX(%s) FROM %s'
+                        % (_q(date_col), _q(date_col), _q(table))).fetchone()
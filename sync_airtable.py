@@ -5,33 +5,60 @@ Sincroniza modelos Live desde Airtable y actualiza airtable_model_types.json.
 Se ejecuta via GitHub Action diariamente o manualmente.
 
 Requiere variable de entorno: AIRTABLE_PAT
+
+La cache de registros (airtable_records_cache.json) no se versiona: en un
+runner nuevo de GitHub Actions cada ejecucion empieza sin ella y descarga
+todos los registros Live, como --full. Para que las ejecuciones programadas
+solo bajen lo modificado, el workflow tiene que conservar el archivo entre
+ejecuciones con actions/cache antes de este script, por ejemplo:
+
+    - uses: actions/cache@v4
+      with:
+        path: airtable_records_cache.json
+        key: airtable-records-${{ github.run_id }}
+        restore-keys: airtable-records-
 """
 
+import argparse
 import json
 import os
 import sys
+from datetime import datetime, timedelta, timezone
 
 import requests
+from requests.adapters import HTTPAdapter
 
 # Airtable config
 BASE_ID = 'appA44xNGmua0JMoZ'
 TBL_MODELO = 'tblbb6vMPQLNzqWdJ'
 FIELDS = ['Nombre Artístico', 'Tipo de Página', 'Estado']
+LIVE_FORMULA = "{Estado}='Live'"
+API_BASE = os.environ.get('AIRTABLE_API_BASE', 'https://api.airtable.com/v0')  # overridable for a local stub
+REQUEST_TIMEOUT = 30  # seconds
 
 # Output path (relative to repo root)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, 'airtable_model_types.json')
+RECORD_CACHE_PATH = os.path.join(SCRIPT_DIR, 'airtable_records_cache.json')
+MODIFIED_MARGIN_MINUTES = 10  # overlap with the previous sync to absorb clock skew
 
 
-def fetch_airtable_models(pat):
-    """Fetch all records from the Modelo table in Airtable."""
-    headers = {'Authorization': 'Bearer ' + pat}
-    url = 'https://api.airtable.com/v0/%s/%s' % (BASE_ID, TBL_MODELO)
-    params = {'fields[]': FIELDS}
-    
+def make_session(pat):
+    """One keep-alive session for every page request."""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=2))
+    session.headers['Authorization'] = 'Bearer ' + pat
+    return session
+
+
+def fetch_airtable_models(session, formula=LIVE_FORMULA, fields=FIELDS):
+    """Fetch the Modelo records matching `formula`, projected to `fields`."""
+    url = '%s/%s/%s' % (API_BASE, BASE_ID, TBL_MODELO)
+    params = {'fields[]': fields, 'filterByFormula': formula}
+
     records = []
     while True:
-        resp = requests.get(url, headers=headers, params=params)
+        resp = session.get(url, params=params, timeout=REQUEST_TIMEOUT)
         if resp.status_code != 200:
             print("Error Airtable API: %d %s" % (resp.status_code, resp.text[:200]))
             sys.exit(1)
@@ -41,14 +68,82 @@ def fetch_airtable_models(pat):
         if not offset:
             break
         params['offset'] = offset
-    
+
+    return records
+
+
+# ================================================================
+# LOCAL RECORD CACHE
+# ================================================================
+def load_record_cache():
+    """Cached Live records from the previous sync, or None if unusable."""
+    if not os.path.exists(RECORD_CACHE_PATH):
+        return None
+    try:
+        with open(RECORD_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # A different table or field projection invalidates every cached record
+    if cache.get('table') != '%s/%s' % (BASE_ID, TBL_MODELO) or cache.get('fields') != FIELDS:
+        return None
+    return cache
+
+
+def save_record_cache(records, synced_at):
+    cache = {
+        'table': '%s/%s' % (BASE_ID, TBL_MODELO),
+        'fields': FIELDS,
+        'synced_at': synced_at,
+        'records': records,
+    }
+    with open(RECORD_CACHE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+
+
+def sync_live_records(session, use_cache=True):
+    """Return the Live records, downloading only what changed since the last sync.
+
+    With a cache, two small requests replace the full download: the ids of
+    the current Live records (projected to `Estado` only) and the full fields
+    of Live records modified since the previous sync. Cached records that
+    are no longer Live are dropped; if a Live id is neither cached nor in the
+    modified set the cache is ignored and everything is fetched again.
+    """
+    now = datetime.now(timezone.utc)
+    synced_at = now.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+    cache = load_record_cache() if use_cache else None
+
+    records = None
+    if cache is not None:
+        since = datetime.strptime(cache['synced_at'], '%Y-%m-%dT%H:%M:%S.000Z')
+        since -= timedelta(minutes=MODIFIED_MARGIN_MINUTES)
+        modified_formula = "AND(%s, IS_AFTER(LAST_MODIFIED_TIME(), '%s'))" % (
+            LIVE_FORMULA, since.strftime('%Y-%m-%dT%H:%M:%S.000Z'))
+        live_ids = [r['id'] for r in fetch_airtable_models(session, LIVE_FORMULA, ['Estado'])]
+        modified = {r['id']: r for r in fetch_airtable_models(session, modified_formula)}
+        cached = cache['records']
+        if all(rid in modified or rid in cached for rid in live_ids):
+            records = [modified.get(rid) or cached[rid] for rid in live_ids]
+            print('Registros Live: %d (%d modificados, %d desde cache local)'
+                  % (len(records), len(modified), len(records) - len(modified)))
+        else:
+            print('Cache local incompleta, descargando todos los registros Live...')
+
+    if records is None:
+        if use_cache and cache is None:
+            print('Sin cache local de registros (p. ej. runner de CI sin actions/cache): descarga completa')
+        records = fetch_airtable_models(session)
+        print('Registros Live descargados: %d' % len(records))
+
+    save_record_cache({r['id']: r for r in records}, synced_at)
     return records
 
 
 def classify_models(records):
     """Filter Live models and classify by account type."""
+    # The API already filters on Estado; this keeps cached records honest
     live_records = [r for r in records if r.get('fields', {}).get('Estado') == 'Live']
-    print('Modelos totales en Airtable: %d' % len(records))
     print('Modelos LIVE: %d' % len(live_records))
     
     output = {}
@@ -78,14 +173,15 @@ def classify_models(records):
     return output
 
 
-def main():
+def main(use_cache=True):
     pat = os.environ.get('AIRTABLE_PAT')
     if not pat:
         print("ERROR: AIRTABLE_PAT no definido en variables de entorno")
         sys.exit(1)
     
     print("Conectando a Airtable...")
-    records = fetch_airtable_models(pat)
+    session = make_session(pat)
+    records = sync_live_records(session, use_cache)
     model_types = classify_models(records)
     
     # Check for changes
@@ -127,7 +223,11 @@ def main():
 
 
 if __name__ == '__main__':
-    changed = main()
+    parser = argparse.ArgumentParser(description='Sincroniza modelos Live desde Airtable.')
+    parser.add_argument('--full', action='store_true',
+                        help='ignora la cache local de registros y descarga todo')
+    args = parser.parse_args()
+    changed = main(use_cache=not args.full)
     # Set output for GitHub Actions
     github_output = os.environ.get('GITHUB_OUTPUT')
     if github_output:
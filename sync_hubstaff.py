@@ -7,18 +7,41 @@ Genera hubstaff_hours.json con horas reales por chatter.
 Requiere: HUBSTAFF_REFRESH_TOKEN en env o hubstaff_token.json
 """
 
+import argparse
 import json
 import os
 import sys
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from name_index import build_name_index, resolve_name
 
 # Config
 ORG_ID = 580385  # Chatting Wizard ESP
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 TOKEN_PATH = os.path.join(SCRIPT_DIR, 'hubstaff_token.json')
 OUTPUT_PATH = os.path.join(SCRIPT_DIR, 'hubstaff_hours.json')
+USER_CACHE_PATH = os.path.join(SCRIPT_DIR, 'hubstaff_users_cache.json')
+USER_CACHE_TTL_DAYS = 7  # profiles rarely change; expired entries are re-fetched
+ACTIVITY_STORE_PATH = os.path.join(SCRIPT_DIR, 'hubstaff_activity_store.json')
+OPEN_DAYS = 2  # today and yesterday can still gain tracked time; they are always re-fetched
+SHARD_DAYS = 1          # days per activities window fetched in parallel (0 = one serial walk)
+SHARD_CONCURRENCY = 4   # activities windows paginated at the same time
+
+# API endpoints (overridable to run against a local stub server)
+API_BASE = os.environ.get('HUBSTAFF_API_BASE', 'https://api.hubstaff.com/v2')
+ACCOUNT_BASE = os.environ.get('HUBSTAFF_ACCOUNT_BASE', 'https://account.hubstaff.com')
+
+# HTTP client
+MAX_CONCURRENCY = 8     # parallel /users/{id} requests
+MAX_RETRIES = 5         # per request, on 429/503 or connection errors
+REQUEST_TIMEOUT = 30    # seconds
+MAX_RETRY_DELAY = 60    # seconds
 
 # Name mapping: Hubstaff name -> Inflow/Dashboard name
 # (Some names differ between platforms)
@@ -69,14 +92,58 @@ NAME_MAP = {
     'Neyber Chacon': 'Neyber Chacon',
     'Darwins Rodriguez': 'Darwins Rodriguez',
 }
-
-
-def get_access_token(refresh_token):
+NAME_INDEX = build_name_index(NAME_MAP)
+
+
+def make_session(pool_size=MAX_CONCURRENCY):
+    """requests.Session whose keep-alive connection pool fits `pool_size` concurrent requests."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(pool_size, 1))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def retry_delay(resp, attempt):
+    """Seconds to wait before retrying: the Retry-After header if present, else exponential backoff."""
+    retry_after = resp.headers.get('Retry-After') if resp is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = 2 ** attempt
+        return min(max(delay, 0), MAX_RETRY_DELAY)
+    return min(2 ** attempt, MAX_RETRY_DELAY)
+
+
+def api_request(session, method, url, **kwargs):
+    """session.request() that retries rate-limited (429/503) and failed connections."""
+    kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            resp = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == MAX_RETRIES:
+                raise
+            resp, error = None, e
+        else:
+            if resp.status_code not in (429, 503) or attempt == MAX_RETRIES:
+                return resp
+            error = 'HTTP %d' % resp.status_code
+        delay = retry_delay(resp, attempt)
+        print("  AVISO: %s en %s, reintento en %.1fs" % (error, url, delay))
+        time.sleep(delay)
+
+
+def get_access_token(session, refresh_token):
     """Exchange refresh token for access token via OpenID Connect."""
-    disc = requests.get('https://account.hubstaff.com/.well-known/openid-configuration').json()
+    disc = api_request(session, 'GET', ACCOUNT_BASE + '/.well-known/openid-configuration').json()
     token_endpoint = disc['token_endpoint']
 
-    resp = requests.post(token_endpoint, data={
+    resp = api_request(session, 'POST', token_endpoint, data={
         'grant_type': 'refresh_token',
         'refresh_token': refresh_token,
     })
@@ -110,7 +177,7 @@ def save_refresh_token(new_rt):
         json.dump({'refresh_token': new_rt, 'updated_at': datetime.now().isoformat()}, f, indent=2)
 
 
-def get_org_members(headers):
+def get_org_members(session):
     """Get all active members in the organization."""
     members = []
     page = None
@@ -118,8 +185,7 @@ def get_org_members(headers):
         params = {'page_limit': 100}
         if page:
             params['page_start_id'] = page
-        r = requests.get('https://api.hubstaff.com/v2/organizations/%d/members' % ORG_ID,
-                         headers=headers, params=params)
+        r = api_request(session, 'GET', '%s/organizations/%d/members' % (API_BASE, ORG_ID), params=params)
         data = r.json()
         members.extend(data.get('members', []))
         page = data.get('pagination', {}).get('next_page_start_id')
@@ -128,22 +194,82 @@ def get_org_members(headers):
     return [m for m in members if m.get('membership_status') == 'active']
 
 
-def get_user_details(headers, user_ids):
-    """Get user name and email for each user_id."""
+def get_user(session, uid):
+    """Name and email of one user, or None when the lookup fails."""
+    r = api_request(session, 'GET', '%s/users/%d' % (API_BASE, uid))
+    if r.status_code != 200:
+        return None
+    u = r.json().get('user', {})
+    return {
+        'name': u.get('name', ''),
+        'email': u.get('email', ''),
+    }
+
+
+def get_user_details(session, user_ids, concurrency=MAX_CONCURRENCY):
+    """Get user name and email for each user_id, `concurrency` requests at a time."""
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1)) as pool:
+        details = list(pool.map(lambda uid: get_user(session, uid), user_ids))
+    return {uid: u for uid, u in zip(user_ids, details) if u is not None}
+
+
+def load_user_cache():
+    """{user_id: {'name', 'email', 'fetched_at'}} from USER_CACHE_PATH."""
+    if not os.path.exists(USER_CACHE_PATH):
+        return {}
+    try:
+        with open(USER_CACHE_PATH, 'r', encoding='utf-8') as f:
+            return {int(uid): u for uid, u in json.load(f).get('users', {}).items()}
+    except (ValueError, OSError):
+        print("  AVISO: cache de usuarios ilegible, se descarta")
+        return {}
+
+
+def save_user_cache(cache):
+    with open(USER_CACHE_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'users': {str(uid): u for uid, u in sorted(cache.items())}}, f, ensure_ascii=False, indent=2)
+
+
+def get_users_cached(session, user_ids, concurrency=MAX_CONCURRENCY, ttl_days=USER_CACHE_TTL_DAYS):
+    """get_user_details() through the on-disk user directory: only members not
+    cached, or cached more than `ttl_days` ago, are fetched.
+    Returns (users, stats) with hit/miss/expired counts.
+    """
+    cache = load_user_cache()
+    cutoff = datetime.now() - timedelta(days=ttl_days)
+    fresh, missing, expired = [], [], []
+    for uid in user_ids:
+        entry = cache.get(uid)
+        if entry is None:
+            missing.append(uid)
+        elif datetime.fromisoformat(entry['fetched_at']) < cutoff:
+            expired.append(uid)
+        else:
+            fresh.append(uid)
+
+    fetched = get_user_details(session, missing + expired, concurrency)
+    now = datetime.now().isoformat()
+    for uid, u in fetched.items():
+        cache[uid] = dict(u, fetched_at=now)
+    stale = [uid for uid in expired if uid not in fetched]
+    if stale:
+        # Keep serving the expired entry rather than dropping the user
+        print("  AVISO: %d usuarios no se pudieron refrescar, se usan datos en cache" % len(stale))
+    if fetched:
+        save_user_cache(cache)
+
     users = {}
     for uid in user_ids:
-        r = requests.get('https://api.hubstaff.com/v2/users/%d' % uid, headers=headers)
-        if r.status_code == 200:
-            u = r.json().get('user', {})
-            users[uid] = {
-                'name': u.get('name', ''),
-                'email': u.get('email', ''),
-            }
-    return users
-
-
-def get_daily_activities(headers, start_date, end_date):
-    """Get daily activities (tracked seconds) for all members in date range."""
+        if uid in cache:
+            users[uid] = {'name': cache[uid]['name'], 'email': cache[uid]['email']}
+    stats = {'hits': len(fresh), 'misses': len(missing), 'expired': len(expired), 'failed': len(user_ids) - len(users)}
+    return users, stats
+
+
+def get_daily_activities(session, start_date, end_date, strict=False):
+    """Get daily activities (tracked seconds) for all members in date range.
+    With `strict`, an API error raises instead of returning the pages read so far.
+    """
     activities = []
     page = None
     while True:
@@ -154,10 +280,12 @@ def get_daily_activities(headers, start_date, end_date):
         }
         if page:
             params['page_start_id'] = page
-        r = requests.get('https://api.hubstaff.com/v2/organizations/%d/activities/daily' % ORG_ID,
-                         headers=headers, params=params)
+        r = api_request(session, 'GET', '%s/organizations/%d/activities/daily' % (API_BASE, ORG_ID),
+                        params=params)
         if r.status_code != 200:
             print("ERROR: Activities API: %d %s" % (r.status_code, r.text[:200]))
+            if strict:
+                raise RuntimeError('Hubstaff activities API returned %d' % r.status_code)
             break
         data = r.json()
         activities.extend(data.get('daily_activities', []))
@@ -167,41 +295,161 @@ def get_daily_activities(headers, start_date, end_date):
     return activities
 
 
+def activity_key(act):
+    """Identity of a daily activity row, for merging overlapping pages/windows."""
+    if act.get('id') is not None:
+        return act['id']
+    return (act.get('user_id'), act.get('date'), act.get('project_id'), act.get('task_id'))
+
+
+def get_daily_activities_sharded(session, start_date, end_date, shard_days=SHARD_DAYS,
+                                 concurrency=SHARD_CONCURRENCY, strict=False):
+    """get_daily_activities() split into windows of `shard_days` days, each paginated
+    concurrently. Windows are merged in date order, deduplicated per activity.
+    """
+    days = date_range(start_date, end_date)
+    if shard_days <= 0 or len(days) <= shard_days:
+        return get_daily_activities(session, start_date, end_date, strict)
+    windows = [(days[i], days[min(i + shard_days, len(days)) - 1]) for i in range(0, len(days), shard_days)]
+    with ThreadPoolExecutor(max_workers=max(min(concurrency, len(windows)), 1)) as pool:
+        shards = list(pool.map(lambda w: get_daily_activities(session, w[0], w[1], strict), windows))
+
+    activities, seen = [], set()
+    for shard in shards:
+        for act in shard:
+            key = activity_key(act)
+            if key not in seen:
+                seen.add(key)
+                activities.append(act)
+    return activities
+
+
+def local_today():
+    return datetime.now().date()
+
+
+def date_range(start_date, end_date):
+    """Every 'YYYY-MM-DD' from start_date to end_date, inclusive."""
+    day = datetime.strptime(start_date, '%Y-%m-%d').date()
+    last = datetime.strptime(end_date, '%Y-%m-%d').date()
+    days = []
+    while day <= last:
+        days.append(day.isoformat())
+        day += timedelta(days=1)
+    return days
+
+
+def day_windows(days):
+    """Sorted 'YYYY-MM-DD' days -> [(first, last)] runs of consecutive days."""
+    windows = []
+    for day in days:
+        prev = (datetime.strptime(day, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+        if windows and windows[-1][1] == prev:
+            windows[-1] = (windows[-1][0], day)
+        else:
+            windows.append((day, day))
+    return windows
+
+
+def load_activity_store():
+    """{'watermark': last day of the contiguous final run, 'days': {day: {'final', 'fetched_at', 'activities'}}}."""
+    if os.path.exists(ACTIVITY_STORE_PATH):
+        with open(ACTIVITY_STORE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'watermark': None, 'days': {}}
+
+
+def save_activity_store(store):
+    with open(ACTIVITY_STORE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(store, f, ensure_ascii=False)
+
+
+def store_watermark(store):
+    """Last day up to which every stored day, from the first one, is present and final."""
+    watermark = None
+    for day in sorted(store['days']):
+        expected = day
+        if watermark:
+            expected = (datetime.strptime(watermark, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+        if day != expected or not store['days'][day]['final']:
+            break
+        watermark = day
+    return watermark
+
+
+def sync_activity_store(session, start_date, end_date, shard_days=SHARD_DAYS, shard_concurrency=SHARD_CONCURRENCY):
+    """Daily activities for the range from the local per-day store. Only days that
+    are missing or were stored while still open (within OPEN_DAYS of today) are
+    downloaded again. Returns (activities, days fetched, days reused).
+    """
+    store = load_activity_store()
+    days = date_range(start_date, end_date)
+    first_open = (local_today() - timedelta(days=OPEN_DAYS - 1)).isoformat()
+    watermark = store.get('watermark')
+    # The watermark only vouches for stored days: one before the first stored day is still missing
+    stale = [d for d in days if d not in store['days']
+             or ((watermark is None or d > watermark) and not store['days'][d]['final'])]
+
+    for first, last in day_windows(stale):
+        by_day = {d: [] for d in date_range(first, last)}
+        for act in get_daily_activities_sharded(session, first, last, shard_days, shard_concurrency, strict=True):
+            by_day.setdefault(act.get('date', ''), []).append(act)
+        fetched_at = datetime.now().isoformat()
+        for day, day_acts in by_day.items():
+            store['days'][day] = {'final': day < first_open, 'fetched_at': fetched_at, 'activities': day_acts}
+
+    store['watermark'] = store_watermark(store)
+    if stale:
+        save_activity_store(store)
+    activities = [act for d in days for act in store['days'][d]['activities']]
+    return activities, len(stale), len(days) - len(stale)
+
+
 def map_hubstaff_to_inflow(hubstaff_name):
     """Map Hubstaff user name to Inflow chatter name."""
-    if hubstaff_name in NAME_MAP:
-        return NAME_MAP[hubstaff_name]
-    # Try case-insensitive match
-    for k, v in NAME_MAP.items():
-        if k.lower() == hubstaff_name.lower():
-            return v
+    # Exact, then ignoring case/accents/whitespace
+    key, candidates = resolve_name(NAME_INDEX, hubstaff_name)
+    if key is not None:
+        return NAME_MAP[key]
+    if candidates:
+        print("  AVISO: nombre Hubstaff ambiguo '%s' -> %s"
+              % (hubstaff_name, ', '.join(NAME_MAP[k] for k in candidates)))
     # Default: return as-is (might match directly)
     return hubstaff_name
 
 
-def main(start_date='2026-02-01', end_date='2026-02-13'):
+def main(start_date='2026-02-01', end_date='2026-02-13', concurrency=MAX_CONCURRENCY,
+         users_ttl_days=USER_CACHE_TTL_DAYS, incremental=False,
+         shard_days=SHARD_DAYS, shard_concurrency=SHARD_CONCURRENCY):
     print("Hubstaff Sync: %s to %s" % (start_date, end_date))
+    session = make_session(max(concurrency, shard_concurrency))
 
     # Auth
     refresh_token = load_refresh_token()
-    access_token, new_refresh_token = get_access_token(refresh_token)
+    access_token, new_refresh_token = get_access_token(session, refresh_token)
     save_refresh_token(new_refresh_token)
-    headers = {'Authorization': 'Bearer ' + access_token}
+    session.headers['Authorization'] = 'Bearer ' + access_token
     print("  Autenticado OK")
 
     # Get members
-    members = get_org_members(headers)
+    members = get_org_members(session)
     user_ids = [m['user_id'] for m in members]
     print("  Miembros activos: %d" % len(user_ids))
 
     # Get user details
     print("  Obteniendo nombres de usuarios...")
-    users = get_user_details(headers, user_ids)
+    users, user_stats = get_users_cached(session, user_ids, concurrency, users_ttl_days)
     print("  Usuarios cargados: %d" % len(users))
 
     # Get daily activities
-    print("  Descargando actividades diarias...")
-    activities = get_daily_activities(headers, start_date, end_date)
+    if incremental:
+        print("  Sincronizando actividades diarias (incremental)...")
+        activities, days_fetched, days_reused = sync_activity_store(
+            session, start_date, end_date, shard_days, shard_concurrency)
+        print("  Dias descargados: %d | reutilizados del store local: %d" % (days_fetched, days_reused))
+    else:
+        print("  Descargando actividades diarias...")
+        activities = get_daily_activities_sharded(session, start_date, end_date, shard_days, shard_concurrency)
     print("  Actividades: %d entradas" % len(activities))
 
     # Aggregate: total tracked seconds per user
@@ -226,6 +474,7 @@ def main(start_date='2026-02-01', end_date='2026-02-13'):
     }
 
     unmatched = []
+    inflow_names = set(NAME_MAP.values())
     for uid, total_seconds in sorted(user_hours.items(), key=lambda x: x[1], reverse=True):
         user = users.get(uid, {})
         hubstaff_name = user.get('name', 'Unknown')
@@ -246,7 +495,7 @@ def main(start_date='2026-02-01', end_date='2026-02-13'):
             'daily_minutes': daily,
         }
 
-        if hubstaff_name == inflow_name and hubstaff_name not in NAME_MAP.values():
+        if hubstaff_name == inflow_name and hubstaff_name not in inflow_names:
             unmatched.append(hubstaff_name)
 
     # Write output
@@ -255,6 +504,9 @@ def main(start_date='2026-02-01', end_date='2026-02-13'):
 
     # Summary
     print("\n=== RESUMEN ===")
+    print("  Cache de usuarios: %d aciertos, %d fallos (%d nuevos + %d expirados), %d sin datos"
+          % (user_stats['hits'], user_stats['misses'] + user_stats['expired'], user_stats['misses'],
+             user_stats['expired'], user_stats['failed']))
     for name, data in sorted(output['chatters'].items(), key=lambda x: x[1]['total_hours'], reverse=True)[:15]:
         print("  %-25s %6.1fh (%s)" % (name[:25], data['total_hours'], data['hubstaff_name'][:25]))
 
@@ -268,4 +520,19 @@ def main(start_date='2026-02-01', end_date='2026-02-13'):
 
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Sincroniza horas trabajadas desde Hubstaff.')
+    parser.add_argument('--start', default='2026-02-01', help='fecha inicial (YYYY-MM-DD)')
+    parser.add_argument('--end', default='2026-02-13', help='fecha final (YYYY-MM-DD)')
+    parser.add_argument('--concurrency', type=int, default=MAX_CONCURRENCY,
+                        help='peticiones simultaneas a la API de usuarios (por defecto: %d)' % MAX_CONCURRENCY)
+    parser.add_argument('--users-ttl-days', type=float, default=USER_CACHE_TTL_DAYS,
+                        help='dias que se reutiliza un usuario de la cache (0 = refrescar todos)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='descargar solo dias faltantes o abiertos (hoy/ayer) y reutilizar el resto del store local')
+    parser.add_argument('--shard-days', type=int, default=SHARD_DAYS,
+                        help='dias por ventana de actividades descargada en paralelo (0 = una sola paginacion)')
+    parser.add_argument('--shard-concurrency', type=int, default=SHARD_CONCURRENCY,
+                        help='ventanas de actividades descargadas a la vez (por defecto: %d)' % SHARD_CONCURRENCY)
+    args = parser.parse_args()
+    main(args.start, args.end, concurrency=args.concurrency, users_ttl_days=args.users_ttl_days,
+         incremental=args.incremental, shard_days=args.shard_days, shard_concurrency=args.shard_concurrency)
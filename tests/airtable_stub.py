@@ -0,0 +1,98 @@
+"""Local Airtable API for the sync_airtable tests.
+
+A ThreadingHTTPServer on 127.0.0.1 serves the table endpoint from a plain
+state dict. It evaluates the two filterByFormula forms the sync sends
+(the Live filter, alone or AND-ed with IS_AFTER(LAST_MODIFIED_TIME(), ...)),
+projects fields[], pages with offset, and records every request and how many
+records it returned.
+"""
+
+import json
+import re
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PAT = 'stub-pat'
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%S.000Z'
+FIELD_EQUALS = re.compile(r"^\{([^}]+)\}='([^']*)'$")
+MODIFIED_AFTER = re.compile(r"^AND\((.+), IS_AFTER\(LAST_MODIFIED_TIME\(\), '([^']+)'\)\)$")
+
+
+def new_state(records=()):
+    return {
+        'records': list(records),  # {'id', 'fields', 'modified'}; 'modified' is LAST_MODIFIED_TIME()
+        'page_size': 100,
+        'requests': [],            # (query, records returned) of every table request
+    }
+
+
+def record(rid, name, tipo, estado='Live', modified='2026-01-01T00:00:00.000Z'):
+    return {'id': rid, 'fields': {'Nombre Artístico': name, 'Tipo de Página': tipo, 'Estado': estado},
+            'modified': modified}
+
+
+def now():
+    return datetime.now(timezone.utc).strftime(TIME_FORMAT)
+
+
+def formula_filter(formula):
+    """Predicate on stub records for `formula`, or None if the stub does not support it."""
+    after = MODIFIED_AFTER.match(formula)
+    if after:
+        inner = formula_filter(after.group(1))
+        since = datetime.strptime(after.group(2), TIME_FORMAT)
+        return inner and (lambda r: inner(r) and datetime.strptime(r['modified'], TIME_FORMAT) > since)
+    equals = FIELD_EQUALS.match(formula)
+    if equals:
+        field, value = equals.groups()
+        return lambda r: r['fields'].get(field) == value
+    return None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, code, obj):
+        body = json.dumps(obj).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        if self.headers.get('Authorization') != 'Bearer ' + PAT:
+            return self.reply(401, {'error': 'AUTHENTICATION_REQUIRED'})
+        query = parse_qs(urlparse(self.path).query)
+        formula = query.get('filterByFormula', [None])[0]
+        keep = formula_filter(formula) if formula else (lambda r: True)
+        if keep is None:
+            return self.reply(422, {'error': {'type': 'INVALID_FILTER_BY_FORMULA'}})
+        rows = [r for r in state['records'] if keep(r)]
+        start = int(query.get('offset', ['0'])[0])
+        page = rows[start:start + state['page_size']]
+        fields = query.get('fields[]')
+        out = {'records': [{'id': r['id'], 'createdTime': '2026-01-01T00:00:00.000Z',
+                            'fields': {k: v for k, v in r['fields'].items() if fields is None or k in fields}}
+                           for r in page]}
+        if start + state['page_size'] < len(rows):
+            out['offset'] = str(start + state['page_size'])
+        with self.server.lock:
+            state['requests'].append((query, len(page)))
+        self.reply(200, out)
+
+
+def serve(state):
+    """Start the stub in a background thread; returns (server, base URL)."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.state, server.lock = state, threading.Lock()
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    return server, 'http://127.0.0.1:%d' % server.server_port
@@ -0,0 +1,50 @@
+import os
+import sys
+import types
+
+import pytest
+
+# The scripts live at the repository root, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def hubstaff(monkeypatch, tmp_path):
+    """sync_hubstaff pointed at a local Hubstaff stub, with its files under tmp_path.
+    Yields the stub state (see hubstaff_stub.new_state); retry waits are recorded
+    in state['sleeps'] instead of slept.
+    """
+    import hubstaff_stub
+    import sync_hubstaff
+
+    state = hubstaff_stub.new_state()
+    state['sleeps'] = []
+    server, base = hubstaff_stub.serve(state)
+    monkeypatch.setattr(sync_hubstaff, 'API_BASE', base + '/v2')
+    monkeypatch.setattr(sync_hubstaff, 'ACCOUNT_BASE', base)
+    monkeypatch.setattr(sync_hubstaff, 'time', types.SimpleNamespace(sleep=state['sleeps'].append))
+    for name in ('TOKEN_PATH', 'OUTPUT_PATH', 'USER_CACHE_PATH', 'ACTIVITY_STORE_PATH'):
+        monkeypatch.setattr(sync_hubstaff, name, str(tmp_path / (name.lower() + '.json')))
+    monkeypatch.setenv('HUBSTAFF_REFRESH_TOKEN', 'stub-refresh-token')
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def airtable(monkeypatch, tmp_path):
+    """sync_airtable pointed at a local Airtable stub, with its files under tmp_path.
+    Yields the stub state (see airtable_stub.new_state).
+    """
+    import airtable_stub
+    import sync_airtable
+
+    state = airtable_stub.new_state()
+    server, base = airtable_stub.serve(state)
+    monkeypatch.setattr(sync_airtable, 'API_BASE', base + '/v0')
+    monkeypatch.setattr(sync_airtable, 'OUTPUT_PATH', str(tmp_path / 'airtable_model_types.json'))
+    monkeypatch.setattr(sync_airtable, 'RECORD_CACHE_PATH', str(tmp_path / 'airtable_records_cache.json'))
+    monkeypatch.setenv('AIRTABLE_PAT', airtable_stub.PAT)
+    yield state
+    server.shutdown()
+    server.server_close()
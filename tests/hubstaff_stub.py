@@ -0,0 +1,119 @@
+"""Local Hubstaff API for the sync_hubstaff tests.
+
+A ThreadingHTTPServer on 127.0.0.1 serves the endpoints the sync uses from a
+plain state dict, and records every API request so tests can check what was
+fetched, how often and how many requests were in flight at once.
+"""
+
+import json
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ACCESS_TOKEN = 'stub-access-token'
+
+
+def new_state(users=(), activities=()):
+    return {
+        'users': {u['id']: u for u in users},   # /v2/users/{id}; every user is an active member
+        'activities': list(activities),          # /activities/daily rows, filtered by 'date'
+        'page_limit': None,                      # overrides the client's page_limit when set
+        'overlap_days': 0,                       # activities windows also return this many days around them
+        'latency': 0,                            # seconds per API request
+        'throttle': 0,                           # the next N API requests get a 429
+        'retry_after': '0',                      # Retry-After header of those 429s (None = no header)
+        'requests': [],                          # (path, query) of every API request, in arrival order
+        'in_flight': 0,
+        'max_in_flight': 0,
+    }
+
+
+def shift_day(day, days):
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body are separate writes on a keep-alive connection
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, code, obj, headers=()):
+        body = json.dumps(obj).encode('utf-8')
+        self.send_response(code)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.reply(200, {'access_token': ACCESS_TOKEN, 'refresh_token': 'stub-refresh-token'})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.endswith('/openid-configuration'):
+            return self.reply(200, {'token_endpoint': 'http://127.0.0.1:%d/token' % self.server.server_port})
+        state, lock = self.server.state, self.server.lock
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with lock:
+            state['requests'].append((url.path, query))
+            state['in_flight'] += 1
+            state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+            throttled = state['throttle'] > 0
+            if throttled:
+                state['throttle'] -= 1
+        try:
+            time.sleep(state['latency'])
+            if throttled:
+                headers = [('Retry-After', state['retry_after'])] if state['retry_after'] is not None else []
+                return self.reply(429, {'error': 'rate limited'}, headers)
+            if self.headers.get('Authorization') != 'Bearer ' + ACCESS_TOKEN:
+                return self.reply(401, {'error': 'unauthorized'})
+            return self.api(url.path, query)
+        finally:
+            with lock:
+                state['in_flight'] -= 1
+
+    def api(self, path, query):
+        state = self.server.state
+        if path.startswith('/v2/users/'):
+            user = state['users'].get(int(path.rsplit('/', 1)[1]))
+            return self.reply(200, {'user': user}) if user else self.reply(404, {'error': 'not found'})
+        if path.endswith('/members'):
+            rows = [{'user_id': uid, 'membership_status': 'active'} for uid in sorted(state['users'])]
+            return self.page(rows, query, 'members')
+        if path.endswith('/activities/daily'):
+            first = shift_day(query['date[start]'], -state['overlap_days'])
+            last = shift_day(query['date[stop]'], state['overlap_days'])
+            rows = [a for a in state['activities'] if first <= a['date'] <= last]
+            return self.page(rows, query, 'daily_activities')
+        self.reply(404, {'error': 'not found'})
+
+    def page(self, rows, query, name):
+        """One page of `rows`; page_start_id is the position of the first row."""
+        start = int(query.get('page_start_id', 0))
+        limit = self.server.state['page_limit'] or int(query['page_limit'])
+        end = start + limit
+        pagination = {'next_page_start_id': end} if end < len(rows) else {}
+        self.reply(200, {name: rows[start:end], 'pagination': pagination})
+
+
+def authorize(session):
+    """`session` with the header sync_hubstaff.main() sets after the token exchange."""
+    session.headers['Authorization'] = 'Bearer ' + ACCESS_TOKEN
+    return session
+
+
+def serve(state):
+    """Start the stub in a background thread; returns (server, base URL)."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.state, server.lock = state, threading.Lock()
+    threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    return server, 'http://127.0.0.1:%d' % server.server_port
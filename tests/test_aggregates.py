@@ -0,0 +1,225 @@
+"""Folding sources file by file (--incremental) gives the aggregates of one full fold."""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import process_data as pdata
+
+N = 240
+
+
+def raw_messages(rng, n):
+    return pd.DataFrame({
+        'Sender': rng.choice(['Ana', 'Luis', 'Eva'], n),
+        'Creator': rng.choice(['Model A', 'Model B'], n),
+        'Sent time': rng.choice(['03:15:00', '09:00:00', '17:30:00', '23:59:59', ''], n),
+        'Sent date': rng.choice(['2026-02-01', '2026-02-02', '2026-02-03'], n),
+        'Price': rng.choice([0, 5, 12.5], n),
+        'Source': 'Chat',
+        'Purchased': rng.choice(['Yes', 'No'], n),
+        'Replay time': rng.choice(['45s', '2m 10s', '6m', '1h 2m 3s', '-'], n),
+        'Sent to': rng.choice(['fan%d' % i for i in range(40)], n),
+    })
+
+
+def breakdown(rng, n):
+    employees = rng.choice(['Ana', 'Luis', None], n)
+    groups = rng.choice(['G1', 'G2', None], n)
+    df = pd.DataFrame({
+        'Creators': rng.choice(['Model A', 'Model B', 'Model B(delete)'], n),
+        'Employees': employees,
+        'Emp_key': pd.Series(employees, dtype=object).astype(str).str.strip(),
+        'Group': groups,
+        'Group_str': [g if g else '' for g in groups],
+        'Day': rng.choice(pd.date_range('2026-02-01', periods=5).date, n),
+        'Resp_seconds': rng.choice([30.0, 95.0, np.nan], n),
+    })
+    for col in ['Sales_num', 'Sales_per_hour']:
+        df[col] = rng.integers(0, 20000, n) / 100
+    for col in ['Msgs_sent', 'PPVs_sent', 'PPVs_unlocked', 'Fans_chatted', 'Fans_spent', 'Char_count', 'Clocked_min']:
+        df[col] = rng.integers(0, 50, n)
+    return df
+
+
+def sales(rng, n):
+    net = rng.integers(-500, 5000, n) / 100
+    kind = rng.choice(['Messages', 'Subscription', 'Tips from chat'], n)
+    return pd.DataFrame({
+        'Date': rng.choice(pd.date_range('2026-02-01', periods=3).date, n),
+        'Creator': rng.choice(['Model A', 'Model B'], n),
+        'Employee': rng.choice(['Ana', 'Luis', None], n),
+        'Hour': pd.array(rng.choice([0, 9, 17, 23], n), dtype='Int8'),
+        'Status': rng.choice(['Paid', 'Reverse'], n),
+        'Net': net,
+        'Net_msg': np.where(kind == 'Messages', net, 0.0),
+        'Net_sub': np.where(kind == 'Subscription', net, 0.0),
+        'Net_tips': np.where(kind == 'Tips from chat', net, 0.0),
+    })
+
+
+def fold(agg, df_msg, df_db, df_sales):
+    pdata.fold_messages(agg, pdata.prepare_messages(df_msg.copy(), label=None))
+    pdata.fold_breakdown(agg, df_db)
+    pdata.fold_sales(agg, df_sales)
+    return agg
+
+
+@pytest.fixture(scope='module')
+def folds():
+    rng = np.random.default_rng(7)
+    frames = raw_messages(rng, N), breakdown(rng, N), sales(rng, N)
+    full = fold(pdata.empty_aggregates(), *frames)
+    parts = pdata.empty_aggregates()
+    for half in (slice(0, N // 3), slice(N // 3, N)):
+        fold(parts, *(df.iloc[half] for df in frames))
+    return full, parts, frames
+
+
+def assert_slices_equal(a, b):
+    assert sorted(a, key=str) == sorted(b, key=str)
+    for key in a:
+        assert a[key] == pytest.approx(b[key]), key
+
+
+@pytest.mark.parametrize('msg_keys, sales_keys', [
+    (['Hour'], None), (['DateStr'], ['Date']), (['DateStr', 'Hour'], ['Date', 'Hour']),
+    (['DateStr', 'Creator'], ['Date', 'Creator']), (['Shift'], None), (['Creator', 'Hour'], None),
+    (['Sender', 'Hour'], ['Employee', 'Hour']),
+])
+def test_slices_match_full_fold(folds, msg_keys, sales_keys):
+    full, parts, _ = folds
+    assert_slices_equal(pdata.build_slices(full, msg_keys, sales_keys), pdata.build_slices(parts, msg_keys, sales_keys))
+
+
+def test_fan_sets_match_full_fold(folds):
+    full, parts, _ = folds
+    assert len(full['fans']) == len(parts['fans'])
+    for keys in pdata.FAN_SLICES:
+        assert (pdata.fan_sets(full, keys, pdata.fan_codes(full['fans']))
+                == pdata.fan_sets(parts, keys, pdata.fan_codes(parts['fans'])))
+
+
+def test_slices_match_rows(folds):
+    full, _, (df_msg, _, df_sales) = folds
+    rows = pdata.prepare_messages(df_msg.copy(), label=None)
+    slices = pdata.build_slices(full, ['Creator', 'Hour'])
+    expected = rows.groupby(['Creator', 'Hour'], observed=True)['Fan_ID'].agg(['size', 'nunique'])
+    for key, (messages, fans) in expected.iterrows():
+        assert (slices[key]['messages'], slices[key]['fans_chatted']) == (messages, fans)
+    valid = df_sales[df_sales['Status'] != 'Reverse']
+    assert pdata.build_slices(full, ['Hour'])[17]['sales_net'] == pytest.approx(valid.loc[valid['Hour'] == 17, 'Net'].sum())
+
+
+def cube_frame(cube):
+    """Cube cells with their dimension values decoded."""
+    cells = pd.DataFrame(cube['cells'])
+    for key in ('date', 'model', 'chatter'):
+        cells[key] = np.array(cube['dims'][key], dtype=object)[cells[key]]
+    return cells
+
+
+# Cube dimension -> (message cell column, sales cell column)
+CUBE_COLUMNS = {'date': ('DateStr', 'Date'), 'model': ('Creator', 'Creator'), 'chatter': ('Sender', 'Employee')}
+
+
+@pytest.mark.parametrize('cube_keys', [['date'], ['date', 'model'], ['date', 'model', 'chatter']])
+def test_cube_matches_slices(folds, cube_keys):
+    full, _, _ = folds
+    slices = pdata.build_slices(full, [CUBE_COLUMNS[k][0] for k in cube_keys], [CUBE_COLUMNS[k][1] for k in cube_keys])
+    dates = sorted(set(full['msg_cells']['DateStr']) | set(full['sales_cells']['Date']))[1:]
+    sums = cube_frame(pdata.build_cube(full, dates)).groupby(cube_keys)[list(pdata.CUBE_MEASURE_DIGITS)].sum()
+    # Sales without an employee are the cube's '' chatter; build_slices drops them
+    if 'chatter' in cube_keys:
+        sums = sums[sums.index.get_level_values('chatter') != '']
+    expected = {key: row for key, row in slices.items() if (key[0] if len(cube_keys) > 1 else key) in dates}
+    assert len(sums) == len(expected)
+    for key, row in sums.iterrows():
+        key = (date.fromisoformat(key[0]),) + key[1:] if len(cube_keys) > 1 else date.fromisoformat(key)
+        for name in pdata.CUBE_MEASURE_DIGITS:
+            assert row[name] == pytest.approx(expected[key][name], abs=0.01), (key, name)
+
+
+@pytest.mark.parametrize('keys', ['Creators', 'Employees', ['Employees', 'Creators'], ['Creators', 'Emp_key']])
+def test_breakdown_rollup_matches_full_fold(folds, keys):
+    full, parts, _ = folds
+    a = pdata.rollup_breakdown(full['db_cells'], keys)
+    b = pdata.rollup_breakdown(parts['db_cells'], keys)
+    pd.testing.assert_frame_equal(a, b, check_dtype=False)
+
+
+def test_breakdown_rollup_matches_rows(folds):
+    full, _, (_, df_db, _) = folds
+    # Rows as drop_deleted_model_dupes() leaves them: "(delete)" models last
+    rows = pd.concat([df_db[~pdata.is_deleted_model(df_db['Creators'])], df_db[pdata.is_deleted_model(df_db['Creators'])]])
+    expected = rows.groupby('Employees', sort=False).agg(
+        sales=('Sales_num', 'sum'), rows=('Sales_num', 'size'), days_worked=('Day', 'nunique'),
+        resp_count=('Resp_seconds', 'count'), first_group=('Group_str', 'first'), group=('Group', 'first'))
+    got = pdata.rollup_breakdown(full['db_cells'], 'Employees')[expected.columns]
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False, check_names=False)
+
+
+def baseline_sums(df_db, keys):
+    """Float sums per `keys` added row by row, as the original per-chatter/per-model loops did."""
+    sums = {}
+    for _, r in df_db.iterrows():
+        key = tuple(r[k] for k in keys)
+        if any(pd.isna(k) for k in key):
+            continue
+        s = sums.setdefault(key[0] if len(keys) == 1 else key, {'sales': 0, 'sph_sum': 0, 'resp': []})
+        s['sales'] += float(r['Sales_num'])
+        s['sph_sum'] += float(r['Sales_per_hour'])
+        if pd.notna(r['Resp_seconds']):
+            s['resp'].append(float(r['Resp_seconds']))
+    return sums
+
+
+@pytest.mark.parametrize('keys', [['Employees', 'Creators'], ['Creators', 'Emp_key'], ['Employees'], ['Creators']])
+def test_breakdown_float_sums_match_baseline_exactly(keys):
+    # Many rows per cell, so summation order shows in the last bits (and in round(x, 2) ties)
+    rng = np.random.default_rng(11)
+    df_db = pdata.drop_deleted_model_dupes(breakdown(rng, 2000))
+    full = pdata.empty_aggregates()
+    pdata.fold_breakdown(full, df_db)
+    parts = pdata.empty_aggregates()
+    for half in (slice(0, 700), slice(700, None)):
+        pdata.fold_breakdown(parts, df_db.iloc[half])
+    expected = baseline_sums(df_db, keys)
+    for agg in (full, parts):
+        got = pdata.rollup_breakdown(agg['db_cells'], keys[0] if len(keys) == 1 else keys).to_dict('index')
+        assert sorted(got, key=str) == sorted(expected, key=str)
+        for key, s in expected.items():
+            assert got[key]['sales'] == s['sales'], key
+            assert got[key]['sph_sum'] == s['sph_sum'], key
+            assert got[key]['resp_sum'] == sum(s['resp']), key
+            assert round(got[key]['sph_sum'] / got[key]['rows'], 2) == round(s['sph_sum'] / got[key]['rows'], 2)
+
+
+def test_empty_breakdown_folds_to_no_cells():
+    # e.g. a --desde/--hasta range with no Detailed Breakdown days
+    agg = pdata.empty_aggregates()
+    pdata.fold_breakdown(agg, breakdown(np.random.default_rng(3), 10).iloc[:0])
+    assert len(agg['db_cells']) == 0
+    assert len(pdata.rollup_breakdown(agg['db_cells'], 'Creators')) == 0
+
+
+def test_replay_matches_rows(folds):
+    full, parts, (df_msg, _, _) = folds
+    assert pdata.rollup_replay(full, 'Sender') == pdata.rollup_replay(parts, 'Sender')
+    secs = pdata.prepare_messages(df_msg.copy(), label=None).groupby('Sender')['Replay_seconds']
+    for sender, stats in pdata.rollup_replay(full, 'Sender').items():
+        assert stats['mean'] == pytest.approx(secs.get_group(sender).mean())
+        assert stats['median'] == secs.get_group(sender).median()
+        assert stats['under_2m'] == (secs.get_group(sender) <= 120).sum()
+
+
+def test_refolding_ingested_rows_changes_nothing(folds):
+    _, _, (df_msg, _, _) = folds
+    rows = pdata.prepare_messages(df_msg.copy(), label=None).drop_duplicates(pdata.MSG_DEDUP_COLS)
+    seen = {}
+    assert len(pdata.drop_ingested(rows, pdata.MSG_DEDUP_COLS, seen, 'messages')) == len(rows)
+    assert len(pdata.drop_ingested(rows, pdata.MSG_DEDUP_COLS, seen, 'messages')) == 0
+    assert len(seen['messages']) == len(rows)
+    assert seen['messages'].dtype.itemsize == pdata.STATE_DIGEST_BYTES == 16  # see the bound at STATE_DIGEST_BYTES
@@ -0,0 +1,108 @@
+"""Airtable sync against the local stub: server-side Live filter and the LAST_MODIFIED_TIME record cache."""
+
+import json
+from datetime import datetime, timedelta
+
+import sync_airtable as at
+from airtable_stub import PAT, TIME_FORMAT, now, record
+
+RECORDS = [
+    record('rec1', 'Ana', 'Pago'),
+    record('rec2', 'Bea', 'Gratuita'),
+    record('rec3', 'Cris', 'Mixta'),
+    record('rec4', 'Dani', 'Pago', estado='Pausada'),
+    record('rec5', 'Eva', 'Free'),
+]
+
+
+def session():
+    return at.make_session(PAT)
+
+
+def names(records):
+    return sorted(r['fields']['Nombre Artístico'] for r in records)
+
+
+def test_live_filter_and_projection_are_server_side(airtable):
+    airtable.update(records=RECORDS, page_size=2)
+    records = at.fetch_airtable_models(session())
+    assert names(records) == ['Ana', 'Bea', 'Cris', 'Eva']
+    queries = [q for q, _ in airtable['requests']]
+    assert len(queries) == 2  # 4 Live records, pages of 2
+    assert all(q['filterByFormula'] == [at.LIVE_FORMULA] and q['fields[]'] == at.FIELDS for q in queries)
+    assert queries[1]['offset'] == ['2']
+
+
+def test_first_sync_downloads_and_caches(airtable):
+    airtable.update(records=RECORDS)
+    records = at.sync_live_records(session())
+    assert names(records) == ['Ana', 'Bea', 'Cris', 'Eva']
+    with open(at.RECORD_CACHE_PATH, encoding='utf-8') as f:
+        cache = json.load(f)
+    assert sorted(cache['records']) == ['rec1', 'rec2', 'rec3', 'rec5']
+    assert cache['fields'] == at.FIELDS
+
+
+def test_unchanged_rerun_only_lists_ids(airtable):
+    airtable.update(records=RECORDS)
+    first = at.sync_live_records(session())
+    with open(at.RECORD_CACHE_PATH, encoding='utf-8') as f:
+        synced_at = json.load(f)['synced_at']
+    airtable['requests'].clear()
+
+    assert at.sync_live_records(session()) == first
+    (ids_query, ids_count), (modified_query, modified_count) = airtable['requests']
+    assert ids_query['fields[]'] == ['Estado'] and ids_count == 4
+    since = datetime.strptime(synced_at, TIME_FORMAT) - timedelta(minutes=at.MODIFIED_MARGIN_MINUTES)
+    assert modified_query['filterByFormula'] == [
+        "AND(%s, IS_AFTER(LAST_MODIFIED_TIME(), '%s'))" % (at.LIVE_FORMULA, since.strftime(TIME_FORMAT))]
+    assert modified_count == 0
+
+
+def test_modified_records_are_merged_into_the_cache(airtable):
+    records = [dict(r, fields=dict(r['fields'])) for r in RECORDS]
+    airtable.update(records=records)
+    at.sync_live_records(session())
+
+    records[0]['fields']['Tipo de Página'] = 'Gratuita'      # edited
+    records[1]['fields']['Estado'] = 'Pausada'               # no longer Live
+    records[3]['fields']['Estado'] = 'Live'                  # Live again
+    for r in records[:2] + records[3:4]:
+        r['modified'] = now()
+    records.append(record('rec6', 'Flor', 'Pago', modified=now()))  # new
+    airtable['requests'].clear()
+
+    synced = at.sync_live_records(session())
+    assert names(synced) == ['Ana', 'Cris', 'Dani', 'Eva', 'Flor']
+    assert {r['id']: r['fields']['Tipo de Página'] for r in synced}['rec1'] == 'Gratuita'
+    assert airtable['requests'][1][1] == 3  # only the modified Live records are downloaded in full
+    assert at.classify_models(synced) == {'Ana': 'free', 'Cris': 'mixta', 'Dani': 'paid', 'Eva': 'free',
+                                          'Flor': 'paid'}
+
+
+def test_incomplete_cache_downloads_everything(airtable):
+    records = list(RECORDS)
+    airtable.update(records=records)
+    at.sync_live_records(session())
+    # Live but neither cached nor modified since the last sync (e.g. a cache from another machine)
+    records.append(record('rec7', 'Gala', 'Pago'))
+    airtable['requests'].clear()
+    assert 'Gala' in names(at.sync_live_records(session()))
+    assert len(airtable['requests']) == 3
+    assert airtable['requests'][-1][0]['fields[]'] == at.FIELDS
+
+
+def test_full_ignores_the_cache(airtable):
+    airtable.update(records=RECORDS)
+    at.sync_live_records(session())
+    airtable['requests'].clear()
+    at.sync_live_records(session(), use_cache=False)
+    assert [q['filterByFormula'] for q, _ in airtable['requests']] == [[at.LIVE_FORMULA]]
+
+
+def test_main_writes_model_types_once(airtable):
+    airtable.update(records=RECORDS)
+    assert at.main() is True
+    with open(at.OUTPUT_PATH, encoding='utf-8') as f:
+        assert json.load(f) == {'Ana': 'paid', 'Bea': 'free', 'Cris': 'mixta', 'Eva': 'free'}
+    assert at.main() is False
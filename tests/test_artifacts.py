@@ -0,0 +1,58 @@
+"""Content-hashed artifacts (--publish): stable names, reproducible gzip, manifest and pruning."""
+
+import gzip
+import hashlib
+import json
+import os
+
+import artifacts
+
+
+def write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return str(path)
+
+
+def test_hashed_copy_gzip_and_manifest(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, 'brotli', None)
+    path = write(tmp_path / 'dashboard_data.json', '{"daily": []}')
+    entry = artifacts.publish_artifact(path)
+    digest = hashlib.sha256(b'{"daily": []}').hexdigest()
+    assert entry == {'file': 'dashboard_data.%s.json' % digest[:artifacts.HASH_LENGTH], 'sha256': digest,
+                     'bytes': 13, 'gzip_bytes': os.path.getsize(tmp_path / (entry['file'] + '.gz'))}
+    hashed = tmp_path / entry['file']
+    assert hashed.read_bytes() == b'{"daily": []}'
+    gz = (tmp_path / (entry['file'] + '.gz')).read_bytes()
+    assert gzip.decompress(gz) == b'{"daily": []}'
+    assert gz[4:8] == b'\0\0\0\0'  # header mtime
+    assert not os.path.exists(str(hashed) + '.br')
+    with open(tmp_path / artifacts.MANIFEST_NAME, encoding='utf-8') as f:
+        assert json.load(f) == {'dashboard_data.json': entry}
+
+    # Same content again: same name and byte-identical gzip, even if rewritten
+    os.remove(str(hashed) + '.gz')
+    assert artifacts.publish_artifact(path) == entry
+    assert (tmp_path / (entry['file'] + '.gz')).read_bytes() == gz
+
+
+def test_manifest_keeps_other_artifacts(tmp_path):
+    data = artifacts.publish_artifact(write(tmp_path / 'dashboard_data.json', '1'))
+    cube = artifacts.publish_artifact(write(tmp_path / 'dashboard_cube.json', '2'))
+    with open(tmp_path / artifacts.MANIFEST_NAME, encoding='utf-8') as f:
+        assert json.load(f) == {'dashboard_data.json': data, 'dashboard_cube.json': cube}
+
+
+def test_older_versions_are_pruned(tmp_path):
+    path = str(tmp_path / 'dashboard_data.json')
+    files = []
+    for i in range(4):
+        files.append(artifacts.publish_artifact(write(path, 'version %d' % i))['file'])
+        os.utime(tmp_path / files[-1], (1000 + i, 1000 + i))  # distinct mtimes, oldest first
+    # Republishing an old version makes it the newest again
+    artifacts.publish_artifact(write(path, 'version 1'))
+    kept = sorted(f for f in os.listdir(tmp_path) if f != 'dashboard_data.json' and f != artifacts.MANIFEST_NAME)
+    expected = [f + suffix for f in (files[3], files[1])
+                for suffix in ('', '.gz') + (('.br',) if artifacts.brotli else ())]
+    assert kept == sorted(expected)
+    assert artifacts.KEEP_VERSIONS == 2
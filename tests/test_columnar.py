@@ -0,0 +1,55 @@
+"""Columnar dashboard_data.json (--format columnar) decodes to the row format."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+import process_data as pdata
+from columnar import COLUMNAR_FORMAT, COLUMNAR_VERSION, TABLE_KEY, decode_dashboard, encode_dashboard
+from test_aggregates import breakdown, raw_messages, sales
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_dashboard(monkeypatch, path, output_format):
+    rng = np.random.default_rng(13)
+    frames = pdata.prepare_messages(raw_messages(rng, 200), label=None), breakdown(rng, 200), sales(rng, 200), [], []
+    monkeypatch.setattr(pdata, 'load_sources', lambda *args, **kwargs: frames)
+    path.parent.mkdir()
+    monkeypatch.setattr(pdata, 'OUTPUT_PATH', str(path))
+    monkeypatch.setattr(pdata, 'AIRTABLE_TYPES_PATH', os.path.join(REPO, 'airtable_model_types.json'))
+    pdata.main(use_cache=False, output_format=output_format)
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    data['generated_at'] = None
+    return data
+
+
+def test_columnar_output_decodes_to_the_row_output(monkeypatch, tmp_path):
+    rows = write_dashboard(monkeypatch, tmp_path / 'rows' / 'dashboard_data.json', 'rows')
+    columnar = write_dashboard(monkeypatch, tmp_path / 'columnar' / 'dashboard_data.json', 'columnar')
+    assert columnar['format'] == {'name': COLUMNAR_FORMAT, 'version': COLUMNAR_VERSION}
+    assert TABLE_KEY in columnar['daily'] and TABLE_KEY in columnar['models']
+    decoded = decode_dashboard(columnar)
+    assert decoded == rows
+    assert json.dumps(decoded) == json.dumps(rows)  # key order too
+    assert decode_dashboard(rows) is rows  # row files pass through
+
+
+def test_tables_with_different_keys_stay_lists():
+    data = {'a': [{'x': 1, 'y': 2}, {'y': 2, 'x': 1}], 'b': [{'x': 1}, 2], 'c': []}
+    encoded = encode_dashboard(data)
+    assert {k: encoded[k] for k in data} == data
+    assert decode_dashboard(encoded) == data
+
+
+@pytest.mark.parametrize('header', [
+    {'name': COLUMNAR_FORMAT, 'version': COLUMNAR_VERSION + 1},
+    {'name': 'parquet', 'version': 1},
+])
+def test_unsupported_format_is_rejected(header):
+    payload = dict(encode_dashboard({'daily': [{'date': '2026-02-01'}]}), format=header)
+    with pytest.raises(ValueError, match='no soportado'):
+        decode_dashboard(payload)
@@ -0,0 +1,81 @@
+"""Pooled Hubstaff client: retries, Retry-After and concurrent user lookups against the local stub."""
+
+import json
+
+import sync_hubstaff as hub
+from hubstaff_stub import authorize
+
+USERS = [{'id': 100 + i, 'name': 'User %d' % i, 'email': 'u%d@example.com' % i} for i in range(24)]
+
+
+def users_url(uid=100):
+    return '%s/users/%d' % (hub.API_BASE, uid)
+
+
+def test_retries_429_after_retry_after(hubstaff):
+    hubstaff['users'] = {u['id']: u for u in USERS}
+    hubstaff.update(throttle=2, retry_after='1.5')
+    resp = hub.api_request(authorize(hub.make_session()), 'GET', users_url())
+    assert resp.status_code == 200
+    assert resp.json()['user']['name'] == 'User 0'
+    assert len(hubstaff['requests']) == 3
+    assert hubstaff['sleeps'] == [1.5, 1.5]
+
+
+def test_backoff_without_retry_after(hubstaff):
+    hubstaff['users'] = {u['id']: u for u in USERS}
+    hubstaff.update(throttle=3, retry_after=None)
+    assert hub.api_request(authorize(hub.make_session()), 'GET', users_url()).status_code == 200
+    assert hubstaff['sleeps'] == [1, 2, 4]
+
+
+def test_retry_after_is_capped(hubstaff):
+    hubstaff['users'] = {u['id']: u for u in USERS}
+    hubstaff.update(throttle=1, retry_after='3600')
+    assert hub.api_request(authorize(hub.make_session()), 'GET', users_url()).status_code == 200
+    assert hubstaff['sleeps'] == [hub.MAX_RETRY_DELAY]
+
+
+def test_gives_up_after_max_retries(hubstaff):
+    hubstaff.update(throttle=100)
+    assert hub.api_request(authorize(hub.make_session()), 'GET', users_url()).status_code == 429
+    assert len(hubstaff['requests']) == hub.MAX_RETRIES + 1
+    assert len(hubstaff['sleeps']) == hub.MAX_RETRIES
+
+
+def test_user_details_are_fetched_concurrently(hubstaff):
+    hubstaff['users'] = {u['id']: u for u in USERS}
+    hubstaff.update(latency=0.05, throttle=3)
+    ids = [u['id'] for u in USERS] + [999]  # 999 is not a Hubstaff user
+    details = hub.get_user_details(authorize(hub.make_session(8)), ids, concurrency=8)
+    assert details == {u['id']: {'name': u['name'], 'email': u['email']} for u in USERS}
+    assert 1 < hubstaff['max_in_flight'] <= 8
+
+
+def test_user_cache_skips_fresh_users(hubstaff):
+    hubstaff['users'] = {u['id']: u for u in USERS}
+    ids = [u['id'] for u in USERS]
+    session = authorize(hub.make_session())
+    users, stats = hub.get_users_cached(session, ids)
+    assert stats == {'hits': 0, 'misses': len(ids), 'expired': 0, 'failed': 0}
+    requests_before = len(hubstaff['requests'])
+    again, stats = hub.get_users_cached(session, ids)
+    assert again == users
+    assert stats['hits'] == len(ids)
+    assert len(hubstaff['requests']) == requests_before
+
+
+def test_main_writes_hours_per_chatter(hubstaff):
+    hubstaff['users'] = {u['id']: u for u in USERS[:2]}
+    hubstaff['activities'] = [
+        {'id': 1, 'user_id': 100, 'date': '2026-02-01', 'project_id': 1, 'tracked': 3600},
+        {'id': 2, 'user_id': 100, 'date': '2026-02-02', 'project_id': 1, 'tracked': 1800},
+        {'id': 3, 'user_id': 101, 'date': '2026-02-02', 'project_id': 2, 'tracked': 600},
+    ]
+    hubstaff.update(throttle=1)
+    hub.main('2026-02-01', '2026-02-02')
+    with open(hub.OUTPUT_PATH, encoding='utf-8') as f:
+        chatters = json.load(f)['chatters']
+    assert chatters['User 0']['total_minutes'] == 90
+    assert chatters['User 0']['daily_minutes'] == {'2026-02-01': 60, '2026-02-02': 30}
+    assert chatters['User 1']['total_hours'] == round(600 / 3600, 2)
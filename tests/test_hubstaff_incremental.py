@@ -0,0 +1,127 @@
+"""Incremental Hubstaff activity sync: per-day store, watermark and OPEN_DAYS, against the local stub."""
+
+import json
+from datetime import date
+
+import pytest
+
+import sync_hubstaff as hub
+from hubstaff_stub import authorize
+
+USERS = [{'id': 100, 'name': 'User 0', 'email': ''}, {'id': 101, 'name': 'User 1', 'email': ''}]
+
+
+def activities(days, tracked=600):
+    rows = []
+    for day in days:
+        for uid in (100, 101):
+            rows.append({'id': len(rows) + 1, 'user_id': uid, 'date': day, 'project_id': 1, 'tracked': tracked})
+    return rows
+
+
+def today_is(monkeypatch, day):
+    monkeypatch.setattr(hub, 'local_today', lambda: date.fromisoformat(day))
+
+
+def fetched_windows(state):
+    return [(q['date[start]'], q['date[stop]']) for path, q in state['requests'] if path.endswith('/activities/daily')]
+
+
+def sync(start, end):
+    return hub.sync_activity_store(authorize(hub.make_session()), start, end, shard_days=0)
+
+
+def test_first_sync_fetches_everything_and_sets_watermark(hubstaff, monkeypatch):
+    hubstaff['activities'] = activities(hub.date_range('2026-02-01', '2026-02-05'))
+    today_is(monkeypatch, '2026-02-05')
+    acts, fetched, reused = sync('2026-02-01', '2026-02-05')
+    assert (len(acts), fetched, reused) == (10, 5, 0)
+    assert fetched_windows(hubstaff) == [('2026-02-01', '2026-02-05')]
+    store = hub.load_activity_store()
+    # OPEN_DAYS = 2: today and yesterday are not final yet
+    assert store['watermark'] == '2026-02-03'
+    assert [d for d, v in sorted(store['days'].items()) if not v['final']] == ['2026-02-04', '2026-02-05']
+
+
+def test_rerun_only_fetches_open_days(hubstaff, monkeypatch):
+    hubstaff['activities'] = activities(hub.date_range('2026-02-01', '2026-02-05'))
+    today_is(monkeypatch, '2026-02-05')
+    sync('2026-02-01', '2026-02-05')
+    hubstaff['requests'].clear()
+    # Final days are not fetched again; open ones pick up newly tracked time
+    hubstaff['activities'] = activities(hub.date_range('2026-02-01', '2026-02-05'), tracked=900)
+    acts, fetched, reused = sync('2026-02-01', '2026-02-05')
+    assert (fetched, reused) == (2, 3)
+    assert fetched_windows(hubstaff) == [('2026-02-04', '2026-02-05')]
+    tracked = {(a['user_id'], a['date']): a['tracked'] for a in acts}
+    assert tracked[(100, '2026-02-03')] == 600
+    assert tracked[(100, '2026-02-05')] == 900
+
+
+def test_next_day_finalizes_and_fetches_missing_days(hubstaff, monkeypatch):
+    hubstaff['activities'] = activities(hub.date_range('2026-02-01', '2026-02-07'))
+    today_is(monkeypatch, '2026-02-05')
+    sync('2026-02-01', '2026-02-05')
+    hubstaff['requests'].clear()
+    today_is(monkeypatch, '2026-02-07')
+    acts, fetched, reused = sync('2026-02-01', '2026-02-07')
+    assert (len(acts), fetched, reused) == (14, 4, 3)
+    assert fetched_windows(hubstaff) == [('2026-02-04', '2026-02-07')]
+    assert hub.load_activity_store()['watermark'] == '2026-02-05'
+
+
+def test_gap_stops_the_watermark(hubstaff, monkeypatch):
+    hubstaff['activities'] = activities(['2026-02-01', '2026-02-02', '2026-02-04'])
+    today_is(monkeypatch, '2026-02-20')
+    sync('2026-02-01', '2026-02-02')
+    sync('2026-02-04', '2026-02-04')
+    store = hub.load_activity_store()
+    assert store['watermark'] == '2026-02-02'
+    # Days past the watermark that are stored and final are still reused
+    hubstaff['requests'].clear()
+    _, fetched, reused = sync('2026-02-01', '2026-02-04')
+    assert (fetched, reused) == (1, 3)
+    assert fetched_windows(hubstaff) == [('2026-02-03', '2026-02-03')]
+    assert hub.load_activity_store()['watermark'] == '2026-02-04'
+
+
+def test_range_before_the_first_stored_day(hubstaff, monkeypatch):
+    hubstaff['activities'] = activities(hub.date_range('2026-02-01', '2026-02-13'))
+    today_is(monkeypatch, '2026-02-20')
+    sync('2026-02-10', '2026-02-13')
+    hubstaff['requests'].clear()
+    # Days before the first stored one sort below the watermark but were never fetched
+    acts, fetched, reused = sync('2026-02-01', '2026-02-13')
+    assert (len(acts), fetched, reused) == (26, 9, 4)
+    assert fetched_windows(hubstaff) == [('2026-02-01', '2026-02-09')]
+    assert hub.load_activity_store()['watermark'] == '2026-02-13'
+
+
+def test_api_error_leaves_the_store_untouched(hubstaff, monkeypatch):
+    hubstaff['activities'] = activities(hub.date_range('2026-02-01', '2026-02-03'))
+    today_is(monkeypatch, '2026-02-10')
+    sync('2026-02-01', '2026-02-02')
+    with open(hub.ACTIVITY_STORE_PATH, encoding='utf-8') as f:
+        before = f.read()
+    hubstaff.update(throttle=100)
+    # A failed window must not be stored as days without activity
+    with pytest.raises(RuntimeError):
+        sync('2026-02-01', '2026-02-03')
+    with open(hub.ACTIVITY_STORE_PATH, encoding='utf-8') as f:
+        assert f.read() == before
+
+
+def test_incremental_main_matches_full_main(hubstaff, monkeypatch):
+    hubstaff['users'] = {u['id']: u for u in USERS}
+    hubstaff['activities'] = activities(hub.date_range('2026-02-01', '2026-02-05'))
+    today_is(monkeypatch, '2026-02-05')
+
+    def hours(**kwargs):
+        hub.main('2026-02-01', '2026-02-05', **kwargs)
+        with open(hub.OUTPUT_PATH, encoding='utf-8') as f:
+            return json.load(f)['chatters']
+
+    full = hours()
+    assert hours(incremental=True) == full
+    hubstaff['activities'][-1]['tracked'] += 60  # more time tracked today
+    assert hours(incremental=True) == hours()
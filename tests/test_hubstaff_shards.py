@@ -0,0 +1,70 @@
+"""Sharded daily-activities fetch: equal to the serial walk, deduplicated, concurrent; against the local stub."""
+
+import pytest
+
+import sync_hubstaff as hub
+from hubstaff_stub import authorize
+
+DAYS = hub.date_range('2026-02-01', '2026-02-10')
+
+
+def activities(with_ids=True):
+    rows = []
+    for day in DAYS:
+        for uid in (100, 101, 102):
+            for project in (1, 2):
+                rows.append({'user_id': uid, 'date': day, 'project_id': project, 'task_id': None,
+                             'tracked': 60 * (len(rows) + 1)})
+    if with_ids:
+        for i, row in enumerate(rows):
+            row['id'] = i + 1
+    return rows
+
+
+def keys(acts):
+    return sorted(hub.activity_key(a) for a in acts)
+
+
+def fetch(shard_days, concurrency=hub.SHARD_CONCURRENCY):
+    return hub.get_daily_activities_sharded(authorize(hub.make_session(concurrency)), DAYS[0], DAYS[-1],
+                                            shard_days, concurrency)
+
+
+@pytest.mark.parametrize('shard_days', [1, 3, 7, 30])
+def test_sharded_equals_serial(hubstaff, shard_days):
+    hubstaff.update(activities=activities(), page_limit=4)  # several pages per window
+    serial = fetch(0)
+    assert len(serial) == len(hubstaff['activities'])
+    sharded = fetch(shard_days)
+    assert keys(sharded) == keys(serial)
+    # Windows are merged in date order
+    assert [a['date'] for a in sharded] == sorted(a['date'] for a in sharded)
+
+
+@pytest.mark.parametrize('with_ids', [True, False])
+def test_overlapping_windows_are_deduplicated(hubstaff, with_ids):
+    # Windows that also return their neighbouring days (e.g. a timezone shift)
+    hubstaff.update(activities=activities(with_ids), page_limit=5, overlap_days=1)
+    sharded = fetch(2)
+    assert len(keys(sharded)) == len(set(keys(sharded)))
+    assert keys(sharded) == keys(activities(with_ids))
+
+
+def test_windows_are_paginated_concurrently(hubstaff):
+    hubstaff.update(activities=activities(), latency=0.02)
+    fetch(1, concurrency=4)
+    assert hubstaff['max_in_flight'] == 4
+    windows = {(q['date[start]'], q['date[stop]']) for path, q in hubstaff['requests']}
+    assert windows == {(day, day) for day in DAYS}
+
+
+def test_concurrency_one_is_serial(hubstaff):
+    hubstaff.update(activities=activities(), latency=0.01)
+    fetch(1, concurrency=1)
+    assert hubstaff['max_in_flight'] == 1
+
+
+def test_throttled_windows_are_retried(hubstaff):
+    hubstaff.update(activities=activities(), throttle=3)
+    assert keys(fetch(2)) == keys(hubstaff['activities'])
+    assert len(hubstaff['sleeps']) == 3
@@ -0,0 +1,51 @@
+"""Name index: normalized lookups, substring hits and ambiguous names."""
+
+from name_index import build_name_index, normalize_name, resolve_name
+
+TYPES = {
+    'Albert Arapé': 'paid',
+    'Sharon': 'free',
+    'Clara Ortega': 'mixta',
+    'Lara': 'paid',
+    'Mia Rose': 'paid',
+    'Mia Rosé': 'free',
+    'Ana Sofia': 'free',
+    'Ana Luz': 'paid',
+}
+
+
+def test_normalize_name():
+    assert normalize_name('  Albert  \tArapé ') == 'albert arape'
+    assert normalize_name('SHARON ') == 'sharon'
+    assert normalize_name(' ') == ''
+
+
+def test_accents_case_and_whitespace():
+    index = build_name_index(TYPES)
+    assert resolve_name(index, 'Albert  Arape') == ('Albert Arapé', ['Albert Arapé'])
+    assert resolve_name(index, 'Sharon ') == ('Sharon', ['Sharon'])
+    assert resolve_name(index, 'sharon') == ('Sharon', ['Sharon'])
+    assert resolve_name(index, 'Sharon') == ('Sharon', ['Sharon'])  # exact key
+
+
+def test_substring_hits_need_substring_mode():
+    index = build_name_index(TYPES, substrings=True)
+    assert resolve_name(index, 'Albert') == (None, [])
+    assert resolve_name(index, 'Albert', substring=True) == ('Albert Arapé', ['Albert Arapé'])  # key contains name
+    assert resolve_name(index, 'Sharon VIP', substring=True) == ('Sharon', ['Sharon'])  # name contains key
+    # The longest shared text wins: "Clara Ortega", not "Lara"
+    assert resolve_name(index, 'Clara Ortega x', substring=True) == ('Clara Ortega', ['Clara Ortega'])
+
+
+def test_ambiguous_names_return_candidates():
+    index = build_name_index(TYPES, substrings=True)
+    # Same normalized name, different values
+    assert resolve_name(index, 'mia rose') == (None, ['Mia Rose', 'Mia Rosé'])
+    # Contained in two keys with different values; candidates keep the file order
+    assert resolve_name(index, 'Ana', substring=True) == (None, ['Ana Sofia', 'Ana Luz'])
+
+
+def test_candidates_with_one_value_resolve_to_the_first_key():
+    index = build_name_index({'Eva Luna': 'paid', 'eva  luna': 'paid', 'Eva Lunar': 'paid'}, substrings=True)
+    assert resolve_name(index, 'EVA LUNA ') == ('Eva Luna', ['Eva Luna', 'eva  luna'])
+    assert resolve_name(index, 'Eva', substring=True) == ('Eva Luna', ['Eva Luna', 'eva  luna', 'Eva Lunar'])
@@ -0,0 +1,73 @@
+"""Parity of the vectorized column parsers with the scalar functions they replace."""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import process_data as pdata
+
+MONEY = ['$1,234.50', '-$5.00', '$0.00', '12', ' $3.10 ', '', '-', np.nan, 7.5, 0, '0']
+PCT = ['12.5%', '0%', '1,000%', '-3%', '', '-', np.nan, 3.2, 0]
+REPLAY = ['1h 2m 3s', '5m 10s', '45s', '0s', '3min', '2h', 'abc', '', '-', ' - ', '   ', np.nan, 12]
+HOURS_MINUTES = ['7h 3min', '1h 0min', '45min', '2h', '0min', ' 0min ', '', '-', np.nan, 0, 5]
+SENT_TIME = ['03:15:00', '23:59', '00:00:00', '7:05', datetime.time(7, 1), '', 'x', np.nan]
+
+
+def scalar_hour(x):
+    """Hour extraction of prepare_messages() before it was vectorized."""
+    return int(str(x).split(':')[0]) if x and ':' in str(x) else None
+
+
+def assert_same(vectorized, expected):
+    """Element-wise equality where None/NaN on both sides also match."""
+    got = pd.Series(vectorized, dtype='float64').reset_index(drop=True)
+    want = pd.Series(expected, dtype='float64').reset_index(drop=True)
+    assert len(got) == len(want)
+    mismatch = ~((got == want) | (got.isna() & want.isna()))
+    assert not mismatch.any(), pd.DataFrame({'got': got, 'want': want})[mismatch]
+
+
+def shift_names(shifts):
+    # Missing shifts are None in an object column, NaN once pandas infers a str dtype
+    return [None if pd.isna(v) else v for v in shifts]
+
+
+@pytest.mark.parametrize('values, vectorized, scalar', [
+    (MONEY, pdata.parse_dollar_series, pdata.parse_dollar),
+    (PCT, pdata.parse_pct_series, pdata.parse_pct),
+    (REPLAY, pdata.parse_replay_seconds_series, pdata.parse_replay_seconds),
+    (HOURS_MINUTES, pdata.parse_hours_minutes_series, pdata.parse_hours_minutes),
+], ids=['dollar', 'pct', 'replay_seconds', 'hours_minutes'])
+def test_parser_matches_scalar(values, vectorized, scalar):
+    mixed = pd.Series(values, dtype=object)
+    assert_same(vectorized(mixed), [scalar(v) for v in values])
+    # read_excel gives all-text columns too, where '-' and '' are the only blanks
+    text = mixed[mixed.map(lambda v: isinstance(v, str))]
+    assert_same(vectorized(text), [scalar(v) for v in text])
+
+
+@pytest.mark.parametrize('values', [[1.5, np.nan, 0.0], [np.nan, np.nan], [3, 0, 12]])
+def test_numeric_columns_match_scalar(values):
+    s = pd.Series(values)
+    assert_same(pdata.parse_dollar_series(s), [pdata.parse_dollar(v) for v in s])
+    assert_same(pdata.parse_pct_series(s), [pdata.parse_pct(v) for v in s])
+    assert_same(pdata.parse_replay_seconds_series(s), [pdata.parse_replay_seconds(v) for v in s])
+
+
+def test_hour_matches_scalar():
+    s = pd.Series(SENT_TIME, dtype=object)
+    assert_same(pdata.parse_hour_series(s), [scalar_hour(v) for v in SENT_TIME])
+
+
+def test_shift_matches_get_shift():
+    hours = pd.Series([0, 7, 8, 15, 16, 23, np.nan, -1, 24], dtype='float64')
+    expected = [pdata.get_shift(h) if pd.notna(h) else None for h in hours]
+    assert shift_names(pdata.shift_series(hours)) == expected
+
+
+def test_shift_of_parsed_hours():
+    hours = pdata.parse_hour_series(pd.Series(SENT_TIME, dtype=object))
+    expected = [pdata.get_shift(h) if h is not None else None for h in map(scalar_hour, SENT_TIME)]
+    assert shift_names(pdata.shift_series(hours)) == expected
@@ -0,0 +1,139 @@
+"""SQLite store (--store): upsert dedup, dtype round-trip, re-ingest and range reads."""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import process_data as pdata
+import store
+from test_aggregates import breakdown, raw_messages, sales
+
+N = 300
+
+
+def messages(raw):
+    """Parsed Message Dashboard rows, deduplicated like load_messages()."""
+    return pdata.prepare_messages(raw.drop_duplicates(subset=pdata.MSG_DEDUP_COLS).copy(), label=None)
+
+
+def with_dedup_cols(df, cols):
+    # The test frames are already parsed: unique raw keys so no row is a duplicate
+    return df.assign(**{c: ['%s-%d' % (c, i) for i in range(len(df))] for c in cols if c not in df.columns})
+
+
+def fold_frames(df_msg, df_db, df_sales):
+    agg = pdata.empty_aggregates()
+    pdata.fold_messages(agg, df_msg)
+    pdata.fold_breakdown(agg, pdata.drop_deleted_model_dupes(df_db))
+    pdata.fold_sales(agg, df_sales)
+    return agg
+
+
+def assert_same_messages(a, b):
+    for keys in pdata.FAN_SLICES:
+        pd.testing.assert_frame_equal(pdata.group_messages(a['msg_cells'], list(keys)),
+                                      pdata.group_messages(b['msg_cells'], list(keys)))
+        assert (pdata.fan_sets(a, keys, pdata.fan_codes(a['fans']))
+                == pdata.fan_sets(b, keys, pdata.fan_codes(b['fans'])))
+    for key in pdata.REPLAY_KEYS[1:]:
+        assert pdata.rollup_replay(a, key) == pdata.rollup_replay(b, key)
+
+
+def test_upsert_keeps_the_first_copy(tmp_path):
+    conn = store.open_store(str(tmp_path / 'store.sqlite'))
+    first = pd.DataFrame({'k': [1, 1, 2, 2, 2.0], 'd': ['a', 'a', None, None, 'b'], 'v': [1, 2, 3, 4, 5]})
+    second = pd.DataFrame({'k': [2, 3], 'd': ['b', 'c'], 'v': [9, 6]})
+    with conn:
+        assert store.upsert_frame(conn, 't', first, ['k', 'd']) == 3
+        assert store.upsert_frame(conn, 't', second, ['k', 'd']) == 1
+        assert store.upsert_frame(conn, 't', pd.concat([second, first]), ['k', 'd']) == 0
+    expected = pd.concat([first, second]).drop_duplicates(subset=['k', 'd'], keep='first')
+    assert store.read_frame(conn, 't')['v'].tolist() == expected['v'].tolist() == [1, 3, 5, 6]
+
+
+def test_read_frame_restores_dtypes(tmp_path):
+    conn = store.open_store(str(tmp_path / 'store.sqlite'))
+    df = pd.DataFrame({
+        'flag': [True, False, True],
+        'when': pd.to_datetime(['2026-02-01 10:00:00', None, '2026-02-03 23:59:59']),
+        'day': [date(2026, 2, 1), None, date(2026, 2, 3)],
+        'name': ['Ana', np.nan, 'Luis'],
+        'net': [1.5, np.nan, -2.25],
+        'count': [1, 2, 3],
+        'Hour': pd.array([0, pd.NA, 23], dtype='Int8'),
+    })
+    with conn:
+        store.upsert_frame(conn, 't', df, ['name', 'day'])
+    back = store.read_frame(conn, 't')
+    assert back['flag'].dtype == bool and back['flag'].tolist() == df['flag'].tolist()
+    assert back['when'].dtype.kind == 'M' and back['when'].equals(df['when'].astype(back['when'].dtype))
+    assert back['day'].iloc[0] == date(2026, 2, 1) and pd.isna(back['day'].iloc[1])
+    assert back['name'].iloc[0] == 'Ana' and back['name'].iloc[1] is np.nan
+    pd.testing.assert_series_equal(back['net'], df['net'])
+    pd.testing.assert_series_equal(back['count'], df['count'])
+    pd.testing.assert_series_equal(pdata.compact_frame(back, {'Hour': 'Int8'})['Hour'], df['Hour'])
+
+
+def test_changed_file_is_reingested(tmp_path, monkeypatch, capsys):
+    rng = np.random.default_rng(5)
+    paths = [str(tmp_path / 'msg_0.xlsx'), str(tmp_path / 'msg_1.xlsx')]
+    raw = {paths[0]: raw_messages(rng, N), paths[1]: raw_messages(rng, N)}
+    for path in paths:
+        with open(path, 'w') as f:
+            f.write(path)
+    monkeypatch.setattr(pdata, 'STORE_PATH', str(tmp_path / 'store.sqlite'))
+    monkeypatch.setattr(pdata, 'MSG_DASHBOARDS', paths)
+    for name in ('DETAILED_BREAKDOWNS', 'SALES_RECORDS', 'CREATOR_STATS_FILES'):
+        monkeypatch.setattr(pdata, name, [])
+    monkeypatch.setattr(pdata, 'read_sheets_parallel', lambda jobs, use_cache, workers: {})
+    monkeypatch.setattr(pdata, 'load_and_concat', lambda files, *args, **kwargs: raw[files[0]].copy())
+
+    def expected():
+        agg = pdata.empty_aggregates()
+        pdata.fold_messages(agg, messages(pd.concat([raw[p] for p in paths], ignore_index=True)))
+        return agg
+
+    assert_same_messages(pdata.load_sources_store(use_cache=False), expected())
+    assert '(2 archivos nuevos)' in capsys.readouterr().out
+
+    raw[paths[0]] = raw_messages(rng, N)
+    with open(paths[0], 'a') as f:
+        f.write(' v2')
+    assert_same_messages(pdata.load_sources_store(use_cache=False), expected())
+    out = capsys.readouterr().out
+    assert 'reingestando' in out and '(2 archivos nuevos)' in out
+
+    assert_same_messages(pdata.load_sources_store(use_cache=False), expected())
+    assert '(0 archivos nuevos)' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('start, end', [(None, None), ('2026-02-02', None), (None, '2026-02-01'),
+                                        ('2026-02-02', '2026-02-03'), ('2026-03-01', None)])
+def test_range_matches_a_full_run_of_its_days(tmp_path, start, end):
+    rng = np.random.default_rng(9)
+    df_msg = messages(raw_messages(rng, N))
+    df_db = with_dedup_cols(breakdown(rng, N), pdata.DB_DEDUP_COLS)
+    df_sales = with_dedup_cols(sales(rng, N), pdata.SALES_DEDUP_COLS)
+    conn = store.open_store(str(tmp_path / 'store.sqlite'))
+    for table, df in (('messages', df_msg), ('breakdown', df_db), ('sales', df_sales)):
+        key_cols, _, indexes, _ = pdata.STORE_TABLES[table]
+        with conn:
+            store.upsert_frame(conn, table, df, key_cols, indexes)
+
+    def in_range(df, col):
+        days = pd.Series([d.isoformat() for d in df[col]], index=df.index)
+        return df[(days >= (start or '')) & (days <= (end or '9999'))]
+
+    got = pdata.aggregate_store(conn, start, end)
+    full = fold_frames(in_range(df_msg, 'DateStr'), pdata.compact_frame(in_range(df_db, 'Day'), pdata.DB_COLUMNS),
+                       in_range(df_sales, 'Date'))
+    assert_same_messages(got, full)
+    for keys in (['Date'], ['Date', 'Creator', 'Employee', 'Hour']):
+        pd.testing.assert_frame_equal(pdata.group_sales(got['sales_cells'], keys),
+                                      pdata.group_sales(full['sales_cells'], keys),
+                                      check_index_type=False)  # an empty range has no key values to type
+    for keys in (['Employees', 'Creators'], 'Creators'):
+        pd.testing.assert_frame_equal(pdata.rollup_breakdown(got['db_cells'], keys),
+                                      pdata.rollup_breakdown(full['db_cells'], keys))
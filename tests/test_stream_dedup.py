@@ -0,0 +1,60 @@
+"""Chunked Message Dashboard dedup (drop_seen_rows) against drop_duplicates."""
+
+import numpy as np
+import pandas as pd
+
+import process_data as pdata
+
+COLS = pdata.MSG_DEDUP_COLS
+
+
+def messages(rows):
+    return pd.DataFrame(rows, columns=COLS + ['Sent to'])
+
+
+def dedup_in_chunks(df, chunk_rows):
+    seen, frames = pdata.empty_seen(), []
+    for start in range(0, len(df), chunk_rows):
+        kept, seen = pdata.drop_seen_rows(df.iloc[start:start + chunk_rows], COLS, seen, frames)
+        if len(kept):
+            frames.append(kept)
+    return pd.concat(frames) if frames else df.iloc[:0]
+
+
+def sample():
+    rng = np.random.default_rng(3)
+    n = 150
+    return messages({
+        'Sender': rng.choice(['Ana', 'Luis', None], n),
+        'Creator': rng.choice(['Model A', 'Model B'], n),
+        'Sent time': rng.choice(['10:00:00', '10:00:01', '23:59:59'], n),
+        'Sent date': rng.choice(['2026-02-01', '2026-02-02'], n),
+        'Price': rng.choice([0, 5, 5.0, 10.5, np.nan, '-'], n),
+        'Source': rng.choice(['Chat', 'Mass'], n),
+        'Sent to': ['fan%d' % i for i in range(n)],
+    })
+
+
+def test_matches_drop_duplicates_across_chunks():
+    df = sample()
+    expected = df.drop_duplicates(subset=COLS, keep='first')
+    for chunk_rows in (1, 7, 50, 1000):
+        assert dedup_in_chunks(df, chunk_rows).index.tolist() == expected.index.tolist()
+
+
+def test_python_hash_collisions_are_kept():
+    # hash(-1) == hash(-2): two different messages that the old hash() keys merged
+    df = messages([
+        ['Ana', 'Model A', '10:00:00', '2026-02-01', -1, 'Chat', 'fan1'],
+        ['Ana', 'Model A', '10:00:00', '2026-02-01', -2, 'Chat', 'fan2'],
+    ])
+    assert hash(-1) == hash(-2)
+    assert len(dedup_in_chunks(df, 1)) == 2
+
+
+def test_digest_hit_is_confirmed_by_values(monkeypatch):
+    # Every row gets the same digest: only rows with equal values may be dropped
+    monkeypatch.setattr(pdata, 'digest_keys', lambda tuples: np.zeros(len(tuples), dtype=np.int64))
+    df = sample()
+    expected = df.drop_duplicates(subset=COLS, keep='first')
+    assert dedup_in_chunks(df, 13).index.tolist() == expected.index.tolist()